@@ -0,0 +1,49 @@
+"""Benchmarks HistorySerializer against to_dict of each IterationTable.
+
+Solves a random dense problem (rows x columns) and prints time and size
+of JSON from to_dict, columnar, rounded columnar, packed columnar and
+delta encoded histories of its iterations.
+
+Usage: python benchmarks/historySerializerBenchmark.py [rows columns]
+"""
+
+import json
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SimplexMethodLPPSolver.simplex import (
+   Model, SimplexAlgorithm, HistorySerializer
+)
+
+if __name__ == '__main__':
+   rows, columns = [
+      int(argument) for argument in (sys.argv[1:3] or ('100', '200'))
+   ]
+   generator = np.random.default_rng(0)
+   model = Model()
+   x = model.addVars(columns)
+   model.add(generator.random((rows, columns)) @ x <= 10)
+   model.maximize(generator.random(columns) @ x)
+   tables = model.solve().iterationTables
+   
+   encoders = (
+      ('to_dict', lambda: json.dumps([table.to_dict() for table in tables])),
+      ('columnar', lambda: HistorySerializer.toJSON(tables)),
+      ('rounded', lambda: HistorySerializer.toJSON(tables, decimals=4)),
+      ('packed', lambda: HistorySerializer.toJSON(tables, packed=True)),
+      ('deltas', lambda: json.dumps(HistorySerializer.toDeltas(tables))),
+   )
+   print('{0} iterations'.format(len(tables)))
+   print('{0:>10}\t{1:>10}\t{2:>10}'.format('encoder', 'seconds', 'MB'))
+   
+   for name, encode in encoders:
+      start = time.perf_counter()
+      encoded = encode()
+      print('{0:>10}\t{1:>10.3f}\t{2:>10.2f}'.format(
+         name, time.perf_counter() - start, len(encoded) / 2**20
+      ))
@@ -0,0 +1,88 @@
+"""Benchmarks MEMMAP engine peak memory against block size.
+
+Builds a random dense problem (rows x columns, all constraints <=) and
+solves it with the MEMMAP engine once per block size, each in a fresh
+process, printing iterations, time and peak resident memory (Linux/macOS)
+which should grow with block size rather than with problem size.
+Beforehand, checks that MEMMAP agrees with TABLEAU engine on a problem
+whose incrementally updated deltaJ ends with roundoff below zero.
+
+Usage: python benchmarks/memmapBenchmark.py [rows columns]
+"""
+
+import os
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SimplexMethodLPPSolver.simplex import (
+   Model, SimplexProblem, SimplexAlgorithm
+)
+
+def solve (rows, columns, blockSize):
+   generator = np.random.default_rng(0)
+   model = Model()
+   x = model.addVars(columns)
+   model.add(generator.random((rows, columns)) @ x <= (columns / 4))
+   model.maximize(generator.random(columns) @ x)
+   simplexProblem = model.toSimplexProblem()
+   del model
+   
+   simplexProblem.engine = SimplexProblem.Engine.MEMMAP
+   simplexProblem.blockSize = blockSize
+   start = time.perf_counter()
+   SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
+   
+   return (
+      simplexProblem.degeneratePivots,
+      time.perf_counter() - start,
+      simplexProblem.optimalSolution.optimalValue,
+   )
+
+def check ():
+   results = []
+   
+   for engine in (SimplexProblem.Engine.TABLEAU, SimplexProblem.Engine.MEMMAP):
+      model = Model()
+      x = model.addVars(4)
+      model.add(np.array([[5, -1, 2, 1], [0, -1, 5, -1]]) @ x <= 10)
+      model.maximize(np.array([4, -2, 3, 2]) @ x)
+      simplexProblem = model.toSimplexProblem()
+      simplexProblem.engine = engine
+      SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
+      results.append((
+         simplexProblem.terminationReason,
+         simplexProblem.optimalSolution.optimalValue
+         if (simplexProblem.optimalSolution != None) else None,
+      ))
+   
+   assert results[0][0] == results[1][0], results
+   assert abs(results[0][1] - results[1][1]) < 1e-9, results
+   assert abs(results[1][1] - 20) < 1e-9, results
+
+if __name__ == '__main__':
+   if ((len(sys.argv) > 1) and (sys.argv[1] == '--block')):
+      rows, columns, blockSize = [int(argument) for argument in sys.argv[2:5]]
+      degenerate, seconds, optimalValue = solve(rows, columns, blockSize)
+      print('{0:>8}\t{1:>10.2f}\t{2:>10.0f}\t{3:>14.6f}'.format(
+         blockSize, seconds,
+         resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+         optimalValue,
+      ))
+      sys.exit(0)
+   
+   check()
+   rows, columns = (sys.argv[1:3] or ('2000', '1000'))
+   print('{0:>8}\t{1:>10}\t{2:>10}\t{3:>14}'.format(
+      'block', 'seconds', 'peak MB', 'optimal value'
+   ))
+   
+   for blockSize in (16, 128, 1024):
+      subprocess.run([
+         sys.executable, __file__, '--block', rows, columns, str(blockSize)
+      ], check=True)
@@ -0,0 +1,77 @@
+"""Benchmarks Model against f-string generation parsed by PreProcessor.
+
+Builds the same SimplexProblem with growing number of constraints three
+ways: f-strings through PreProcessor.processConstraints (caches cleared),
+Model.add with one LinExpr per row, and a single vectorized A @ x row
+block, and prints build time of each.
+
+Usage: python benchmarks/modelBenchmark.py
+"""
+
+import os
+import sys
+import timeit
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SimplexMethodLPPSolver.simplex import PreProcessor, Model
+
+VARIABLES = 200
+
+def rowColumns (i):
+   return (i % VARIABLES), ((i * 7 + 1) % VARIABLES)
+
+def clearCaches ():
+   PreProcessor.EXPRESSION_CACHE.clear()
+   PreProcessor.CONSTRAINT_CACHE.clear()
+
+def buildStrings (rows):
+   simplexProblem = PreProcessor.objectiveFunction('x1', None, 'max')
+   constraints = []
+   
+   for i in range(0, rows):
+      j, k = rowColumns(i)
+      constraints.append(f'{(i % 7) + 1}x{j + 1}+2x{k + 1}<={i + 1}')
+   
+   PreProcessor.processConstraints(simplexProblem, constraints)
+
+def buildModel (rows):
+   model = Model()
+   x = model.addVars(VARIABLES)
+   model.maximize(x[0])
+   
+   for i in range(0, rows):
+      j, k = rowColumns(i)
+      model.add((((i % 7) + 1) * x[j]) + (2 * x[k]) <= (i + 1))
+   
+   model.toSimplexProblem()
+
+def buildVectorized (rows):
+   model = Model()
+   x = model.addVars(VARIABLES)
+   model.maximize(x[0])
+   i = np.arange(0, rows)
+   j, k = rowColumns(i)
+   A = np.zeros((rows, VARIABLES))
+   A[i, j] += (i % 7) + 1
+   A[i, k] += 2
+   model.add(A @ x <= (i + 1))
+   model.toSimplexProblem()
+
+if __name__ == '__main__':
+   print('{0:>8}\t{1:>10}\t{2:>10}\t{3:>10}'.format(
+      'rows', 'strings s', 'model s', 'A @ x s'
+   ))
+   
+   for rows in (1000, 10000, 50000):
+      times = [
+         min(timeit.repeat(
+            lambda: build(rows), setup=clearCaches, number=1, repeat=3,
+         ))
+         for build in (buildStrings, buildModel, buildVectorized)
+      ]
+      print('{0:>8}\t{1:>10.4f}\t{2:>10.4f}\t{3:>10.4f}'.format(
+         rows, *times
+      ))
@@ -0,0 +1,68 @@
+"""Benchmarks ModelReader.readMPS on a generated MPS file.
+
+Writes a random MPS file with given number of rows, columns and non-zeros
+per column to a temporary directory, streams it with readMPS and prints
+time taken and peak resident memory (Linux/macOS), which includes rows
+read, Constraint lhs lists and coordinates of the framed problem.
+
+Usage: python benchmarks/modelReaderBenchmark.py [rows columns perColumn]
+"""
+
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SimplexMethodLPPSolver.simplex import ModelReader
+
+def writeMPS (path, rows, columns, perColumn):
+   generator = random.Random(0)
+   
+   with open(path, 'w') as mps:
+      mps.write('NAME BENCHMARK\nROWS\n N obj\n')
+      
+      for i in range(0, rows):
+         mps.write(' L r{0}\n'.format(i))
+      
+      mps.write('COLUMNS\n')
+      
+      for j in range(0, columns):
+         mps.write(' c{0} obj {1:.4f}\n'.format(j, generator.random()))
+         
+         for i in generator.sample(range(0, rows), perColumn):
+            mps.write(' c{0} r{1} {2:.4f}\n'.format(j, i, generator.random()))
+      
+      mps.write('RHS\n')
+      
+      for i in range(0, rows):
+         mps.write(' rhs r{0} 10\n'.format(i))
+      
+      mps.write('ENDATA\n')
+
+if __name__ == '__main__':
+   rows, columns, perColumn = [
+      int(argument)
+      for argument in (sys.argv[1:4] or ('20000', '10000', '100'))
+   ]
+   
+   with tempfile.TemporaryDirectory() as directory:
+      path = os.path.join(directory, 'benchmark.mps')
+      writeMPS(path, rows, columns, perColumn)
+      
+      start = time.perf_counter()
+      simplexProblem = ModelReader.readMPS(path)
+      seconds = time.perf_counter() - start
+      
+      print('file: {0:.1f} MB; non-zeros: {1}; rows: {2}'.format(
+         os.path.getsize(path) / 2**20,
+         len(simplexProblem.coordinates),
+         len(simplexProblem.constraints),
+      ))
+      print('read: {0:.2f} s; peak memory: {1:.0f} MB'.format(
+         seconds,
+         resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 2**10,
+      ))
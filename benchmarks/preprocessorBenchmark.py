@@ -0,0 +1,72 @@
+"""Benchmarks PreProcessor on generated objectives and constraints.
+
+Times processExpression for objectives with growing number of terms and
+processConstraints for growing number of constraints, and prints time per
+term/constraint, which should stay flat as both are linear in input size.
+Caches are cleared before each cold run, while warm runs repeat the same
+input to show PreProcessor's LRU cache hits.
+
+Usage: python benchmarks/preprocessorBenchmark.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SimplexMethodLPPSolver.simplex import PreProcessor
+
+def generateExpression (terms):
+   return ''.join([
+      '{0}{1}x{2}'.format(('-' if (i % 3 == 0) else '+'), (i % 97) + 1, i)
+      for i in range(1, terms + 1)
+   ])
+
+def generateConstraints (constraints):
+   return [
+      '{0}x{1}+2x{2}-x{1}+{3}<={4}-x{2}'.format(
+         (i % 7) + 2, i, i + 1, i % 5, i
+      )
+      for i in range(1, constraints + 1)
+   ]
+
+def clearCaches ():
+   PreProcessor.EXPRESSION_CACHE.clear()
+   PreProcessor.CONSTRAINT_CACHE.clear()
+
+def loadConstraints (constraints):
+   simplexProblem = PreProcessor.objectiveFunction('x1', None, 'max')
+   PreProcessor.processConstraints(simplexProblem, constraints)
+
+if __name__ == '__main__':
+   print('{0:>8}\t{1:>10}\t{2:>10}'.format('terms', 'cold s', 'us/term'))
+   
+   for terms in (1000, 2000, 5000, 10000, 20000, 50000):
+      expression = generateExpression(terms)
+      seconds = min(timeit.repeat(
+         lambda: PreProcessor.processExpression(expression),
+         setup=clearCaches, number=1, repeat=5,
+      ))
+      print('{0:>8}\t{1:>10.4f}\t{2:>10.3f}'.format(
+         terms, seconds, (seconds / terms) * 1e6
+      ))
+   
+   print('\n{0:>8}\t{1:>10}\t{2:>10}\t{3:>10}'.format(
+      'rows', 'cold s', 'us/row', 'warm s'
+   ))
+   
+   for rows in (1000, 10000, 100000):
+      constraints = generateConstraints(rows)
+      seconds = min(timeit.repeat(
+         lambda: loadConstraints(constraints),
+         setup=clearCaches, number=1, repeat=3,
+      ))
+      PreProcessor.CONSTRAINT_CACHE.resize(rows)
+      warmSeconds = min(timeit.repeat(
+         lambda: loadConstraints(constraints),
+         number=1, repeat=3,
+      ))
+      print('{0:>8}\t{1:>10.4f}\t{2:>10.3f}\t{3:>10.4f}'.format(
+         rows, seconds, (seconds / rows) * 1e6, warmSeconds
+      ))
@@ -0,0 +1,107 @@
+"""Benchmarks ProblemArchive save and load against pickle.
+
+Builds and solves a random dense problem (rows x columns, all constraints
+<=), saves it as .npz archive (uncompressed and compressed) and as pickle
+to a temporary directory, and prints size and time to save and load each.
+Beforehand, checks that a problem whose settings are numpy scalars (e.g.
+perturbationSeed of numpy.int64) calculated by MEMMAP engine round trips
+through an archive saved and loaded by path without .npz, and that
+archive is closed after use.
+
+Usage: python benchmarks/problemArchiveBenchmark.py [rows columns]
+"""
+
+import os
+import pickle
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SimplexMethodLPPSolver.simplex import (
+   Model, SimplexProblem, SimplexAlgorithm, ProblemArchive
+)
+
+def problem (rows, columns):
+   generator = np.random.default_rng(0)
+   model = Model()
+   x = model.addVars(columns)
+   model.add(generator.random((rows, columns)) @ x <= (columns / 4))
+   model.maximize(generator.random(columns) @ x)
+   
+   return model.toSimplexProblem()
+
+def check (directory):
+   simplexProblem = problem(3, 4)
+   simplexProblem.perturbation = np.float64(1e-7)
+   simplexProblem.perturbationSeed = np.int64(0)
+   simplexProblem.pivotTolerance = np.float32(1e-9)
+   simplexProblem.engine = SimplexProblem.Engine.MEMMAP
+   simplexProblem.blockSize = np.int64(2)
+   SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
+   
+   path = os.path.join(directory, 'check')
+   ProblemArchive.save(simplexProblem, path)
+   loaded = ProblemArchive.load(path)
+   
+   assert loaded.perturbationSeed == 0, loaded.perturbationSeed
+   assert loaded.perturbation == simplexProblem.perturbation
+   assert loaded.engine == SimplexProblem.Engine.MEMMAP, loaded.engine
+   assert loaded.blockSize == 2, loaded.blockSize
+   assert abs(
+      loaded.optimalSolution.optimalValue
+      - simplexProblem.optimalSolution.optimalValue
+   ) < 1e-12
+   
+   with ProblemArchive(path) as archive:
+      archive.array('rhs')
+      npzFile = archive.npzFile
+   
+   assert (archive.npzFile == None) and (npzFile.fid == None)
+
+def timed (function, *args):
+   start = time.perf_counter()
+   result = function(*args)
+   
+   return result, time.perf_counter() - start
+
+if __name__ == '__main__':
+   rows, columns = [
+      int(argument) for argument in (sys.argv[1:3] or ('400', '200'))
+   ]
+   
+   with tempfile.TemporaryDirectory() as directory:
+      check(directory)
+      
+      simplexProblem = problem(rows, columns)
+      SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
+      simplexProblem.iterationTables = None
+      
+      print('{0:>12}\t{1:>10}\t{2:>10}\t{3:>10}'.format(
+         'format', 'MB', 'save s', 'load s'
+      ))
+      
+      for label, compressed in (('npz', False), ('npz (zip)', True)):
+         path = os.path.join(directory, 'problem.npz')
+         saveSeconds = timed(
+            ProblemArchive.save, simplexProblem, path, compressed
+         )[1]
+         loadSeconds = timed(ProblemArchive.load, path)[1]
+         print('{0:>12}\t{1:>10.2f}\t{2:>10.3f}\t{3:>10.3f}'.format(
+            label, os.path.getsize(path) / 2**20, saveSeconds, loadSeconds
+         ))
+      
+      path = os.path.join(directory, 'problem.pickle')
+      
+      with open(path, 'wb') as file:
+         saveSeconds = timed(pickle.dump, simplexProblem, file)[1]
+      
+      with open(path, 'rb') as file:
+         loadSeconds = timed(pickle.load, file)[1]
+      
+      print('{0:>12}\t{1:>10.2f}\t{2:>10.3f}\t{3:>10.3f}'.format(
+         'pickle', os.path.getsize(path) / 2**20, saveSeconds, loadSeconds
+      ))
@@ -0,0 +1,151 @@
+"""Benchmarks ratio tests on small random LPs against a reference solver.
+
+Solves random small problems (max c.x s.t. A.x <= b, x >= 0, with mixed
+sign coefficients, so that many are unbounded) with each engine and
+ratio test, with and without rhs perturbation, and checks termination
+and optimal value against scipy.optimize.linprog (requires scipy),
+printing time taken by each engine and ratio test.
+Problems whose roundoff sized key column elements (~1e-16) used to be
+taken as pivots, reporting huge optimal values of unbounded problems,
+and HARRIS rejecting a key element below pivotTolerance, are checked
+first.
+
+Usage: python benchmarks/ratioTestBenchmark.py [problems]
+"""
+
+import os
+import sys
+import time
+
+import numpy as np
+from scipy.optimize import linprog
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'src'))
+
+from SimplexMethodLPPSolver.simplex import (
+   Model, SimplexProblem, SimplexAlgorithm, Row, PivotRules
+)
+
+REGRESSIONS = [
+   (
+      [0, 4, 1, 1, 4, 8],
+      [
+         [2, 6, -3, 7, 1, 7], [-2, 3, 3, 2, -1, -3],
+         [-2, -2, 3, 2, 1, 6], [1, 1, -3, -3, 7, -1],
+      ],
+      [3, 15, 0, 3],
+   ),
+   (
+      [8, -2, 7, 5, 1],
+      [
+         [1, 3, 0, 5, 3], [7, -3, -1, -3, 2],
+         [-2, 5, -2, -1, 5], [-2, 3, -2, 7, 7],
+      ],
+      [11, 15, 14, 4],
+   ),
+]
+
+RATIO_TESTS = (
+   SimplexProblem.RatioTest.STANDARD,
+   SimplexProblem.RatioTest.LEXICOGRAPHIC,
+   SimplexProblem.RatioTest.HARRIS,
+)
+
+ENGINES = (SimplexProblem.Engine.TABLEAU, SimplexProblem.Engine.MEMMAP,)
+
+def randomProblem (seed):
+   generator = np.random.default_rng(seed)
+   rows, columns = generator.integers(2, 7, size=2)
+   
+   return (
+      generator.integers(-3, 9, columns).tolist(),
+      generator.integers(-3, 8, (rows, columns)).tolist(),
+      generator.integers(0, 16, rows).tolist(),
+   )
+
+def solve (c, A, b, engine, ratioTest, perturbation):
+   model = Model()
+   x = model.addVars(len(c))
+   model.add(np.array(A, dtype=float) @ x <= np.array(b, dtype=float))
+   model.maximize(np.array(c, dtype=float) @ x)
+   simplexProblem = model.toSimplexProblem()
+   simplexProblem.engine = engine
+   simplexProblem.ratioTest = ratioTest
+   simplexProblem.perturbation = perturbation
+   simplexProblem.perturbationSeed = 0
+   SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
+   
+   if (simplexProblem.optimalSolution == None):
+      return simplexProblem.terminationReason, None
+   
+   return (
+      simplexProblem.terminationReason,
+      simplexProblem.optimalSolution.optimalValue,
+   )
+
+def reference (c, A, b):
+   result = linprog(np.negative(c), A_ub=A, b_ub=b, method='highs')
+   
+   if (result.status == 0):
+      return SimplexProblem.Terminate.REACHED_OPTIMAL, float(0 - result.fun)
+   
+   if (result.status == 3):
+      return SimplexProblem.Terminate.UNBOUNDED_SOLUTION, None
+   
+   return None, None
+
+def check (c, A, b, engine, ratioTest, perturbation):
+   expected = reference(c, A, b)
+   
+   if (expected[0] == None):
+      return
+   
+   result = solve(c, A, b, engine, ratioTest, perturbation)
+   
+   assert result[0] == expected[0], (c, A, b, engine, ratioTest, result)
+   
+   if (expected[1] != None):
+      assert abs(result[1] - expected[1]) <= (
+         1e-6 * max(1, abs(expected[1]))
+      ), (c, A, b, engine, ratioTest, result, expected)
+
+def candidate (i, b, aik):
+   row = Row()
+   row.i = i
+   row.b = b
+   row.aj = {0: aik}
+   row.minRatio = b / aik
+   
+   return row
+
+def checkSmallPivot ():
+   simplexProblem = SimplexProblem()
+   simplexProblem.ratioTest = SimplexProblem.RatioTest.HARRIS
+   tiny = candidate(0, float(0), 1e-12) # relaxed ratio 1e-7 / 1e-12 = 1e5.
+   large = candidate(1, 1e6, float(1))
+   
+   assert PivotRules.harrisKeyRow(simplexProblem, [tiny], 0) == None
+   assert PivotRules.harrisKeyRow(simplexProblem, [tiny, large], 0) is large
+
+if __name__ == '__main__':
+   problems = int((sys.argv[1:2] or ('300',))[0])
+   checkSmallPivot()
+   
+   for c, A, b in REGRESSIONS:
+      for engine in ENGINES:
+         for ratioTest in RATIO_TESTS:
+            for perturbation in (None, 1e-7):
+               check(c, A, b, engine, ratioTest, perturbation)
+   
+   print('{0:>8}\t{1:>14}\t{2:>10}'.format('engine', 'ratio test', 'seconds'))
+   
+   for engine in ENGINES:
+      for ratioTest in RATIO_TESTS:
+         start = time.perf_counter()
+         
+         for seed in range(0, problems):
+            check(*randomProblem(seed), engine, ratioTest, None)
+         
+         print('{0:>8}\t{1:>14}\t{2:>10.2f}'.format(
+            engine, ratioTest, time.perf_counter() - start
+         ))
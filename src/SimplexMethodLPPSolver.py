@@ -1,3 +1,8 @@
 if __name__ == '__main__':
-   import SimplexMethodLPPSolver
-   SimplexMethodLPPSolver.simplex('max', '3x1+2x2', ['2x1+x2<=18', '2x1+3x2<=42', '3x1+x2<=24'])
+   from SimplexMethodLPPSolver import ConsoleSink
+   from SimplexMethodLPPSolver.main import runCalculation
+   # Only prints, results aren't read back, so nothing is stored
+   runCalculation(
+      'max', '3x1+2x2', ['2x1+x2<=18', '2x1+3x2<=42', '3x1+x2<=24'],
+      sink=ConsoleSink(),
+   )
@@ -1,5 +1,16 @@
-from .main import simplex
+from .main import simplex, simplex_from_arrays
+from .solveReport import SolveReport
+from .outputSinks import (
+   NullSink, ConsoleSink, RecordSink, LogSink, ReportSink
+)
 
 __all__ = [
-   'simplex'
-]
+   'simplex',
+   'simplex_from_arrays',
+   'SolveReport',
+   'NullSink',
+   'ConsoleSink',
+   'RecordSink',
+   'LogSink',
+   'ReportSink',
+]
\ No newline at end of file
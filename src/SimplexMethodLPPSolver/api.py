@@ -0,0 +1,584 @@
+import atexit
+import json
+import os
+import queue
+import threading
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from flask import (
+   Blueprint, Response, jsonify, request, stream_with_context, url_for
+)
+
+from .simplex import (
+   PreProcessor, SimplexAlgorithm, SimplexProblem, CustomExceptions,
+   HistorySerializer
+)
+from .jobQueue import JobQueue
+
+api = Blueprint('api', __name__, url_prefix='/api/v1')
+jobs = JobQueue(
+   workers=int(os.environ.get('SIMPLEX_JOB_WORKERS', 4)),
+   maxPending=int(os.environ.get('SIMPLEX_JOB_PENDING', 64)),
+   retention=float(os.environ.get('SIMPLEX_JOB_RETENTION', 3600)),
+) # solucoes assincronas
+batchWorkers = int(
+   os.environ.get('SIMPLEX_BATCH_WORKERS', os.cpu_count() or 1)
+)
+batchExecutor = None # lotes jsonl, criado no primeiro lote
+batchLock = threading.Lock()
+
+STATUS = {
+   SimplexProblem.Terminate.REACHED_OPTIMAL: 'optimal',
+   SimplexProblem.Terminate.UNBOUNDED_SOLUTION: 'unbounded',
+   SimplexProblem.Terminate.FRAME_ERROR: 'frame_error',
+   SimplexProblem.Terminate.CALC_ERROR: 'calculation_error',
+} # terminationReason -> status
+
+SETTINGS = {
+   'ratioTest': str,
+   'pivotTolerance': float,
+   'feasibilityTolerance': float,
+   'blandThreshold': int,
+   'perturbation': float,
+   'perturbationSeed': int,
+   'engine': str,
+   'blockSize': int,
+} # opcoes copiadas para SimplexProblem, com seus tipos
+
+HISTORY = ('none', 'deltas', 'columnar', 'packed',)
+
+REQUEST_OPTIONS = ('history', 'table',) # opcoes da requisicao, nao do problema
+
+STREAM_EVENTS = 32 # eventos em espera por stream (cliente lento)
+
+PAYLOAD_ERRORS = (
+   ValueError, TypeError, AttributeError, CustomExceptions.PreProcessError,
+) # erros de payload invalido
+
+def frameProblem (payload):
+   """Frames SimplexProblem from json payload.
+   
+   Payload is a dict with type ('min' / 'max', default 'min'),
+   objective (str expression, or list of coefficients with matrices),
+   constraints (list of str constraints) or matrices (dict with A_ub,
+   b_ub, A_eq, b_eq as accepted by PreProcessor.fromArrays) and options
+   (dict of SETTINGS, null to keep default).
+   
+   Raises
+   ------
+   ValueError
+      If payload or its options are invalid.
+   PreProcessError
+      If problem can't be pre-processed.
+   
+   Returns
+   -------
+   SimplexProblem
+      Framed simplex problem, with options set.
+   
+   """
+   
+   if (type(payload) != dict):
+      raise ValueError('Required json object')
+   
+   problemType = payload.get('type', 'min')
+   objective = payload.get('objective')
+   options = payload.get('options') or {}
+   
+   if (type(options) != dict):
+      raise ValueError('Required options object')
+   
+   if ('matrices' in payload):
+      matrices = payload['matrices']
+      
+      if (
+            (type(matrices) != dict)
+            or (len(set(matrices) - {'A_ub', 'b_ub', 'A_eq', 'b_eq'}) > 0)
+         ):
+         raise ValueError('Required matrices with A_ub, b_ub, A_eq, b_eq')
+      
+      simplexProblem = PreProcessor.fromArrays(
+         objective, sense=problemType, **matrices
+      )
+   else:
+      if (
+            (type(objective) != str)
+            or (type(payload.get('constraints')) not in (list, str,))
+         ):
+         raise ValueError('Required objective and constraints')
+      
+      simplexProblem = PreProcessor.preProcess(
+         objective, payload['constraints'], problemType
+      )
+   
+   for option, value in options.items():
+      if (option in REQUEST_OPTIONS):
+         continue
+      
+      if (option not in SETTINGS):
+         raise ValueError('Unknown option {0}'.format(option))
+      
+      setattr(
+         simplexProblem, option,
+         (SETTINGS[option](value) if (value != None) else None)
+      )
+   
+   if (
+         (simplexProblem.ratioTest not in (
+            SimplexProblem.RatioTest.STANDARD,
+            SimplexProblem.RatioTest.LEXICOGRAPHIC,
+            SimplexProblem.RatioTest.HARRIS,
+         ))
+         or (simplexProblem.engine not in (
+            SimplexProblem.Engine.TABLEAU,
+            SimplexProblem.Engine.MEMMAP,
+         ))
+      ):
+      raise ValueError('Unknown ratioTest or engine')
+   
+   return simplexProblem
+
+def solution (simplexProblem, history='none'):
+   """Converts calculated SimplexProblem to json serializable dict.
+   
+   Parameters
+   ----------
+   simplexProblem: SimplexProblem
+      Calculated simplex problem.
+   history: str, default='none'
+      Iteration history to include, one of HISTORY.
+   
+   Returns
+   -------
+   dict
+      Dict with status, message (terminationReason), optimalValue,
+      solution (value of each problem variable), basis (Xj of final
+      basis), iterations (number of pivots, None without iteration
+      tables), degeneratePivots, blandPivots and history (None for
+      'none').
+   
+   """
+   
+   optimalSolution = simplexProblem.optimalSolution
+   tables = simplexProblem.iterationTables
+   variables = dict.fromkeys(
+      [variable for coefficient, variable in simplexProblem.objectiveFunction]
+      + list(simplexProblem.columns or {})
+   )
+   variables.pop('', None)
+   
+   if (history == 'deltas'):
+      history = HistorySerializer.toDeltas(tables, simplexProblem.symbolTable)
+   elif (history in ('columnar', 'packed',)):
+      history = HistorySerializer.toColumnar(
+         tables, simplexProblem.symbolTable, packed=(history == 'packed')
+      )
+   else:
+      history = None
+   
+   return {
+      'status': STATUS.get(simplexProblem.terminationReason, 'not_solved'),
+      'message': simplexProblem.terminationReason,
+      'optimalValue': (
+         optimalSolution.optimalValue if (optimalSolution != None) else None
+      ),
+      'solution': (
+         dict([
+            (variable, optimalSolution.Xj.get(variable, float(0)),)
+            for variable in variables
+         ])
+         if (optimalSolution != None) else None
+      ),
+      'basis': (optimalSolution.Xj if (optimalSolution != None) else None),
+      'iterations': ((len(tables) - 1) if (tables) else None),
+      'degeneratePivots': simplexProblem.degeneratePivots,
+      'blandPivots': simplexProblem.blandPivots,
+      'history': history,
+   }
+
+def parsePayload (payload):
+   """Parses json payload.
+   
+   Frames problem by frameProblem and validates its history option.
+   
+   Raises
+   ------
+   ValueError
+      If payload, its options or history mode are invalid.
+   TypeError, AttributeError
+      If payload values have invalid types.
+   PreProcessError
+      If problem can't be pre-processed.
+   
+   Returns
+   -------
+   tuple
+      (SimplexProblem, str) framed simplex problem and history mode.
+   
+   """
+   
+   simplexProblem = frameProblem(payload)
+   history = (payload.get('options') or {}).get('history', 'none')
+   
+   if (history not in HISTORY):
+      raise ValueError('Unknown history mode {0}'.format(history))
+   
+   return simplexProblem, history
+
+def calculate (simplexProblem, history='none'):
+   """Calculates framed SimplexProblem.
+   
+   Calculates optimal solution and converts it by solution, without
+   printing or rendering anything.
+   
+   Returns
+   -------
+   tuple
+      (dict, int) json serializable response and HTTP status code, 422 if
+      problem can't be framed or calculated, 500 on any other error.
+   
+   """
+   
+   try:
+      SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
+      
+      return solution(simplexProblem, history), 200
+   except CustomExceptions.FrameError as error:
+      return {'status': 'frame_error', 'error': str(error)}, 422
+   except CustomExceptions.CalculationError as error:
+      return {'status': 'calculation_error', 'error': str(error)}, 422
+   except Exception as error:
+      # Unexpected engine errors (ValueError, ZeroDivisionError, numpy
+      # errors, ...) still get a json body instead of Flask's html 500.
+      return {'status': 'failed', 'error': str(error)}, 500
+
+def solvePayload (payload):
+   """Solves json payload.
+   
+   Returns
+   -------
+   tuple
+      (dict, int) json serializable response and HTTP status code, 400 if
+      payload is invalid and 422 if problem can't be framed or
+      calculated.
+   
+   """
+   
+   try:
+      simplexProblem, history = parsePayload(payload)
+   except PAYLOAD_ERRORS as error:
+      return {'status': 'invalid', 'error': str(error)}, 400
+   
+   return calculate(simplexProblem, history)
+
+@api.route('/solve', methods=['POST'])
+def solve():
+   response, status = solvePayload(request.get_json(silent=True))
+   
+   return jsonify(response), status
+
+@api.route('/jobs', methods=['POST'])
+def submitJob():
+   try:
+      simplexProblem, history = parsePayload(request.get_json(silent=True))
+   except PAYLOAD_ERRORS as error:
+      return jsonify({'status': 'invalid', 'error': str(error)}), 400
+   
+   jobId = jobs.submit(calculate, simplexProblem, history)
+   
+   if (jobId == None):
+      return jsonify({'status': 'rejected', 'error': 'Job queue is full'}), 503
+   
+   url = url_for('api.job', jobId=jobId)
+   
+   return jsonify({'id': jobId, 'status': JobQueue.QUEUED, 'url': url}), \
+      202, {'Location': url}
+
+@api.route('/jobs/<jobId>')
+def job(jobId):
+   status = jobs.status(jobId)
+   
+   if (status == None):
+      return jsonify({'status': 'not_found', 'error': 'No such job'}), 404
+   
+   return jsonify(status)
+
+def iterationEvent (simplexProblem, table=False):
+   """Converts last IterationTable of SimplexProblem to event.
+   
+   Parameters
+   ----------
+   simplexProblem: SimplexProblem
+      SimplexProblem being calculated, with keys of last IterationTable
+      calculated.
+   table: bool, default=False
+      Whether to include last IterationTable, columnar as by
+      HistorySerializer.toColumnar.
+   
+   Returns
+   -------
+   dict
+      Dict with iteration, objectiveValue (of current basic solution),
+      entering and leaving variable (None if not selected), keyElement,
+      terminated and, if table, table.
+   
+   """
+   
+   iterationTable = simplexProblem.iterationTables[-1]
+   iteration, objectiveValue = JobQueue.progress(simplexProblem)
+   event = {
+      'iteration': iteration,
+      'objectiveValue': objectiveValue,
+      'entering': (
+         simplexProblem.symbolTable.name(iterationTable.keyColumn)
+         if (iterationTable.keyColumn != None) else None
+      ),
+      'leaving': (
+         iterationTable.keyRow.XB
+         if (iterationTable.keyRow != None) else None
+      ),
+      'keyElement': iterationTable.keyElement,
+      'terminated': simplexProblem.terminated,
+   }
+   
+   if (table == True):
+      event['table'] = HistorySerializer.toColumnar(
+         [iterationTable,], simplexProblem.symbolTable
+      )
+   
+   return event
+
+def putEvent (events, event, data):
+   """Puts stream event without blocking calculation.
+   
+   If events is full (client reads slower than iterations are
+   calculated), oldest waiting events are dropped to make room, so
+   intermediate iteration events are coalesced to most recent ones and
+   memory stays bounded. Only the job thread puts events, so result event
+   (always last) is never dropped.
+   
+   Parameters
+   ----------
+   events: queue.Queue
+      Bounded queue of stream events.
+   event: str
+      Event name ('iteration' or 'result').
+   data: dict
+      Json serializable event data.
+   
+   """
+   
+   while True:
+      try:
+         events.put_nowait((event, data,))
+         return
+      except queue.Full:
+         try:
+            events.get_nowait()
+         except queue.Empty:
+            continue
+
+def streamCalculation (simplexProblem, history, events):
+   """Calculates SimplexProblem for a stream.
+   
+   Calculates by calculate and puts ('result', response) in events,
+   after ('iteration', event) put by simplexProblem's iterationHook,
+   through putEvent.
+   
+   Returns
+   -------
+   tuple
+      (dict, int) as returned by calculate.
+   
+   """
+   
+   try:
+      response, status = calculate(simplexProblem, history)
+   except Exception as error:
+      putEvent(events, 'result', {'status': 'failed', 'error': str(error)})
+      raise
+   
+   putEvent(events, 'result', response)
+   
+   return response, status
+
+@api.route('/stream', methods=['GET', 'POST'])
+def stream():
+   try:
+      payload = (
+         request.get_json(silent=True) if (request.method == 'POST')
+         else json.loads(request.args.get('problem', 'null'))
+      )
+      simplexProblem, history = parsePayload(payload)
+   except PAYLOAD_ERRORS as error:
+      return jsonify({'status': 'invalid', 'error': str(error)}), 400
+   
+   table = bool((payload.get('options') or {}).get('table', False))
+   events = queue.Queue(
+      maxsize=STREAM_EVENTS
+   ) # ('iteration'|'result', dict) - da thread do job
+   simplexProblem.iterationHook = lambda problem: putEvent(
+      events, 'iteration', iterationEvent(problem, table)
+   )
+   jobId = jobs.submit(streamCalculation, simplexProblem, history, events)
+   
+   if (jobId == None):
+      return jsonify({'status': 'rejected', 'error': 'Job queue is full'}), 503
+   
+   def generate ():
+      yield 'event: job\ndata: {0}\n\n'.format(json.dumps({'id': jobId}))
+      
+      while True:
+         try:
+            event, data = events.get(timeout=15)
+         except queue.Empty:
+            yield ': keep-alive\n\n'
+            continue
+         
+         yield 'event: {0}\ndata: {1}\n\n'.format(
+            event, json.dumps(data, separators=(',', ':'))
+         )
+         
+         if (event == 'result'):
+            break
+   
+   return Response(
+      generate(), mimetype='text/event-stream',
+      headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+   )
+
+def solveLine (line):
+   """Solves one line of a json-lines batch.
+   
+   Parameters
+   ----------
+   line: bytes, str
+      Json payload, as accepted by solvePayload.
+   
+   Returns
+   -------
+   str
+      Json response of solvePayload, or invalid status if line is not
+      json, with id of payload (if it has one).
+   
+   """
+   
+   try:
+      payload = json.loads(line)
+   except ValueError as error:
+      return json.dumps(
+         {'status': 'invalid', 'error': str(error)}, separators=(',', ':')
+      )
+   
+   response, status = solvePayload(payload)
+   
+   if ((type(payload) == dict) and ('id' in payload)):
+      response['id'] = payload['id']
+   
+   return json.dumps(response, separators=(',', ':'))
+
+def getBatchExecutor ():
+   """Gets process pool of json-lines batches.
+   
+   Pool is created on first batch, not on import, so that importing
+   processes (server, its workers and, under spawn, the pool's own
+   processes) don't each start one, and it isn't forked before it's
+   needed. It is shut down at exit.
+   
+   Returns
+   -------
+   concurrent.futures.ProcessPoolExecutor
+      Pool of batchWorkers processes.
+   
+   """
+   
+   global batchExecutor
+   
+   with batchLock:
+      if (batchExecutor == None):
+         batchExecutor = ProcessPoolExecutor(max_workers=batchWorkers)
+         atexit.register(batchExecutor.shutdown, cancel_futures=True)
+      
+      return batchExecutor
+
+def submitLine (executor, line):
+   """Submits one line of a json-lines batch.
+   
+   Returns
+   -------
+   concurrent.futures.Future
+      Future of solveLine(line), or failed with error raised by submit
+      (e.g. BrokenProcessPool).
+   
+   """
+   
+   try:
+      return executor.submit(solveLine, line)
+   except Exception as error:
+      future = Future()
+      future.set_exception(error)
+      
+      return future
+
+def lineResult (executor, line, future):
+   """Gets result of one line of a json-lines batch.
+   
+   Errors of worker process (or of pool itself) are returned as failed
+   status of that line, so that one line can't end whole batch response.
+   A broken pool is discarded, so that next batch creates a new one.
+   
+   Returns
+   -------
+   str
+      Json response of solveLine, or failed status with error and id of
+      payload (if it has one).
+   
+   """
+   
+   global batchExecutor
+   
+   try:
+      return future.result()
+   except Exception as error:
+      if (isinstance(error, BrokenProcessPool)):
+         with batchLock:
+            if (batchExecutor is executor):
+               batchExecutor = None
+      
+      response = {'status': 'failed', 'error': str(error) or repr(error)}
+      
+      try:
+         payload = json.loads(line)
+      except ValueError:
+         payload = None
+      
+      if ((type(payload) == dict) and ('id' in payload)):
+         response['id'] = payload['id']
+      
+      return json.dumps(response, separators=(',', ':'))
+
+@api.route('/batch', methods=['POST'])
+def batch():
+   window = 2 * batchWorkers # problemas em processamento por lote
+   executor = getBatchExecutor()
+   
+   def generate ():
+      pending = deque()
+      
+      for line in request.stream:
+         if (len(line.strip()) < 1):
+            continue
+         
+         pending.append((line, submitLine(executor, line),))
+         
+         if (len(pending) >= window):
+            yield lineResult(executor, *pending.popleft()) + '\n'
+      
+      while (len(pending) > 0):
+         yield lineResult(executor, *pending.popleft()) + '\n'
+   
+   return Response(
+      stream_with_context(generate()), mimetype='application/x-ndjson'
+   )
@@ -0,0 +1,316 @@
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .resultStore import ResultStore
+
+class JobQueue:
+   """Queue of asynchronous solve jobs.
+   
+   Runs calculations of framed SimplexProblem (s) on a bounded pool of
+   worker threads, so that requests only enqueue jobs and poll them.
+   While a job runs, its progress (current iteration and objective value
+   of current basic solution) is read from its SimplexProblem's
+   iteration tables. Finished jobs are saved in a ResultStore, so that
+   any worker process of the server can return them, and only their
+   status (not their SimplexProblem) is kept in memory, until retention
+   seconds after they have finished.
+   
+   Attributes
+   ----------
+   QUEUED, RUNNING, FINISHED, FAILED: str
+      Job statuses.
+   executor: concurrent.futures.ThreadPoolExecutor
+      Pool of worker threads.
+   maxPending: int
+      Maximum number of queued and running jobs.
+   retention: float
+      Seconds for which finished jobs are kept.
+   jobs: dict
+      Dict with job id as key and job (dict) as value, or status (dict)
+      once finished.
+   store: ResultStore
+      On-disk store of finished jobs, purged of expired jobs as jobs are
+      saved.
+   
+   Methods
+   -------
+   progress (simplexProblem)
+      Gets progress.
+      Returns current iteration and objective value, called on class.
+   report (job)
+      Converts job to status.
+      Returns status dict of a snapshot of job, called on class.
+   __init__ (workers=4, maxPending=64, retention=3600, directory=None)
+      Initializes the queue.
+   submit (calculate, simplexProblem, *args)
+      Submits job.
+      Enqueues calculation of simplexProblem, None if queue is full.
+   run (jobId, calculate, *args)
+      Runs job.
+      Calculates job's SimplexProblem in a worker thread and releases it.
+   status (jobId)
+      Gets job status.
+      Returns status, progress and, if finished, result of job.
+   purge ()
+      Removes expired jobs.
+      Removes jobs finished more than retention seconds ago, called on
+      submit and status.
+   
+   """
+   
+   QUEUED = 'queued'
+   RUNNING = 'running'
+   FINISHED = 'finished'
+   FAILED = 'failed'
+   
+   def progress (simplexProblem):
+      """Gets progress.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem being calculated.
+      
+      Returns
+      -------
+      tuple
+         (iteration, objectiveValue) of last IterationTable, (None, None)
+         if there is none (yet, or with MEMMAP engine).
+      
+      """
+      
+      tables = simplexProblem.iterationTables
+      
+      if (not tables):
+         return None, None
+      
+      table = tables[-1]
+      objectiveValue = sum([row.CB * row.b for row in table.rowi])
+      
+      return table.iteration, (
+         objectiveValue
+         if (simplexProblem.problemType == 'max')
+         else
+         (float(0) - objectiveValue)
+      )
+   
+   def report (job):
+      """Converts job to status.
+      
+      Parameters
+      ----------
+      job: dict
+         Snapshot (copy taken under lock) of job, or its status once
+         finished.
+      
+      Returns
+      -------
+      dict
+         Status of job, as returned by status.
+      
+      """
+      
+      if ('simplexProblem' not in job):
+         return job
+      
+      iteration, objectiveValue = JobQueue.progress(job['simplexProblem'])
+      
+      return {
+         'id': job['id'],
+         'status': job['status'],
+         'submitted': job['submitted'],
+         'started': job['started'],
+         'finished': job['finished'],
+         'iteration': iteration,
+         'objectiveValue': objectiveValue,
+         'result': job['result'],
+         'httpStatus': job['httpStatus'],
+      }
+   
+   def __init__ (self, workers=4, maxPending=64, retention=3600,
+         directory=None
+      ):
+      """Initializes the queue.
+      
+      Parameters
+      ----------
+      workers: int, default=4
+         Number of worker threads.
+      maxPending: int, default=64
+         Maximum number of queued and running jobs, further jobs are
+         rejected.
+      retention: float, default=3600
+         Seconds for which finished jobs are kept.
+      directory: str, default=None
+         Directory of stored finished jobs, defaults to jobs directory in
+         ResultStore's default directory.
+      
+      """
+      
+      if (directory == None):
+         directory = os.path.join(
+            tempfile.gettempdir(), 'SimplexMethodLPPSolver', 'jobs'
+         )
+      
+      self.executor = ThreadPoolExecutor(
+         max_workers=workers, thread_name_prefix='SimplexJob'
+      )
+      self.maxPending = maxPending # int.
+      self.retention = retention # float - seconds.
+      self.jobs = {} # {'jobId': {'status': str, ...},}
+      self.store = ResultStore(
+         directory, retention
+      ) # ResultStore - finished jobs.
+      self.lock = threading.Lock()
+   
+   def submit (self, calculate, simplexProblem, *args):
+      """Submits job.
+      
+      Parameters
+      ----------
+      calculate: function
+         Function called as calculate(simplexProblem, *args) in worker
+         thread, returning (dict, int) json serializable result and HTTP
+         status code.
+      simplexProblem: SimplexProblem
+         Framed simplex problem.
+      args
+         Further arguments of calculate.
+      
+      Returns
+      -------
+      NoneType
+         If queue is full.
+      str
+         Job id.
+      
+      """
+      
+      self.purge()
+      
+      with self.lock:
+         pending = len([
+            job for job in self.jobs.values()
+            if (job['status'] in (JobQueue.QUEUED, JobQueue.RUNNING,))
+         ])
+         
+         if (pending >= self.maxPending):
+            return None
+         
+         jobId = self.store.newId()
+         self.jobs[jobId] = {
+            'id': jobId,
+            'status': JobQueue.QUEUED,
+            'submitted': time.time(),
+            'started': None,
+            'finished': None,
+            'simplexProblem': simplexProblem,
+            'result': None,
+            'httpStatus': None,
+         }
+      
+      self.executor.submit(
+         self.run, jobId, calculate, simplexProblem, *args
+      )
+      
+      return jobId
+   
+   def run (self, jobId, calculate, *args):
+      """Runs job.
+      
+      Calculates job by calculate, records its result and saves finished
+      job in store. Finished job is then replaced by its status, which
+      releases its SimplexProblem (and its iteration tables).
+      Job is only updated under lock, so that status never sees it half
+      updated (e.g. finished without result).
+      
+      Parameters
+      ----------
+      jobId: str
+         Job id.
+      calculate: function
+         Function calculating job.
+      args
+         Arguments of calculate.
+      
+      """
+      
+      with self.lock:
+         job = self.jobs[jobId]
+         job['started'] = time.time()
+         job['status'] = JobQueue.RUNNING
+      
+      try:
+         result, httpStatus = calculate(*args)
+         status = JobQueue.FINISHED
+      except Exception as error:
+         result, httpStatus = {'error': str(error)}, 500
+         status = JobQueue.FAILED
+      
+      with self.lock:
+         job['result'], job['httpStatus'] = result, httpStatus
+         job['finished'] = time.time()
+         job['status'] = status
+         finished = JobQueue.report(dict(job))
+         self.jobs[jobId] = finished
+      
+      self.store.save(jobId, finished)
+   
+   def status (self, jobId):
+      """Gets job status.
+      
+      Parameters
+      ----------
+      jobId: str
+         Job id.
+      
+      Returns
+      -------
+      NoneType
+         If there is no such job, or it has expired.
+      dict
+         Dict with id, status, submitted, started, finished (epoch
+         seconds, None until reached), iteration, objectiveValue,
+         result and httpStatus (None until finished).
+      
+      """
+      
+      self.purge()
+      
+      with self.lock:
+         job = self.jobs.get(jobId)
+         job = dict(job) if (job != None) else None # snapshot.
+      
+      if (job == None):
+         job = self.store.load(jobId)
+      
+      if (
+            (job == None)
+            or (
+               (job['finished'] != None)
+               and (job['finished'] < (time.time() - self.retention))
+            )
+         ):
+         return None
+      
+      return JobQueue.report(job)
+   
+   def purge (self):
+      """Removes expired jobs.
+      
+      Removes jobs finished more than retention seconds ago from memory,
+      while store removes them as jobs are saved.
+      
+      """
+      
+      oldest = time.time() - self.retention
+      
+      with self.lock:
+         for jobId in [
+               jobId for jobId, job in self.jobs.items()
+               if ((job['finished'] != None) and (job['finished'] < oldest))
+            ]:
+            del self.jobs[jobId]
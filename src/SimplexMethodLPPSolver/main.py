@@ -1,24 +1,66 @@
+import os
 import time
 
-from .statusPrinter import StatusPrinter as sp
 from .osCommands import OSCommands as osc
-from .simplex import (PreProcessor, SimplexAlgorithm, CustomExceptions, IterationTable)
-from flask import Flask, render_template, Blueprint, jsonify, Response
+from .outputSinks import NullSink, ConsoleSink
+from .resultStore import ResultStore
+from .resultCache import ResultCache
+from .simplex import (
+   PreProcessor, SimplexAlgorithm, CustomExceptions, IterationTable,
+   HistorySerializer
+)
+from flask import (
+   Flask, render_template, Blueprint, jsonify, Response, request, abort
+)
 import json
 
 bp = Blueprint('routes', __name__)
+store = ResultStore(
+   directory=os.environ.get('SIMPLEX_RESULT_DIR'),
+   retention=float(os.environ.get('SIMPLEX_RESULT_RETENTION', 3600)),
+) # resultados por problemId, compartilhados entre processos
+cache = ResultCache(
+   directory=os.environ.get('SIMPLEX_CACHE_DIR')
+) # resultados por hash do problema canonico
 
 
-def runCalculation (problemType, objectiveFunction, constraints):
+def runCalculation (problemType, objectiveFunction, constraints, sink=None):
+   """Calculates simplex problem and outputs it to sink.
+   
+   Parameters
+   ----------
+   problemType: str
+      Type of problem - minimization ('min') or maximization ('max').
+   objectiveFunction: str
+      Objective function for simplex problem.
+   constraints: list, str
+      List of str constraint, or single str constraint.
+   sink: NullSink, default=None
+      Output sink of inputs, problem, status, iteration tables and
+      optimal solution, defaults to ConsoleSink (clears console and
+      prints).
+   
+   Returns
+   -------
+   NoneType
+      If problem can't be pre-processed, framed or calculated.
+   SimplexProblem
+      Calculated simplex problem.
+   
+   """
+   
+   if (sink == None):
+      sink = ConsoleSink()
+   
    simplexProblem = None
    try:
       simplexProblem = PreProcessor.preProcess(
          objectiveFunction, constraints, problemType
       )
    except Exception as exception:
-      osc.CLEAR()
-      print('Simplex Method : Simplex Problem : Calculation\n')
-      sp.printRawInputs(
+      sink.clear()
+      sink.title('Simplex Method : Simplex Problem : Calculation\n')
+      sink.rawInputs(
          objectiveFunction, constraints, problemType,
          error=exception
       )
@@ -27,25 +69,25 @@ def runCalculation (problemType, objectiveFunction, constraints):
    try:
       SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
    except CustomExceptions.FrameError as exception:
-      osc.CLEAR()
-      print('Simplex Method : Simplex Problem : Calculation\n')
-      sp.printPreFrameProblem(simplexProblem)
+      sink.clear()
+      sink.title('Simplex Method : Simplex Problem : Calculation\n')
+      sink.preFrameProblem(simplexProblem)
       return None
    except CustomExceptions.CalculationError as exception:
-      osc.CLEAR()
-      print('Simplex Method : Simplex Problem : Calculation\n')
-      sp.printPreCalcProblem(simplexProblem)
+      sink.clear()
+      sink.title('Simplex Method : Simplex Problem : Calculation\n')
+      sink.preCalcProblem(simplexProblem)
       return None
    except Exception as error:
-      osc.CLEAR()
-      print('Simplex Method : Simplex Problem : Calculation\n')
-      print(error)
+      sink.clear()
+      sink.title('Simplex Method : Simplex Problem : Calculation\n')
+      sink.error(error)
       return None
    
-   osc.CLEAR()
-   print('Simplex Method : Simplex Problem : Calculation\n')
-   sp.printPreCalcProblem(simplexProblem)
-   sp.printStatus(simplexProblem)
+   sink.clear()
+   sink.title('Simplex Method : Simplex Problem : Calculation\n')
+   sink.preCalcProblem(simplexProblem)
+   sink.status(simplexProblem)
    
    if (
          simplexProblem.terminationReason in (
@@ -54,19 +96,16 @@ def runCalculation (problemType, objectiveFunction, constraints):
          )
       ):
       for iterationTable in simplexProblem.iterationTables:
-         sp.printIterationTable(iterationTable)
-         
-      
-   
+         sink.iterationTable(iterationTable)
    
    if (
          simplexProblem.terminationReason == (
             simplexProblem.Terminate.REACHED_OPTIMAL
          )
       ):
-      sp.printOptimalSolution(simplexProblem)
+      sink.optimalSolution(simplexProblem)
    
-   return None
+   return simplexProblem
 
 def runSimplexMethod ():
    wPress = 0
@@ -203,19 +242,120 @@ def runSimplexMethod ():
    
 @bp.route('/getPrint')
 def getPrint():
-   Iterations = SimplexAlgorithm.getIterations() # vetor de iteracoes
-   jsoniteration = [it.to_dict() for it in Iterations] # to_dict em cada iteração
-   json_iterations = jsoniteration
+   result = store.load(request.args.get('problemId'))
    
-   solOtima = SimplexAlgorithm.getsolOtima()
-   valorOtimo = solOtima.optimalValue
+   if (result == None):
+      abort(404)
    
+   return render_template(
+      'index.html', content3=result['iterations'],
+      solotima=result['optimalValue'], problemId=request.args['problemId'],
+   )
+
+@bp.route('/cache')
+def cacheStatistics():
+   return jsonify(cache.statistics())
 
-   return render_template('index.html', content3=json_iterations, solotima=valorOtimo)
+def simplex (problemType, objectiveFunction, constraints, sink=None):
+   """Solves simplex problem and stores its result.
+   
+   Calculates problem in its own SimplexProblem and saves inputs, delta
+   encoded iteration history, optimal solution (Xj of final
+   IterationTable) and optimal value in store, under a new problem id,
+   so that views of the result (e.g. graphical solution) needn't solve it
+   again.
+   History and optimal value of an already solved equivalent problem are
+   taken from cache instead of calculating it again.
+   
+   Parameters
+   ----------
+   problemType: str
+      Type of problem - minimization ('min') or maximization ('max').
+   objectiveFunction: str
+      Objective function for simplex problem.
+   constraints: list, str
+      List of str constraint, or single str constraint.
+   sink: NullSink, default=None
+      Output sink passed to runCalculation, defaults to NullSink (no
+      output, as for web requests).
+   
+   Returns
+   -------
+   str
+      Problem id of stored result.
+   
+   """
+   
+   key = ResultCache.key(problemType, objectiveFunction, constraints)
+   solution = cache.get(key) if (key != None) else None
+   
+   if (solution == None):
+      simplexProblem = runCalculation(
+         problemType, objectiveFunction, constraints,
+         (sink if (sink != None) else NullSink()),
+      )
+      optimalSolution = (
+         simplexProblem.optimalSolution if (simplexProblem != None) else None
+      )
+      solution = {
+         'iterations': (
+            HistorySerializer.toDeltas(simplexProblem.iterationTables)
+            if (simplexProblem != None) else None
+         ), # tabela inicial + pivos
+         'optimalValue': (
+            optimalSolution.optimalValue
+            if (optimalSolution != None) else None
+         ),
+         'Xj': (
+            optimalSolution.Xj if (optimalSolution != None) else None
+         ), # solucao basica da tabela final
+      }
+      
+      if ((key != None) and (simplexProblem != None)):
+         cache.put(key, solution)
+   
+   problemId = store.newId()
+   
+   store.save(problemId, {
+      'problemType': problemType,
+      'objectiveFunction': objectiveFunction,
+      'constraints': list(constraints),
+      'iterations': solution['iterations'],
+      'optimalValue': solution['optimalValue'],
+      'Xj': solution.get('Xj'),
+   })
+   
+   return problemId
 
-def simplex (problemType, objectiveFunction, constraints):
-  runCalculation(problemType, objectiveFunction, constraints)
-  getPrint()
+def simplex_from_arrays (c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
+      sense='min'
+   ):
+   """Solves simplex problem given in matrix form.
+   
+   Frames SimplexProblem straight from arrays (no str round trip) and
+   calculates its optimal solution.
+   
+   Raises
+   ------
+   PreProcessError
+      If arrays don't frame a valid problem.
+   FrameError
+      Raises when there is an error in framing process.
+   CalculationError
+      Raises when there is an error in calculation process.
+   
+   Returns
+   -------
+   SimplexProblem
+      Calculated simplex problem, variables named x1, x2, ... after
+      columns of A_ub/A_eq.
+   
+   """
+   
+   simplexProblem = PreProcessor.fromArrays(c, A_ub, b_ub, A_eq, b_eq, sense)
+   SimplexAlgorithm.calculateOptimalSolution(simplexProblem)
+   
+   return simplexProblem
   
 
 if __name__ == '__main__':
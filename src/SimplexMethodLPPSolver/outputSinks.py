@@ -0,0 +1,307 @@
+import json
+import logging
+
+from .statusPrinter import StatusPrinter as sp
+from .osCommands import OSCommands as osc
+from .simplex import SymbolTable
+from .solveReport import SolveReport
+
+class NullSink:
+   """Output sink which discards all output.
+   
+   Output sinks receive each step of runCalculation (inputs, framed
+   problem, status, iteration tables, optimal solution and errors) and
+   decide how to output it, selected per call instead of always clearing
+   console and printing.
+   NullSink is the base of all sinks and outputs nothing, which is the
+   default for web requests.
+   
+   Methods
+   -------
+   clear ()
+      Starts new output.
+   title (text)
+      Outputs title.
+   rawInputs (objectiveFunction, constraints, problemType, error=None)
+      Outputs inputs which couldn't be pre-processed.
+   preFrameProblem (simplexProblem)
+      Outputs framed problem.
+   preCalcProblem (simplexProblem)
+      Outputs problem with auxillary components.
+   status (simplexProblem)
+      Outputs termination status.
+   iterationTable (iterationTable)
+      Outputs IterationTable.
+   optimalSolution (simplexProblem)
+      Outputs optimal solution.
+   error (error)
+      Outputs unexpected error.
+   
+   """
+   
+   def clear (self):
+      return None
+   
+   def title (self, text):
+      return None
+   
+   def rawInputs (self, objectiveFunction, constraints, problemType,
+         error=None
+      ):
+      return None
+   
+   def preFrameProblem (self, simplexProblem):
+      return None
+   
+   def preCalcProblem (self, simplexProblem):
+      return None
+   
+   def status (self, simplexProblem):
+      return None
+   
+   def iterationTable (self, iterationTable):
+      return None
+   
+   def optimalSolution (self, simplexProblem):
+      return None
+   
+   def error (self, error):
+      return None
+
+class ConsoleSink (NullSink):
+   """Output sink which clears console and prints by StatusPrinter.
+   
+   Keeps command line behaviour of runCalculation.
+   
+   """
+   
+   def clear (self):
+      osc.CLEAR()
+   
+   def title (self, text):
+      print(text)
+   
+   def rawInputs (self, objectiveFunction, constraints, problemType,
+         error=None
+      ):
+      sp.printRawInputs(objectiveFunction, constraints, problemType, error)
+   
+   def preFrameProblem (self, simplexProblem):
+      sp.printPreFrameProblem(simplexProblem)
+   
+   def preCalcProblem (self, simplexProblem):
+      sp.printPreCalcProblem(simplexProblem)
+   
+   def status (self, simplexProblem):
+      sp.printStatus(simplexProblem)
+   
+   def iterationTable (self, iterationTable):
+      sp.printIterationTable(iterationTable)
+   
+   def optimalSolution (self, simplexProblem):
+      sp.printOptimalSolution(simplexProblem)
+   
+   def error (self, error):
+      print(error)
+
+class RecordSink (NullSink):
+   """Output sink which converts output to structured records.
+   
+   Each step is converted to a json serializable dict with its event
+   name and values instead of formatted text, and passed to emit.
+   Console clearing and titles are dropped.
+   
+   Attributes
+   ----------
+   tables: bool
+      Whether iterationTable records contain whole IterationTable
+      (to_dict), else only its iteration and pivot.
+   
+   Methods
+   -------
+   __init__ (tables=False)
+      Initializes the sink.
+   emit (record)
+      Outputs record.
+   terms (terms)
+      Converts terms.
+      Returns [[coefficient, 'variable'],] of terms, called on class.
+   
+   """
+   
+   def __init__ (self, tables=False):
+      self.tables = tables # bool - whole IterationTable in records?
+   
+   def emit (self, record):
+      return None
+   
+   def terms (terms):
+      return [[coefficient, variable] for coefficient, variable in terms]
+   
+   def rawInputs (self, objectiveFunction, constraints, problemType,
+         error=None
+      ):
+      self.emit({
+         'event': 'rawInputs',
+         'problemType': problemType,
+         'objectiveFunction': objectiveFunction,
+         'constraints': constraints,
+         'error': (str(error) if (error != None) else None),
+      })
+   
+   def preFrameProblem (self, simplexProblem):
+      self.emit({
+         'event': 'preFrameProblem',
+         'problemType': simplexProblem.problemType,
+         'objectiveFunction': RecordSink.terms(
+            simplexProblem.objectiveFunction
+         ),
+         'constraints': [
+            [
+               RecordSink.terms(constraint.lhs), constraint.equalityType,
+               constraint.rhs,
+            ]
+            for constraint in (simplexProblem.constraints or [])
+         ],
+      })
+   
+   def preCalcProblem (self, simplexProblem):
+      self.emit({
+         'event': 'preCalcProblem',
+         'problemType': simplexProblem.problemType,
+         'objectiveFunction': RecordSink.terms(
+            simplexProblem.auxillaryObjectiveFunction or []
+         ),
+         'constraints': [
+            [
+               RecordSink.terms(constraint.lhs), constraint.equalityType,
+               constraint.rhs, constraint.slackVariable,
+            ]
+            for constraint in (simplexProblem.auxillaryConstraints or [])
+         ],
+      })
+   
+   def status (self, simplexProblem):
+      self.emit({
+         'event': 'status',
+         'terminationReason': simplexProblem.terminationReason,
+         'degeneratePivots': simplexProblem.degeneratePivots,
+         'blandPivots': simplexProblem.blandPivots,
+      })
+   
+   def iterationTable (self, iterationTable):
+      record = {
+         'event': 'iterationTable',
+         'iteration': iterationTable.iteration,
+         'keyColumn': (
+            SymbolTable.label(iterationTable.keyColumn)
+            if (iterationTable.keyColumn != None) else None
+         ),
+         'leaving': (
+            iterationTable.keyRow.XB
+            if (iterationTable.keyRow != None) else None
+         ),
+         'keyElement': iterationTable.keyElement,
+      }
+      
+      if (self.tables == True):
+         record['table'] = iterationTable.to_dict()
+      
+      self.emit(record)
+   
+   def optimalSolution (self, simplexProblem):
+      self.emit({
+         'event': 'optimalSolution',
+         'Xj': simplexProblem.optimalSolution.Xj,
+         'optimalValue': simplexProblem.optimalSolution.optimalValue,
+      })
+   
+   def error (self, error):
+      self.emit({'event': 'error', 'error': str(error)})
+
+class LogSink (RecordSink):
+   """Output sink which logs structured records.
+   
+   Logs each record as a json message, with record itself in extra
+   'record' attribute of log record.
+   
+   Attributes
+   ----------
+   logger: logging.Logger
+      Logger of records.
+   level: int
+      Level of records, errors are logged at logging.ERROR.
+   
+   Methods
+   -------
+   __init__ (logger=None, level=logging.INFO, tables=False)
+      Initializes the sink, logging to SimplexMethodLPPSolver logger by
+      default.
+   emit (record)
+      Logs record.
+   
+   """
+   
+   def __init__ (self, logger=None, level=logging.INFO, tables=False):
+      super(LogSink, self).__init__(tables)
+      
+      self.logger = logger or logging.getLogger('SimplexMethodLPPSolver')
+      self.level = level # int - logging level.
+   
+   def emit (self, record):
+      level = (
+         logging.ERROR
+         if (
+            (record['event'] == 'error')
+            or (record.get('error') != None)
+         )
+         else self.level
+      )
+      
+      if (self.logger.isEnabledFor(level)):
+         self.logger.log(
+            level, json.dumps(record, default=str),
+            extra={'record': record},
+         )
+
+class ReportSink (RecordSink):
+   """Output sink which keeps structured records in memory.
+   
+   Attributes
+   ----------
+   records: list
+      List of records (dict) in order.
+   report: SolveReport, None
+      Lazily formatted text report of calculated problem, None if
+      calculation hasn't finished.
+   
+   Methods
+   -------
+   __init__ (tables=False)
+      Initializes the sink.
+   clear ()
+      Discards records and report.
+   emit (record)
+      Appends record.
+   status (simplexProblem)
+      Appends status record and creates report.
+   
+   """
+   
+   def __init__ (self, tables=False):
+      super(ReportSink, self).__init__(tables)
+      
+      self.records = [] # [{'event': str, ...},]
+      self.report = None # SolveReport.
+   
+   def clear (self):
+      self.records = []
+      self.report = None
+   
+   def emit (self, record):
+      self.records.append(record)
+   
+   def status (self, simplexProblem):
+      super(ReportSink, self).status(simplexProblem)
+      
+      self.report = SolveReport(simplexProblem)
@@ -0,0 +1,227 @@
+import hashlib
+import json
+import os
+import threading
+import time
+
+from .simplex import PreProcessor, LRUCache
+from .resultStore import ResultStore
+
+class ResultCache:
+   """Cache of solve results, keyed by canonical problem hash.
+   
+   Problems are canonicalized from their parsed terms (repeated variables
+   merged, variables sorted, numbers normalized as floats), so that same
+   problem typed differently (spaces, term order, 2 / 2.0 / 2e0) hits
+   same cached result. On a hit, result of first solved equivalent
+   problem is returned.
+   Results are kept in a bounded LRUCache with ttl and, if directory is
+   set, in a ResultStore on disk shared between worker processes, whose
+   files expire after same ttl.
+   
+   Attributes
+   ----------
+   memory: LRUCache
+      In-process cache of results.
+   disk: ResultStore, None
+      On-disk store of results, None if not backed by disk.
+   diskHits: int
+      Number of memory misses found on disk.
+   diskMisses: int
+      Number of memory misses not found on disk.
+   
+   Methods
+   -------
+   key (problemType, objectiveFunction, constraints)
+      Hashes problem.
+      Returns canonical problem hash, called on class.
+   __init__ (maxSize=256, ttl=3600, directory=None)
+      Initializes the cache.
+   get (key)
+      Gets cached result.
+      Returns result cached in memory or on disk, None if not cached.
+   put (key, result)
+      Caches result.
+      Caches json serializable result in memory and on disk.
+   statistics ()
+      Returns statistics.
+      Returns dict with memory and disk hits, misses and hit rate.
+   
+   """
+   
+   def key (problemType, objectiveFunction, constraints):
+      """Hashes problem.
+      
+      Parameters
+      ----------
+      problemType: str
+         Type of problem - minimization ('min') or maximization ('max').
+      objectiveFunction: str
+         Objective function for simplex problem.
+      constraints: list, str
+         List of str constraint, or single str constraint.
+      
+      Returns
+      -------
+      NoneType
+         If problem can't be pre-processed.
+      str
+         32 hexadecimal digits hash of canonical problem.
+      
+      """
+      
+      try:
+         simplexProblem = PreProcessor.preProcess(
+            objectiveFunction, constraints, problemType
+         )
+      except Exception:
+         return None
+      
+      objective = {} # {'variable': coefficient,}
+      
+      for coefficient, variable in simplexProblem.objectiveFunction:
+         objective[variable] = objective.get(variable, float(0)) + coefficient
+      
+      canonical = [
+         simplexProblem.problemType,
+         sorted([
+            (variable, (float(coefficient) + 0.0))
+            for variable, coefficient in objective.items()
+         ]),
+         [
+            [
+               sorted([
+                  (variable, (float(coefficient) + 0.0))
+                  for coefficient, variable in constraint.lhs
+               ]),
+               constraint.equalityType,
+               (float(constraint.rhs) + 0.0),
+            ]
+            for constraint in simplexProblem.constraints
+         ],
+      ]
+      
+      return hashlib.blake2b(
+         json.dumps(canonical, separators=(',', ':')).encode('utf-8'),
+         digest_size=16,
+      ).hexdigest()
+   
+   def __init__ (self, maxSize=256, ttl=3600, directory=None):
+      """Initializes the cache.
+      
+      Parameters
+      ----------
+      maxSize: int, default=256
+         Maximum number of results cached in memory.
+      ttl: float, default=3600
+         Seconds after which cached results expire, None to never expire.
+      directory: str, default=None
+         Directory of on-disk store, None to cache in memory only.
+         Expired files are removed from it as results are saved.
+      
+      """
+      
+      self.memory = LRUCache(maxSize, ttl) # LRUCache.
+      self.disk = (
+         ResultStore(directory, ttl) if (directory != None) else None
+      ) # ResultStore|None.
+      self.diskHits = 0 # int.
+      self.diskMisses = 0 # int.
+      self.lock = threading.Lock()
+   
+   def get (self, key):
+      """Gets cached result.
+      
+      Parameters
+      ----------
+      key: str
+         Canonical problem hash.
+      
+      Returns
+      -------
+      NoneType
+         If result is not cached or has expired.
+      dict
+         Cached result, should not be mutated.
+      
+      """
+      
+      result = self.memory.get(key)
+      
+      if (result is not LRUCache.MISSING):
+         return result
+      
+      if (self.disk == None):
+         return None
+      
+      result = None
+      
+      try:
+         if (
+               (self.memory.ttl == None)
+               or (
+                  (time.time() - os.path.getmtime(self.disk.path(key)))
+                  < self.memory.ttl
+               )
+            ):
+            result = self.disk.load(key)
+      except OSError:
+         result = None
+      
+      with self.lock:
+         if (result == None):
+            self.diskMisses += 1
+         else:
+            self.diskHits += 1
+      
+      if (result != None):
+         self.memory.put(key, result)
+      
+      return result
+   
+   def put (self, key, result):
+      """Caches result.
+      
+      Parameters
+      ----------
+      key: str
+         Canonical problem hash.
+      result: dict
+         Json serializable result, should not be mutated afterwards.
+      
+      """
+      
+      self.memory.put(key, result)
+      
+      if (self.disk != None):
+         self.disk.save(key, result)
+   
+   def statistics (self):
+      """Returns statistics.
+      
+      Returns
+      -------
+      dict
+         Dict with memory (LRUCache statistics), disk (directory, None
+         if not backed by disk), diskHits, diskMisses, hits, misses and
+         hitRate (hits / lookups, None without lookups).
+      
+      """
+      
+      memory = self.memory.statistics()
+      
+      with self.lock:
+         diskHits, diskMisses = self.diskHits, self.diskMisses
+      
+      hits = memory['hits'] + diskHits
+      lookups = memory['hits'] + memory['misses']
+      
+      return {
+         'memory': memory,
+         'disk': (self.disk.directory if (self.disk != None) else None),
+         'diskHits': diskHits,
+         'diskMisses': diskMisses,
+         'hits': hits,
+         'misses': (lookups - hits),
+         'hitRate': ((hits / lookups) if (lookups > 0) else None),
+      }
@@ -0,0 +1,202 @@
+import json
+import os
+import tempfile
+import time
+import uuid
+
+class ResultStore:
+   """Store of solved problems, keyed by problem id.
+   
+   Each solve gets its own problem id, and its inputs and serialized
+   results are saved as one json file per problem id in a directory, so
+   that requests served by any thread or worker process of the server
+   can read them back, instead of reading results of last solve from
+   module globals.
+   Files are written to a temporary file and renamed, so readers never
+   see partially written results.
+   With a retention, saving also removes results stored more than
+   retention seconds ago (at most once per PURGE_INTERVAL seconds), so
+   that stored results don't grow with every solve.
+   
+   Attributes
+   ----------
+   PURGE_INTERVAL: float
+      Minimum seconds between purges on save.
+   directory: str
+      Directory of stored results.
+   retention: float, None
+      Seconds for which results are kept, None to keep them until
+      purged explicitly.
+   
+   Methods
+   -------
+   __init__ (directory=None, retention=None)
+      Opens store.
+      Opens store in directory, creating it if missing.
+   newId ()
+      Creates problem id.
+      Returns new unique problem id.
+   path (problemId)
+      Gets path.
+      Returns path of stored result of problem id.
+   save (problemId, result)
+      Saves result.
+      Saves json serializable result under problem id, purging results
+      older than retention.
+   load (problemId)
+      Loads result.
+      Returns stored result of problem id, None if there is none.
+   purge (maxAge)
+      Removes old results.
+      Removes results stored more than maxAge seconds ago.
+   
+   """
+   
+   PURGE_INTERVAL = 60
+   
+   def __init__ (self, directory=None, retention=None):
+      """Opens store.
+      
+      Parameters
+      ----------
+      directory: str, default=None
+         Directory of stored results, defaults to SimplexMethodLPPSolver
+         directory in system temporary directory (shared by worker
+         processes of same host).
+      retention: float, default=None
+         Seconds for which results are kept, None to keep them until
+         purge is called.
+      
+      """
+      
+      if (directory == None):
+         directory = os.path.join(
+            tempfile.gettempdir(), 'SimplexMethodLPPSolver'
+         )
+      
+      os.makedirs(directory, exist_ok=True)
+      
+      self.directory = directory # str.
+      self.retention = retention # float|None - seconds.
+      self.purged = float('-inf') # float - time.monotonic() of last purge.
+   
+   def newId (self):
+      return uuid.uuid4().hex
+   
+   def path (self, problemId):
+      """Gets path.
+      
+      Parameters
+      ----------
+      problemId: str
+         Problem id.
+      
+      Raises
+      ------
+      ValueError
+         If problemId is not a problem id created by newId.
+      
+      Returns
+      -------
+      str
+         Path of stored result.
+      
+      """
+      
+      if (
+            (type(problemId) != str) or (len(problemId) != 32)
+            or (not all([(char in '0123456789abcdef') for char in problemId]))
+         ):
+         raise ValueError('Invalid problem id')
+      
+      return os.path.join(self.directory, problemId + '.json')
+   
+   def save (self, problemId, result):
+      """Saves result.
+      
+      Parameters
+      ----------
+      problemId: str
+         Problem id.
+      result: dict
+         Json serializable result.
+      
+      """
+      
+      path = self.path(problemId)
+      descriptor, temporaryPath = tempfile.mkstemp(
+         dir=self.directory, suffix='.tmp'
+      )
+      
+      try:
+         with os.fdopen(descriptor, 'w') as file:
+            json.dump(result, file, separators=(',', ':'))
+         
+         os.replace(temporaryPath, path)
+      except BaseException:
+         os.unlink(temporaryPath)
+         raise
+      
+      now = time.monotonic()
+      
+      if (
+            (self.retention != None)
+            and ((now - self.purged) >= ResultStore.PURGE_INTERVAL)
+         ):
+         self.purged = now
+         self.purge(self.retention)
+   
+   def load (self, problemId):
+      """Loads result.
+      
+      Parameters
+      ----------
+      problemId: str
+         Problem id.
+      
+      Returns
+      -------
+      NoneType
+         If problem id is invalid or has no stored result.
+      dict
+         Stored result.
+      
+      """
+      
+      try:
+         with open(self.path(problemId)) as file:
+            return json.load(file)
+      except (ValueError, FileNotFoundError):
+         return None
+   
+   def purge (self, maxAge):
+      """Removes old results.
+      
+      Parameters
+      ----------
+      maxAge: float
+         Seconds after which stored results (and left over temporary
+         files) are removed.
+      
+      Returns
+      -------
+      int
+         Number of removed files.
+      
+      """
+      
+      removed = 0
+      oldest = time.time() - maxAge
+      
+      for entry in os.scandir(self.directory):
+         if (not entry.name.endswith(('.json', '.tmp',))):
+            continue
+         
+         try:
+            if (entry.stat().st_mtime < oldest):
+               os.unlink(entry.path)
+               removed += 1
+         except FileNotFoundError:
+            continue
+      
+      return removed
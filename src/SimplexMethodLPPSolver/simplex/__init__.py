@@ -1,19 +1,40 @@
 from .dataStructures import (
-   Constraint, AuxillaryConstraint, Row, IterationTable,
-   OptimalSolution, SimplexProblem
+   Constraint, AuxillaryConstraint, ColumnView, Row, IterationTable,
+   OptimalSolution, SymbolTable, SimplexProblem
 )
 from .customExceptions import CustomExceptions
+from .lruCache import LRUCache
 from .preprocessor import PreProcessor
+from .modelReader import ModelReader
+from .problemArchive import ProblemArchive
+from .historySerializer import HistorySerializer
+from .pivotRules import PivotRules
+from .memmapTableau import MemmapTableau
 from .algorithm import SimplexAlgorithm
+from .model import Var, VarArray, LinExpr, MatrixExpr, LinConstraint, Model
 
 __all__ = [
    'Constraint',
    'AuxillaryConstraint',
+   'ColumnView',
    'Row',
    'IterationTable',
    'OptimalSolution',
+   'SymbolTable',
    'SimplexProblem',
    'CustomExceptions',
+   'LRUCache',
    'PreProcessor',
+   'ModelReader',
+   'ProblemArchive',
+   'HistorySerializer',
+   'PivotRules',
+   'MemmapTableau',
    'SimplexAlgorithm',
+   'Var',
+   'VarArray',
+   'LinExpr',
+   'MatrixExpr',
+   'LinConstraint',
+   'Model',
 ]
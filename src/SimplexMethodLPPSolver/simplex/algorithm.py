@@ -2,12 +2,13 @@ import numpy as np
 
 from .customExceptions import CustomExceptions
 from .dataStructures import (
-   Constraint, AuxillaryConstraint, Row, IterationTable,
-   OptimalSolution, SimplexProblem
+   Constraint, AuxillaryConstraint, ColumnView, Row, IterationTable,
+   OptimalSolution, SymbolTable, SimplexProblem
 )
+from .pivotRules import PivotRules
+from .memmapTableau import MemmapTableau
 
 class SimplexAlgorithm:
-   global iteracoes # vou usar na ultima linha
    """Algorithm to calculate optimal solution for simplex LPP problem.
    
    Contains simplex algorithm steps divided into functions.
@@ -20,6 +21,9 @@ class SimplexAlgorithm:
       Frames auxillary components.
       Frames auxillary objective function and constraints which
       are required for further steps.
+   slackPrefix (SimplexProblem)
+      Chooses slack variable prefix.
+      Chooses prefix for slack variables which no variable starts with.
    frameInitialSimplexTable (SimplexProblem)
       Frames initial simplex table.
       Creates initial simplex table and forms initial basis.
@@ -79,35 +83,8 @@ class SimplexAlgorithm:
          simplexProblem.objectiveFunction.copy()
       
       simplexProblem.auxillaryConstraints = []
-      variableList = [
-         str(term[1])
-         for term in simplexProblem.objectiveFunction
-      ]
-      [
-         None
-         for constraint in simplexProblem.constraints
-         if (variableList.extend(
-            list(np.array(constraint.lhs)[:, 1])
-         ) != None)
-      ]
-      variableList = set([
-         variable[0]
-         for variable in variableList
-      ])
-      slackLetter = None
-      
-      for i in range(0, 25):
-         if (chr(ord('d') + i) not in variableList):
-            slackLetter = chr(ord('d') + i)
-            break
-         elif (chr(ord('D') + i) not in variableList):
-            slackLetter = chr(ord('D') + i)
-            break
-      
-      if (slackLetter == None):
-         return None
-      
-      simplexProblem.slackLetter = slackLetter
+      simplexProblem.slackLetter = SimplexAlgorithm.slackPrefix(simplexProblem)
+      slackLetter = simplexProblem.slackLetter
       slacks = 0
       
       for constraint, cIndex in zip(
@@ -163,10 +140,61 @@ class SimplexAlgorithm:
       
       simplexProblem.slacks = slacks
    
+   def slackPrefix (simplexProblem):
+      """Chooses slack variable prefix.
+      
+      Chooses prefix for slack variables which no variable of
+      simplexProblem starts with, in a single pass over its terms.
+      First letter from 'd', 'D', 'e', 'E', ... which no variable starts
+      with is preferred, else 'd' followed by one more underscore than
+      any variable starting with 'd_' has, so that slack variables never
+      clash with problem's variables, however many variable families it
+      has.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem whose slack variables have to be named.
+      
+      Returns
+      -------
+      str
+         Slack variable prefix.
+      
+      """
+      
+      initials = set()
+      underscores = 0 # longest '_' run following initial 'd'.
+      
+      for terms in [simplexProblem.objectiveFunction,] + [
+            constraint.lhs
+            for constraint in simplexProblem.constraints
+         ]:
+         for term in terms:
+            variable = str(term[1])
+            initials.add(variable[:1])
+            
+            if (variable[:1] == 'd'):
+               underscores = max(
+                  underscores,
+                  len(variable[1:]) - len(variable[1:].lstrip('_')),
+               )
+      
+      for letter in 'defghijklmnopqrstuvwxyz':
+         for slackLetter in (letter, letter.upper(),):
+            if (slackLetter not in initials):
+               return slackLetter
+      
+      return 'd' + ('_' * (underscores + 1))
+   
    def frameInitialSimplexTable (simplexProblem):
       """Frames initial simplex table.
       
       Creates initial simplex table and forms initial basis.
+      Interns variables in SymbolTable in order of first appearance, so
+      that table is keyed by stable int aj columns.
+      Coefficients of all rows are stored in one contiguous block of
+      IterationTable, with aj of each Row being a ColumnView of its row.
       
       Parameters
       ----------
@@ -187,14 +215,32 @@ class SimplexAlgorithm:
          )):
          return None
       
+      symbolTable = SymbolTable()
+      
+      for term in simplexProblem.objectiveFunction:
+         symbolTable.intern(str(term[1]))
+      
+      for constraint in simplexProblem.auxillaryConstraints:
+         for term in constraint.lhs:
+            symbolTable.intern(str(term[1]))
+      
+      for term in simplexProblem.auxillaryObjectiveFunction:
+         symbolTable.intern(str(term[1]))
+      
+      simplexProblem.symbolTable = symbolTable
+      simplexProblem.netVariables = tuple(symbolTable.names)
+      
       iterationTable = IterationTable()
       iterationTable.iteration = 1
-      iterationTable.Cj = dict([
-         term[::-1]
-         for term in simplexProblem.auxillaryObjectiveFunction
-      ])
-      netVariables = list(iterationTable.Cj.keys())
+      iterationTable.aj = list(range(0, len(symbolTable)))
+      iterationTable.Cj = ColumnView(np.zeros(len(symbolTable)))
       
+      for term in simplexProblem.auxillaryObjectiveFunction:
+         iterationTable.Cj[symbolTable.columns[str(term[1])]] = term[0]
+      
+      iterationTable.coefficients = np.zeros((
+         len(simplexProblem.auxillaryConstraints), len(symbolTable)
+      ))
       iterationTable.rowi = []
       
       for constraint, i in zip(
@@ -203,76 +249,29 @@ class SimplexAlgorithm:
          ):
          row = Row()
          row.i = i
-         row.aj = dict([
-            term[::-1]
-            for term in constraint.lhs
-         ])
+         row.aj = ColumnView(iterationTable.coefficients[i])
+         
+         for term in constraint.lhs:
+            row.aj[symbolTable.columns[str(term[1])]] = term[0]
+         
          row.b = float(constraint.rhs)
          if (constraint.slackVariable != None):
-            row.B = constraint.slackVariable
             row.XB = constraint.slackVariable
-            row.CB = float(0)
          else:
-            row.B = constraint.lhs[-1][1]
             row.XB = constraint.lhs[-1][1]
-            row.CB = float(iterationTable.Cj.get(row.XB, float(0)))
+         row.B = symbolTable.columns[row.XB]
+         row.CB = float(iterationTable.Cj[row.B])
          
-         netVariables.extend(list(row.aj.keys()))
          iterationTable.rowi.append(row)
       
-      netVariables = tuple(set(netVariables))
-      simplexProblem.netVariables = netVariables
-      
-      simplexProblem.AXBMaps = dict([
-         ((str('a') + str(i + 1)), str(variable))
-         for variable, i in zip(
-            netVariables,
-            range(0, len(netVariables))
-         )
-      ])
-      simplexProblem.XABMaps = dict([
-         (str(variable), (str('a') + str(i + 1)))
-         for variable, i in zip(
-            netVariables,
-            range(0, len(netVariables))
-         )
-      ])
-      
-      iterationTable.Cj = dict([
-         (simplexProblem.XABMaps[key], value)
-         for key, value in iterationTable.Cj.items()
-      ])
-      iterationTable.Cj.update([
-         (variable, float(0))
-         for variable in
-         list(set(
-            set(simplexProblem.AXBMaps.keys())
-            - set(iterationTable.Cj.keys())
-         ))
-      ])
-      
-      for row in iterationTable.rowi:
-         row.B = simplexProblem.XABMaps[row.B]
-         row.aj = dict([
-            (simplexProblem.XABMaps[key], value)
-            for key, value in row.aj.items()
-         ])
-         row.aj.update([
-            (variable, float(0))
-            for variable in
-            list(set(set(simplexProblem.AXBMaps.keys()) - set(row.aj.keys())))
-         ])
-         row.CB = float(iterationTable.Cj[row.B])
-      
-      iterationTable.aj = list(simplexProblem.AXBMaps.keys())
       simplexProblem.iterationTables = [iterationTable,]
    
-
-
    def calculateDeltaJ (simplexProblem):
       """Calculates deltaJ.
       
       Calculates Zj, deltaJ = Zj-Cj for/from last IterationTable.
+      zij of all rows are calculated at once into IterationTable's zij
+      block, and summed row by row into Zj.
       
       Parameters
       ----------
@@ -295,37 +294,19 @@ class SimplexAlgorithm:
          )):
          return None
       
-      simplexProblem.iterationTables[-1].zj = {}
+      iterationTable = simplexProblem.iterationTables[-1]
+      iterationTable.zij = (
+         np.array([row.CB for row in iterationTable.rowi])[:, None]
+         * iterationTable.coefficients
+      )
+      zj = np.zeros(len(iterationTable.aj))
       
-      for row in simplexProblem.iterationTables[-1].rowi:
-         row.zij = dict([
-            (aj, float(row.CB * row.aj[aj]))
-            for aj in row.aj.keys()
-         ])
-         
-         simplexProblem.iterationTables[-1].zj.update([
-            (
-               aj,
-               float(
-                  float(
-                     simplexProblem.iterationTables[-1].zj.get(aj, float(0))
-                  )
-                  + float(row.zij.get(aj, float(0)))
-               ),
-            )
-            for aj in row.aj.keys()
-         ])
+      for row, zij in zip(iterationTable.rowi, iterationTable.zij):
+         row.zij = ColumnView(zij)
+         zj += zij
       
-      simplexProblem.iterationTables[-1].deltaJ = dict([
-         (
-            aj,
-            float(
-               simplexProblem.iterationTables[-1].zj.get(aj, float(0))
-               - simplexProblem.iterationTables[-1].Cj.get(aj, float(0))
-            ),
-         )
-         for aj in simplexProblem.iterationTables[-1].aj
-      ])
+      iterationTable.zj = ColumnView(zj)
+      iterationTable.deltaJ = ColumnView(zj - iterationTable.Cj.array)
    
    def calculateKeys (simplexProblem):
       """Calculates key values.
@@ -333,6 +314,8 @@ class SimplexAlgorithm:
       Calculates key row, column, element for/from last IterationTable,
       minimum ratio for/from Row, only if SimplexProblem is not terminated
       and optimal solution hasn't been found.
+      Key column and row are selected by PivotRules, as per SimplexProblem's
+      ratioTest and degeneracy state (Bland's rule).
       
       Parameters
       ----------
@@ -355,14 +338,10 @@ class SimplexAlgorithm:
       if (simplexProblem.terminated == True):
          return None
       
-      keyColumn = None
-      mostNegativeDeltaJ = float(0)
-      for aj, deltaj in simplexProblem.iterationTables[-1].deltaJ.items():
-         if (deltaj < mostNegativeDeltaJ):
-            keyColumn = aj
-            mostNegativeDeltaJ = deltaj
+      iterationTable = simplexProblem.iterationTables[-1]
+      keyColumn = PivotRules.keyColumn(simplexProblem, iterationTable)
       
-      if (mostNegativeDeltaJ >= float(0)):
+      if (keyColumn == None):
          simplexProblem.terminated = True
          simplexProblem.terminationReason = (
             SimplexProblem.Terminate.REACHED_OPTIMAL
@@ -370,29 +349,11 @@ class SimplexAlgorithm:
          
          return None
       
-      simplexProblem.iterationTables[-1].keyColumn = keyColumn
+      iterationTable.keyColumn = keyColumn
       
-      keyRow = None
-      leastPositiveRatio = float('inf')
-      
-      for row in simplexProblem.iterationTables[-1].rowi:
-         row.minRatio = float(CustomExceptions.safe_execute(
-            float('inf'), lambda: (row.b / row.aj.get(keyColumn, float(0))),
-         ))
-         
-         row.isKeyRow = False
-         
-         if (
-               (row.minRatio < leastPositiveRatio)
-               and (row.minRatio > float(0))
-            ):
-            keyRow = row
-            leastPositiveRatio = row.minRatio
+      keyRow = PivotRules.keyRow(simplexProblem, iterationTable, keyColumn)
       
-      if (
-            (keyRow == None)
-            or (leastPositiveRatio == float('inf'))
-         ):
+      if (keyRow == None):
          simplexProblem.terminated = True
          simplexProblem.terminationReason = (
             SimplexProblem.Terminate.UNBOUNDED_SOLUTION
@@ -400,12 +361,14 @@ class SimplexAlgorithm:
          
          return None
       
-      simplexProblem.iterationTables[-1].keyRow = keyRow
+      iterationTable.keyRow = keyRow
       keyRow.isKeyRow = True
-      simplexProblem.iterationTables[-1].keyElement = keyRow.aj.get(
+      iterationTable.keyElement = keyRow.aj.get(
          keyColumn, float(0)
       )
       
+      PivotRules.recordPivot(simplexProblem, keyRow)
+      
       simplexProblem.terminated = False
    
    def calculateNewIterationTable (simplexProblem):
@@ -413,6 +376,8 @@ class SimplexAlgorithm:
       
       Calculates new IterationTable, succeeding last IterationTable only
       if calculation has started and SimplexProblem is not terminated.
+      Coefficient block is pivoted at once, with Row aj viewing its rows,
+      and Cj is shared with last IterationTable.
       
       Parameters
       ----------
@@ -440,36 +405,41 @@ class SimplexAlgorithm:
       newIterationTable = IterationTable()
       
       newIterationTable.iteration = oldIterationTable.iteration + 1
-      newIterationTable.Cj = oldIterationTable.Cj.copy()
+      newIterationTable.Cj = oldIterationTable.Cj
       newIterationTable.aj = oldIterationTable.aj.copy()
       newIterationTable.rowi = []
       
+      keyColumn = oldIterationTable.keyColumn
+      keyElement = oldIterationTable.keyElement
+      oldCoefficients = oldIterationTable.coefficients
+      keyCoefficients = oldCoefficients[oldIterationTable.keyRow.i]
+      
+      newIterationTable.coefficients = oldCoefficients - (
+         (keyCoefficients[None, :] * oldCoefficients[:, keyColumn, None])
+         / keyElement
+      )
+      newIterationTable.coefficients[:, keyColumn] = float(0)
+      newIterationTable.coefficients[oldIterationTable.keyRow.i] = (
+         keyCoefficients / keyElement
+      )
+      newIterationTable.coefficients[
+         oldIterationTable.keyRow.i, keyColumn
+      ] = float(1)
+      
       for oldRow in oldIterationTable.rowi:
          newRow = Row()
          newRow.i = oldRow.i
+         newRow.aj = ColumnView(newIterationTable.coefficients[oldRow.i])
          
          if (oldRow.isKeyRow == True):
-            newRow.B = oldIterationTable.keyColumn
-            newRow.XB = simplexProblem.AXBMaps[newRow.B]
+            newRow.B = keyColumn
+            newRow.XB = simplexProblem.symbolTable.name(newRow.B)
             newRow.CB = newIterationTable.Cj.get(newRow.B, float(0))
             
             newRow.b = CustomExceptions.safe_execute(
                float(oldRow.b * float('inf')),
-               lambda: (oldRow.b / oldIterationTable.keyElement)
+               lambda: (oldRow.b / keyElement)
             )
-            
-            newRow.aj = dict([
-               (
-                  aj,
-                  float(1)
-                  if (aj == oldIterationTable.keyColumn)
-                  else CustomExceptions.safe_execute(
-                     float(oldRow.aj[aj] * float('inf')),
-                     lambda: (oldRow.aj[aj] / oldIterationTable.keyElement)
-                  )
-               )
-               for aj, aij in oldRow.aj.items()
-            ])
          else:
             newRow.B = oldRow.B
             newRow.XB = oldRow.XB
@@ -482,38 +452,12 @@ class SimplexAlgorithm:
                   lambda: (
                      (
                         (oldIterationTable.keyRow.b)
-                        * (oldRow.aj.get(oldIterationTable.keyColumn, float(0)))
+                        * (oldRow.aj.get(keyColumn, float(0)))
                      )
-                     / (oldIterationTable.keyElement)
+                     / (keyElement)
                   ),
                )
             )
-            
-            newRow.aj = dict([
-               (
-                  aj,
-                  float(0)
-                  if (aj == oldIterationTable.keyColumn)
-                  else float(
-                     aij
-                     - CustomExceptions.safe_execute(
-                        float(0),
-                        lambda: (
-                           (
-                              (oldIterationTable.keyRow.aj.get(aj, float(0)))
-                              * (
-                                 oldRow.aj.get(
-                                    oldIterationTable.keyColumn, float(0)
-                                 )
-                              )
-                           )
-                           / (oldIterationTable.keyElement)
-                        ),
-                     )
-                  )
-               )
-               for aj, aij in oldRow.aj.items()
-            ])
          
          newIterationTable.rowi.append(newRow)
       
@@ -576,15 +520,20 @@ class SimplexAlgorithm:
       )
       
       simplexProblem.optimalSolution = optimalSolution
-      global solOtima
-      solOtima = simplexProblem.optimalSolution
    
    def calculateOptimalSolution (simplexProblem):
-      global iteracoes # vou usar na ultima linha
       """Calculates optimal solution, automatically.
       
       Runs all steps of simplex algorithm automatically to reach optimal
       solution, if exists.
+      If SimplexProblem's perturbation is set, rhs is perturbed before
+      first iteration and perturbation is removed before framing optimal
+      solution.
+      If SimplexProblem's engine is MEMMAP, calculation is delegated to
+      MemmapTableau after framing auxillary components.
+      If SimplexProblem's iterationHook is set, it is called after keys of
+      each IterationTable are calculated, i.e., once per pivot and once
+      for last IterationTable, with its terminated set.
       
       Raises
       ------
@@ -621,18 +570,28 @@ class SimplexAlgorithm:
          ):
          raise CustomExceptions.FrameError(simplexProblem)
       
+      simplexProblem.degeneratePivots = 0
+      simplexProblem.consecutiveDegeneratePivots = 0
+      simplexProblem.blandRule = False
+      simplexProblem.blandPivots = 0
+      
+      if (simplexProblem.engine == SimplexProblem.Engine.MEMMAP):
+         MemmapTableau.calculateOptimalSolution(simplexProblem)
+         
+         return None
+      
       SimplexAlgorithm.frameInitialSimplexTable(simplexProblem)
       
       if (
-            (simplexProblem.AXBMaps == None)
-            or (len(simplexProblem.AXBMaps) < 1)
-            or (simplexProblem.XABMaps == None)
-            or (len(simplexProblem.XABMaps) < 1)
+            (simplexProblem.symbolTable == None)
+            or (len(simplexProblem.symbolTable) < 1)
             or (simplexProblem.iterationTables == None)
             or (len(simplexProblem.iterationTables) < 1)
          ):
          raise CustomExceptions.FrameError(simplexProblem)
       
+      PivotRules.perturb(simplexProblem)
+      
       while True:
          SimplexAlgorithm.calculateDeltaJ(simplexProblem)
          
@@ -643,6 +602,9 @@ class SimplexAlgorithm:
          
          SimplexAlgorithm.calculateKeys(simplexProblem)
          
+         if (simplexProblem.iterationHook != None):
+            simplexProblem.iterationHook(simplexProblem)
+         
          if (simplexProblem.terminated == False):
             oldIteration = simplexProblem.iterationTables[-1].iteration
             
@@ -658,14 +620,6 @@ class SimplexAlgorithm:
                      SimplexProblem.Terminate.REACHED_OPTIMAL
                   )
                ):
+               PivotRules.removePerturbation(simplexProblem)
                SimplexAlgorithm.frameOptimalSolution(simplexProblem)
             break
-      
-      iteracoes = simplexProblem.iterationTables
-
-
-   def getIterations():
-      return iteracoes
-   
-   def getsolOtima():
-      return solOtima
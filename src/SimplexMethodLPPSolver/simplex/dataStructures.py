@@ -18,6 +18,8 @@ class Constraint:
       Initializes the data structure.
    """
    
+   __slots__ = ('lhs', 'equalityType', 'rhs',)
+   
    def __init__ (self):
       """Initializes the data structure.
       """
@@ -51,6 +53,8 @@ class AuxillaryConstraint:
       Initializes the data structure.
    """
    
+   __slots__ = ('lhs', 'equalityType', 'rhs', 'slackVariable',)
+   
    def __init__ (self):
       """Initializes the data structure.
       """
@@ -60,6 +64,75 @@ class AuxillaryConstraint:
       self.rhs = None # RHS constant.
       self.slackVariable = None # str(slackLetter + str(slacks)).
 
+class ColumnView:
+   """ColumnView data structure.
+   
+   Dict-like view of a 1-D numpy array (a row of IterationTable's
+   coefficient block, Cj, zj, deltaJ), keyed by int aj columns, so that
+   values are stored contiguously and not copied per Row.
+   Values are returned as float.
+   
+   Attributes
+   ----------
+   array: numpy.ndarray
+      Viewed array, indexed by aj column.
+   
+   Methods
+   -------
+   __init__ (values)
+      Initializes the data structure.
+   get (aj, default=None)
+      Returns value of aj column, default if aj is not a column.
+   keys (), values (), items ()
+      Returns aj columns, values, (aj, value) pairs in column order.
+   copy ()
+      Returns ColumnView of a copy of viewed array.
+   """
+   
+   __slots__ = ('array',)
+   
+   def __init__ (self, values):
+      """Initializes the data structure.
+      """
+      
+      self.array = values # numpy.ndarray - indexed by aj.
+   
+   def __getitem__ (self, aj):
+      if (aj not in self):
+         raise KeyError(aj)
+      
+      return float(self.array[aj])
+   
+   def __setitem__ (self, aj, value):
+      self.array[aj] = value
+   
+   def __contains__ (self, aj):
+      return (hasattr(aj, '__index__') and (0 <= aj < len(self.array)))
+   
+   def __iter__ (self):
+      return iter(range(0, len(self.array)))
+   
+   def __len__ (self):
+      return len(self.array)
+   
+   def get (self, aj, default=None):
+      if (aj in self):
+         return float(self.array[aj])
+      
+      return default
+   
+   def keys (self):
+      return range(0, len(self.array))
+   
+   def values (self):
+      return self.array.tolist()
+   
+   def items (self):
+      return zip(range(0, len(self.array)), self.array.tolist())
+   
+   def copy (self):
+      return ColumnView(self.array.copy())
+
 class Row:
    """Row data structure.
    
@@ -71,16 +144,18 @@ class Row:
       Row index.
    CB: float
       Corresponding Cj value for B.
-   B: str
-      aj variable masking XB.
+   B: int
+      aj column masking XB.
    XB: str
       xj variable, present in basis of current IterationTable for current row.
    b: float
       b value for current row in IterationTable.
-   aj: dict
-      Dict with key as aj and value as aij.
-   zij: dict
-      Dict with key as aj and value as zij for current row.
+   aj: dict, ColumnView
+      Dict with key as aj column and value as aij, ColumnView of row of
+      IterationTable's coefficients when framed by SimplexAlgorithm.
+   zij: dict, ColumnView
+      Dict with key as aj column and value as zij for current row,
+      ColumnView of row of IterationTable's zij.
    isKeyRow: bool
       Whether this row is a key row for current iteration table.
    minRatio: float
@@ -92,26 +167,30 @@ class Row:
       Initializes the data structure.
    """
    
+   __slots__ = (
+      'i', 'CB', 'B', 'XB', 'b', 'aj', 'zij', 'isKeyRow', 'minRatio',
+   )
+   
    def __init__ (self):
       """Initializes the data structure.
       """
       
       self.i = None # row index.
       self.CB = None # float - cj.
-      self.B = None # str - aj.
+      self.B = None # int - aj column.
       self.XB = None # str - xj ~= aj.
       self.b = None # float. SIGNIFICA O LD
-      self.aj = None # {'aj': aij,}.
-      self.zij = None # {'aj':zij,}.
+      self.aj = None # {aj: aij,}.
+      self.zij = None # {aj: zij,}.
       self.isKeyRow = None # True|False.
       self.minRatio = None # float - bi/aij.
    
    def to_dict(self):
         return {
             'i': self.i,
-            'aj': {key: float(value) for key, value in self.aj.items()}, # coef das variaveis nao basicas
+            'aj': {SymbolTable.label(key): float(value) for key, value in self.aj.items()}, # coef das variaveis nao basicas
             'b': float(self.b), # Lado Direito
-            'B': self.B,   # nome da variavel basica x1,x2,x3,x4
+            'B': SymbolTable.label(self.B),   # nome da variavel basica x1,x2,x3,x4
             'XB': self.XB, # coef da variavel basica
             'CB': float(self.CB),
             'minRatio': float(self.minRatio) if self.minRatio is not None else None
@@ -126,22 +205,26 @@ class IterationTable:
    ----------
    iteration: int
       Iteration number.
-   Cj: dict
-      Stores cj values keyed to aj variables.
+   Cj: dict, ColumnView
+      Stores cj values keyed to aj columns.
    aj: list
-      List of all aj variables used in table.
+      List of all aj columns used in table.
    keyRow: Row
       Key row, selected for next iteration.
-   keyColumn: str
-      aj variable which is selected as key column for next iteration.
+   keyColumn: int
+      aj column which is selected as key column for next iteration.
    keyElement: float
       Key element value, found at intersection of key row and key column.
    rowi: list
       List of all rows, ordered as last one is latest.
-   zj: dict
-      zj values per column keyed to aj variables.
-   deltaJ: dict
-      deltaJ values per column keyed to aj variables.
+   zj: dict, ColumnView
+      zj values per column keyed to aj columns.
+   deltaJ: dict, ColumnView
+      deltaJ values per column keyed to aj columns.
+   coefficients: numpy.ndarray, None
+      Contiguous (rows x aj columns) block of aij, viewed by aj of rows.
+   zij: numpy.ndarray, None
+      Contiguous (rows x aj columns) block of zij, viewed by zij of rows.
    
    Methods
    -------
@@ -149,31 +232,38 @@ class IterationTable:
       Initializes the data structure.
    """
    
+   __slots__ = (
+      'iteration', 'Cj', 'aj', 'keyRow', 'keyColumn', 'keyElement', 'rowi',
+      'zj', 'deltaJ', 'coefficients', 'zij',
+   )
+   
    def __init__ (self):
       """Initializes the data structure.
       """
       
       self.iteration = None # int - 1, 2, 3, ...
-      self.Cj = None # {'aj': cj,}
-      self.aj = None # ['aj',] - list containing all ajs
+      self.Cj = None # {aj: cj,}
+      self.aj = None # [aj,] - list containing all aj columns
       self.keyRow = None # Row - from rowi.
-      self.keyColumn = None # str - 'aj'
+      self.keyColumn = None # int - aj
       self.keyElement = None # float aij
       self.rowi = None # [Row,]
-      self.zj = None # {'aj': zj,}
-      self.deltaJ = None # {'aj': deltaj,}
+      self.zj = None # {aj: zj,}
+      self.deltaJ = None # {aj: deltaj,}
+      self.coefficients = None # numpy.ndarray - [[aij,],] rows x aj.
+      self.zij = None # numpy.ndarray - [[zij,],] rows x aj.
    
    def to_dict(self):     # aqui eu posso pegar o que eu quiser pra jogar pro front
       return{
          'iteration': self.iteration, # numero da iteracao
-         'Cj': self.Cj,
-         'aj': self.aj,
+         'Cj': {SymbolTable.label(key): value for key, value in self.Cj.items()},
+         'aj': [SymbolTable.label(aj) for aj in self.aj],
          'keyRow': self.keyRow.to_dict() if self.keyRow else None, # linha pivo
-         'keyColumn': self.keyColumn, # coluna pivo
+         'keyColumn': SymbolTable.label(self.keyColumn) if (self.keyColumn != None) else None, # coluna pivo
          'keyElement': self.keyElement, # num pivo
          'rowi': [row.to_dict() for row in self.rowi] if self.rowi else [],
-         'zj': self.zj, # z
-         'deltaJ': self.deltaJ
+         'zj': {SymbolTable.label(key): value for key, value in self.zj.items()} if self.zj else self.zj, # z
+         'deltaJ': {SymbolTable.label(key): value for key, value in self.deltaJ.items()} if self.deltaJ else self.deltaJ
       }
 
 class OptimalSolution:
@@ -198,6 +288,8 @@ class OptimalSolution:
       Initializes the data structure.
    """
    
+   __slots__ = ('iterationTable', 'Xj', 'optimalValue',)
+   
    def __init__ (self):
       """Initializes the data structure.
       """
@@ -212,6 +304,62 @@ class OptimalSolution:
          'optimalValue': self.optimalValue
       }
 
+class SymbolTable:
+   """SymbolTable data structure.
+   
+   Interns variables of a SimplexProblem, assigning stable integer column
+   indices in order of first appearance, so that engine structures are
+   keyed by int and variables are only looked up by name for reporting.
+   
+   Attributes
+   ----------
+   names: list
+      List of variables, indexed by column.
+   columns: dict
+      Dict with variable as key and column as value.
+   
+   Methods
+   -------
+   __init__ ()
+      Initializes the data structure.
+   intern (name)
+      Returns column of variable, assigning next column if it is new.
+   name (column)
+      Returns variable of column.
+   label (column)
+      Returns aj label ('a1', 'a2', ...) of column, called on class.
+   __len__ ()
+      Returns number of columns.
+   """
+   
+   __slots__ = ('names', 'columns',)
+   
+   def __init__ (self):
+      """Initializes the data structure.
+      """
+      
+      self.names = [] # ['variableName',] - indexed by column.
+      self.columns = {} # {'variableName': column,}
+   
+   def intern (self, name):
+      column = self.columns.get(name)
+      
+      if (column == None):
+         column = len(self.names)
+         self.columns[name] = column
+         self.names.append(name)
+      
+      return column
+   
+   def name (self, column):
+      return self.names[column]
+   
+   def label (column):
+      return 'a' + str(column + 1)
+   
+   def __len__ (self):
+      return len(self.names)
+
 class SimplexProblem:
    """SimplexProblem data structure.
    
@@ -221,6 +369,10 @@ class SimplexProblem:
    ----------
    Terminate: class
       Class containing termination reasons.
+   RatioTest: class
+      Class containing ratio test rules.
+   Engine: class
+      Class containing calculation engines.
    problemType: str
       Type of problem - minimization ('min') or maximization ('max').
    objectiveFunction: list
@@ -234,16 +386,21 @@ class SimplexProblem:
       List of AuxillaryConstraint, generated while calculating auxillary
       components.
    slackLetter: str, None
-      Slack variable used to denote a slack variable, if used in any
-      auxillaryConstraint, else None.
+      Prefix used to denote a slack variable, which no other variable
+      starts with, None if auxillary components are not framed.
    slacks: int
       Total number of slack variables used.
    netVariables: tuple
-      Tuple containing set of all variables used in SimplexProblem.
-   AXBMaps: dict
-      Maps aj variables to xj variables.
-   XABMaps: dict
-      Maps xj variables to aj variables.
+      Tuple containing all variables used in SimplexProblem, in column
+      order.
+   columns: dict
+      Maps constraint variables to column indices, in order of appearance.
+   coordinates: list
+      Non-zero lhs coefficients of constraints in coordinate form, as tuples
+      (row, column, value) with row indexing constraints and column from
+      columns.
+   symbolTable: SymbolTable
+      Maps xj variables to int columns (aj) of IterationTable and back.
    iterationTables: list
       List of all IterationTable (s) in order, with latest at end.
    terminated: bool, None
@@ -252,6 +409,42 @@ class SimplexProblem:
       Reason for terminating calculation.
    optimalSolution: OptimalSolution
       Optimal solution of problem, if exists.
+   ratioTest: str
+      Rule used to select key row, one of RatioTest constants.
+   pivotTolerance: float
+      Tolerance under which ratios and pivot elements are treated as zero.
+   feasibilityTolerance: float
+      Tolerance by which b may be relaxed in HARRIS ratio test.
+   blandThreshold: int, None
+      Consecutive degenerate pivots after which Bland's rule is used,
+      None to never use Bland's rule.
+   perturbation: float, None
+      Maximum relative rhs perturbation applied before calculation and
+      removed at the end, None to disable perturbation.
+   perturbationSeed: int, None
+      Seed for the random rhs perturbation.
+   unperturbedRhs: list, None
+      b values of initial IterationTable before perturbation, if perturbed.
+   degeneratePivots: int
+      Total number of degenerate pivots (pivots with zero minimum ratio).
+   consecutiveDegeneratePivots: int
+      Number of degenerate pivots since last non-degenerate pivot.
+   blandRule: bool
+      Whether Bland's rule is currently used to select key column and row.
+   blandPivots: int
+      Total number of pivots selected by Bland's rule.
+   engine: str
+      Engine used to calculate solution, one of Engine constants.
+   blockSize: int
+      Number of rows pivoted at once by MEMMAP engine, which bounds its
+      resident tableau memory to about blockSize * columns floats.
+   tableauPath: str, None
+      File backing tableau of MEMMAP engine, None to use a temporary file
+      removed after calculation.
+   iterationHook: function, None
+      Function called with SimplexProblem after keys of each
+      IterationTable are calculated (by TABLEAU engine), None to call
+      nothing.
    
    Methods
    -------
@@ -282,6 +475,46 @@ class SimplexProblem:
       FRAME_ERROR = 'Error while framing the problem.'
       CALC_ERROR = 'Error while calculating the solution.'
    
+   class RatioTest:
+      """Ratio test rules.
+      
+      Contains list of rules used to select key row as CONSTANTs to
+      simplify comparison process.
+      
+      Attributes
+      ----------
+      STANDARD: str
+         First row with minimum ratio.
+      LEXICOGRAPHIC: str
+         Minimum ratio, ties broken lexicographically over initial basis
+         columns of the rows divided by their key column element.
+      HARRIS: str
+         Harris two-pass ratio test, row with largest key column element
+         among rows within feasibilityTolerance of minimum ratio.
+      """
+      
+      STANDARD = 'standard'
+      LEXICOGRAPHIC = 'lexicographic'
+      HARRIS = 'harris'
+   
+   class Engine:
+      """Calculation engines.
+      
+      Contains list of engines used to calculate solution as CONSTANTs to
+      simplify comparison process.
+      
+      Attributes
+      ----------
+      TABLEAU: str
+         In memory IterationTable for each iteration.
+      MEMMAP: str
+         Dense tableau in a numpy.memmap backed file, pivoted in blocks of
+         rows, without iteration tables and rhs perturbation.
+      """
+      
+      TABLEAU = 'tableau'
+      MEMMAP = 'memmap'
+   
    def __init__ (self):
       """Initializes the data structure.
       """
@@ -294,9 +527,25 @@ class SimplexProblem:
       self.slackLetter = None # str.
       self.slacks = None # int.
       self.netVariables = None # ('x1',)
-      self.AXBMaps = None # {'ai': 'xi',}
-      self.XABMaps = None # {'xi': 'ai',}
+      self.columns = None # {'variableName': column,}
+      self.coordinates = None # [(row, column, value,),]
+      self.symbolTable = None # SymbolTable - 'xi' <-> column.
       self.iterationTables = None # [IterationTable,]
       self.terminated = None # True|False - finishedCalculation?|notStarted
       self.terminationReason = None # class.<reason>
-      self.optimalSolution = None # OptimalSolution
\ No newline at end of file
+      self.optimalSolution = None # OptimalSolution
+      self.ratioTest = SimplexProblem.RatioTest.STANDARD # RatioTest.<rule>
+      self.pivotTolerance = 1e-9 # float - |value| <= tolerance ~= 0.
+      self.feasibilityTolerance = 1e-7 # float - b relaxation for HARRIS.
+      self.blandThreshold = 10 # int|None - degenerate pivots before Bland.
+      self.perturbation = None # float|None - max relative rhs perturbation.
+      self.perturbationSeed = None # int|None.
+      self.unperturbedRhs = None # [b,] - initial b before perturbation.
+      self.degeneratePivots = 0 # int.
+      self.consecutiveDegeneratePivots = 0 # int.
+      self.blandRule = False # True|False - Bland's rule active?
+      self.blandPivots = 0 # int.
+      self.engine = SimplexProblem.Engine.TABLEAU # Engine.<engine>
+      self.blockSize = 1024 # int - rows per block for MEMMAP.
+      self.tableauPath = None # str|None - MEMMAP file, None ~= temporary.
+      self.iterationHook = None # function(SimplexProblem)|None.
\ No newline at end of file
@@ -0,0 +1,267 @@
+import base64
+import json
+
+import numpy as np
+
+from .dataStructures import SymbolTable
+
+class HistorySerializer:
+   """Columnar serializer of iteration history.
+   
+   Serializes all IterationTable (s) of a SimplexProblem at once, as
+   arrays stacked over iterations (and rows) in aj column order,
+   converted by a single ndarray.tolist() per field instead of to_dict
+   for each Row and IterationTable.
+   Non-finite values (inf ratios) are serialized as None, unless float
+   arrays are packed as base64 encoded little-endian float64 buffers,
+   which skips per-float text encoding of large histories.
+   Delta encoding sends initial table in full and only pivots afterwards,
+   as each pivot rescales key row and updates other rows by a rank-one
+   update, which the client replays with same floating point operations
+   (replaySimplex in index.html).
+   
+   Methods
+   -------
+   toColumnar (iterationTables, symbolTable=None, decimals=None,
+         packed=False)
+      Serializes iteration history.
+      Returns dict of lists with whole history of a SimplexProblem.
+   toJSON (iterationTables, symbolTable=None, decimals=None, packed=False)
+      Encodes iteration history.
+      Returns compact JSON string of toColumnar.
+   toDeltas (iterationTables, symbolTable=None)
+      Delta encodes iteration history.
+      Returns dict with initial IterationTable and pivots of following
+      iterations.
+   toList (values, decimals=None, packed=False)
+      Converts array.
+      Converts array to nested lists, rounded, with None for non-finite
+      values, or to packed buffer.
+   
+   """
+   
+   def toColumnar (iterationTables, symbolTable=None, decimals=None,
+         packed=False
+      ):
+      """Serializes iteration history.
+      
+      Parameters
+      ----------
+      iterationTables: list
+         IterationTable (s) of a calculated SimplexProblem, in order.
+      symbolTable: SymbolTable, default=None
+         SymbolTable of SimplexProblem, to list variables of columns.
+      decimals: int, default=None
+         Number of decimals to round floats to, None to keep them.
+      packed: bool, default=False
+         Whether to pack float arrays (Cj, CB, b, minRatio, aj, zj,
+         deltaJ) as dict with dtype ('<f8'), shape and base64 data, where
+         non-finite values are kept as nan / inf.
+      
+      Returns
+      -------
+      NoneType
+         If there are no iteration tables.
+      dict
+         Dict with following keys, in which t indexes iterations, i rows
+         and j aj columns:
+         columns - aj labels ['a1', ...], j order of all arrays,
+         variables - xj variable of each column, None without
+            symbolTable,
+         Cj - [j],
+         iterations - iteration number [t],
+         B - basic column [t][i],
+         XB - basic variable [t][i],
+         CB, b, minRatio - [t][i],
+         aj - [t][i][j],
+         zj, deltaJ - [t][j],
+         keyColumn, keyRow, keyElement - [t], None if not selected.
+      
+      """
+      
+      if (not iterationTables):
+         return None
+      
+      tables = iterationTables
+      columns = len(tables[0].aj)
+      empty = np.full(columns, np.nan)
+      
+      return {
+         'columns': [
+            SymbolTable.label(aj) for aj in range(0, columns)
+         ],
+         'variables': (
+            list(symbolTable.names) if (symbolTable != None) else None
+         ),
+         'Cj': HistorySerializer.toList(
+            tables[0].Cj.array, decimals, packed
+         ),
+         'iterations': [table.iteration for table in tables],
+         'B': np.array([
+            [row.B for row in table.rowi] for table in tables
+         ]).tolist(),
+         'XB': [[row.XB for row in table.rowi] for table in tables],
+         'CB': HistorySerializer.toList(np.array([
+            [row.CB for row in table.rowi] for table in tables
+         ], dtype=float), decimals, packed),
+         'b': HistorySerializer.toList(np.array([
+            [row.b for row in table.rowi] for table in tables
+         ], dtype=float), decimals, packed),
+         'minRatio': HistorySerializer.toList(np.array([
+            [
+               (row.minRatio if (row.minRatio != None) else np.nan)
+               for row in table.rowi
+            ]
+            for table in tables
+         ], dtype=float), decimals, packed),
+         'aj': HistorySerializer.toList(
+            np.stack([table.coefficients for table in tables]),
+            decimals, packed,
+         ),
+         'zj': HistorySerializer.toList(np.stack([
+            (table.zj.array if (table.zj != None) else empty)
+            for table in tables
+         ]), decimals, packed),
+         'deltaJ': HistorySerializer.toList(np.stack([
+            (table.deltaJ.array if (table.deltaJ != None) else empty)
+            for table in tables
+         ]), decimals, packed),
+         'keyColumn': [table.keyColumn for table in tables],
+         'keyRow': [
+            (table.keyRow.i if (table.keyRow != None) else None)
+            for table in tables
+         ],
+         'keyElement': [
+            (
+               round(table.keyElement, decimals)
+               if ((table.keyElement != None) and (decimals != None))
+               else table.keyElement
+            )
+            for table in tables
+         ],
+      }
+   
+   def toJSON (iterationTables, symbolTable=None, decimals=None,
+         packed=False
+      ):
+      return json.dumps(
+         HistorySerializer.toColumnar(
+            iterationTables, symbolTable, decimals, packed
+         ),
+         separators=(',', ':'), allow_nan=False,
+      )
+   
+   def toDeltas (iterationTables, symbolTable=None):
+      """Delta encodes iteration history.
+      
+      Encodes initial IterationTable in full and, for each following
+      IterationTable, only the pivot which produced it. Cells of next
+      table are aij - (arj * aik) / ark for other rows and arj / ark for
+      key row r (key column k set to 0 and 1), b likewise, zj and deltaJ
+      are sums of CB * aij minus Cj, and minRatio is b / aik (inf for zero
+      aik), so that replaying them in same order reproduces iteration
+      history exactly. Values are never rounded, as rounding would drift.
+      
+      Parameters
+      ----------
+      iterationTables: list
+         IterationTable (s) of a calculated SimplexProblem, in order.
+      symbolTable: SymbolTable, default=None
+         SymbolTable of SimplexProblem, to list variables of columns.
+      
+      Returns
+      -------
+      NoneType
+         If there are no iteration tables.
+      dict
+         Dict with following keys:
+         columns, variables, Cj - as in toColumnar,
+         initial - dict with iteration, B, XB, CB, b [i] and aj [i][j] of
+            initial IterationTable,
+         pivots - list of dict with keyRow, keyColumn, keyElement,
+            entering and leaving variable of each pivot,
+         keyColumn - key column of last IterationTable, None if optimal,
+         b - b [i] of last IterationTable, which differs from replayed b
+            if rhs perturbation has been removed.
+      
+      """
+      
+      if (not iterationTables):
+         return None
+      
+      initialTable = iterationTables[0]
+      
+      return {
+         'columns': [
+            SymbolTable.label(aj) for aj in range(0, len(initialTable.aj))
+         ],
+         'variables': (
+            list(symbolTable.names) if (symbolTable != None) else None
+         ),
+         'Cj': initialTable.Cj.array.tolist(),
+         'initial': {
+            'iteration': initialTable.iteration,
+            'B': [row.B for row in initialTable.rowi],
+            'XB': [row.XB for row in initialTable.rowi],
+            'CB': [row.CB for row in initialTable.rowi],
+            'b': [row.b for row in initialTable.rowi],
+            'aj': initialTable.coefficients.tolist(),
+         },
+         'pivots': [
+            {
+               'keyRow': table.keyRow.i,
+               'keyColumn': table.keyColumn,
+               'keyElement': table.keyElement,
+               'entering': nextTable.rowi[table.keyRow.i].XB,
+               'leaving': table.keyRow.XB,
+            }
+            for table, nextTable in zip(
+               iterationTables[:-1], iterationTables[1:]
+            )
+         ],
+         'keyColumn': iterationTables[-1].keyColumn,
+         'b': [row.b for row in iterationTables[-1].rowi],
+      }
+   
+   def toList (values, decimals=None, packed=False):
+      """Converts array.
+      
+      Parameters
+      ----------
+      values: numpy.ndarray
+         Float array.
+      decimals: int, default=None
+         Number of decimals to round to, None to keep values.
+      packed: bool, default=False
+         Whether to pack values as base64 encoded buffer.
+      
+      Returns
+      -------
+      list
+         Nested lists of float, None in place of nan and inf.
+      dict
+         If packed, dict with dtype, shape and base64 data.
+      
+      """
+      
+      if (decimals != None):
+         values = np.round(values, decimals)
+      
+      if (packed == True):
+         return {
+            'dtype': '<f8',
+            'shape': list(values.shape),
+            'data': base64.b64encode(
+               np.ascontiguousarray(values, dtype='<f8').tobytes()
+            ).decode('ascii'),
+         }
+      
+      finite = np.isfinite(values)
+      
+      if (finite.all()):
+         return values.tolist()
+      
+      values = values.astype(object)
+      values[~finite] = None
+      
+      return values.tolist()
@@ -0,0 +1,186 @@
+import threading
+import time
+from collections import OrderedDict
+
+class LRUCache:
+   """Bounded least recently used cache.
+   
+   Stores at most maxSize values keyed to hashable keys, discarding least
+   recently used value when full, and counts hits and misses.
+   If ttl is set, values expire ttl seconds after being cached.
+   Safe to share between threads.
+   
+   Attributes
+   ----------
+   MISSING: object
+      Sentinel returned by get for keys which are not cached.
+   maxSize: int
+      Maximum number of cached values, 0 disables caching.
+   ttl: float, None
+      Seconds after which cached values expire, None to never expire.
+   hits: int
+      Number of get calls which found a cached value.
+   misses: int
+      Number of get calls which didn't find a cached value.
+   
+   Methods
+   -------
+   __init__ (maxSize=1024, ttl=None)
+      Initializes the cache.
+   get (key)
+      Gets cached value.
+      Returns value cached for key, marking it most recently used.
+   put (key, value)
+      Caches value.
+      Caches value for key, discarding least recently used values beyond
+      maxSize.
+   resize (maxSize)
+      Changes size limit.
+      Sets maxSize and discards least recently used values beyond it.
+   clear ()
+      Empties the cache.
+      Discards all values and resets statistics.
+   statistics ()
+      Returns statistics.
+      Returns dict with hits, misses, size, maxSize and ttl.
+   
+   """
+   
+   MISSING = object()
+   
+   def __init__ (self, maxSize=1024, ttl=None):
+      """Initializes the cache.
+      
+      Parameters
+      ----------
+      maxSize: int, default=1024
+         Maximum number of cached values, 0 disables caching.
+      ttl: float, default=None
+         Seconds after which cached values expire, None to never expire.
+      
+      """
+      
+      self.maxSize = int(maxSize) # int - 0 disables caching.
+      self.ttl = ttl # float|None - seconds.
+      self.hits = 0 # int.
+      self.misses = 0 # int.
+      self.values = OrderedDict() # {key: value,} - least recent first.
+      self.expiries = {} # {key: float,} - time.monotonic of expiry.
+      self.lock = threading.Lock()
+   
+   def get (self, key):
+      """Gets cached value.
+      
+      Returns value cached for key, marking it most recently used.
+      Expired value is discarded and counted as miss.
+      
+      Parameters
+      ----------
+      key
+         Hashable key.
+      
+      Returns
+      -------
+      object
+         Cached value, or MISSING if key is not cached.
+      
+      """
+      
+      with self.lock:
+         value = self.values.get(key, LRUCache.MISSING)
+         
+         if (
+               (value is not LRUCache.MISSING)
+               and (key in self.expiries)
+               and (self.expiries[key] <= time.monotonic())
+            ):
+            del self.values[key]
+            del self.expiries[key]
+            value = LRUCache.MISSING
+         
+         if (value is LRUCache.MISSING):
+            self.misses += 1
+         else:
+            self.hits += 1
+            self.values.move_to_end(key)
+         
+         return value
+   
+   def put (self, key, value):
+      """Caches value.
+      
+      Caches value for key, discarding least recently used values beyond
+      maxSize.
+      
+      Parameters
+      ----------
+      key
+         Hashable key.
+      value
+         Value to cache, should not be mutated afterwards.
+      
+      """
+      
+      with self.lock:
+         if (self.maxSize < 1):
+            return None
+         
+         self.values[key] = value
+         self.values.move_to_end(key)
+         
+         if (self.ttl != None):
+            self.expiries[key] = time.monotonic() + self.ttl
+         
+         while (len(self.values) > self.maxSize):
+            self.expiries.pop(self.values.popitem(last=False)[0], None)
+   
+   def resize (self, maxSize):
+      """Changes size limit.
+      
+      Sets maxSize and discards least recently used values beyond it.
+      
+      Parameters
+      ----------
+      maxSize: int
+         Maximum number of cached values, 0 disables caching.
+      
+      """
+      
+      with self.lock:
+         self.maxSize = int(maxSize)
+         
+         while (len(self.values) > max(self.maxSize, 0)):
+            self.expiries.pop(self.values.popitem(last=False)[0], None)
+   
+   def clear (self):
+      """Empties the cache.
+      
+      Discards all values and resets hits and misses.
+      
+      """
+      
+      with self.lock:
+         self.values.clear()
+         self.expiries.clear()
+         self.hits = 0
+         self.misses = 0
+   
+   def statistics (self):
+      """Returns statistics.
+      
+      Returns
+      -------
+      dict
+         Dict with hits, misses, size (number of cached values, including
+         expired ones not yet discarded), maxSize and ttl.
+      
+      """
+      
+      with self.lock:
+         return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'size': len(self.values),
+            'maxSize': self.maxSize,
+            'ttl': self.ttl,
+         }
@@ -0,0 +1,527 @@
+import os
+import tempfile
+
+import numpy as np
+
+from .dataStructures import Row, OptimalSolution, SymbolTable, SimplexProblem
+from .pivotRules import PivotRules
+
+class MemmapTableau:
+   """Out-of-core simplex engine (SimplexProblem.Engine.MEMMAP).
+   
+   Stores dense tableau (rows x aj columns) in a numpy.memmap backed file
+   and maps only blockSize rows at a time, so that resident memory is
+   bounded by blockSize * columns floats plus O(rows + columns) vectors
+   (b, basis, deltaJ, key column) kept in memory.
+   Each iteration is a single pass over blocks: rows are eliminated with
+   key row, and key column of next iteration (selected from deltaJ,
+   updated with key row beforehand) is gathered from updated rows.
+   Before terminating as optimal or unbounded, deltaJ is recalculated
+   from tableau, so that its accumulated roundoff can't end iterations.
+   Key column and row follow same rules as PivotRules (including Bland's
+   rule and ratioTest), while rhs perturbation is not applied and no
+   IterationTable is kept.
+   
+   Methods
+   -------
+   calculateOptimalSolution (simplexProblem)
+      Calculates optimal solution.
+      Runs simplex iterations over memory mapped tableau of a
+      SimplexProblem with framed auxillary components.
+   internVariables (simplexProblem)
+      Interns variables.
+      Creates SymbolTable in same order as frameInitialSimplexTable.
+   mapBlock (path, shape, start, stop, mode)
+      Maps block of rows.
+      Returns numpy.memmap of rows start to stop of tableau.
+   writeInitialTable (simplexProblem, path, shape, Cj, basis)
+      Writes initial tableau.
+      Writes auxillary constraints block by block and returns zj.
+   readColumn (simplexProblem, path, shape, keyColumn)
+      Reads key column.
+      Returns aik of key column of tableau.
+   reducedCosts (simplexProblem, path, shape, Cj, basis)
+      Calculates deltaJ.
+      Returns deltaJ of current tableau, calculated block by block.
+   keyColumn (simplexProblem, deltaJ)
+      Selects key column.
+      Selects key column from deltaJ like PivotRules.keyColumn.
+   keyRow (simplexProblem, path, shape, column, b, basis, initialBasis)
+      Selects key row.
+      Selects key row from key column and b like PivotRules.keyRow.
+   
+   """
+   
+   def calculateOptimalSolution (simplexProblem):
+      """Calculates optimal solution.
+      
+      Runs simplex iterations over memory mapped tableau of a
+      SimplexProblem with framed auxillary components, sets terminated,
+      terminationReason and, if optimal solution is reached,
+      optimalSolution (without iterationTable).
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem with framed auxillary components.
+      
+      """
+      
+      symbolTable = MemmapTableau.internVariables(simplexProblem)
+      shape = (len(simplexProblem.auxillaryConstraints), len(symbolTable))
+      blockSize = max(1, int(simplexProblem.blockSize))
+      
+      Cj = np.zeros(shape[1])
+      
+      for coefficient, variable in simplexProblem.auxillaryObjectiveFunction:
+         Cj[symbolTable.columns[str(variable)]] = coefficient
+      
+      basis = np.array([
+         symbolTable.columns[
+            constraint.slackVariable
+            if (constraint.slackVariable != None)
+            else constraint.lhs[-1][1]
+         ]
+         for constraint in simplexProblem.auxillaryConstraints
+      ], dtype=np.int64)
+      initialBasis = basis.copy()
+      b = np.array([
+         float(constraint.rhs)
+         for constraint in simplexProblem.auxillaryConstraints
+      ])
+      
+      path = simplexProblem.tableauPath
+      
+      if (path == None):
+         descriptor, path = tempfile.mkstemp(suffix='.tableau')
+         os.close(descriptor)
+      
+      try:
+         deltaJ = (
+            MemmapTableau.writeInitialTable(
+               simplexProblem, path, shape, Cj, basis
+            )
+            - Cj
+         )
+         keyColumn = MemmapTableau.keyColumn(simplexProblem, deltaJ)
+         column = MemmapTableau.readColumn(
+            simplexProblem, path, shape, keyColumn
+         )
+         refreshed = True # bool - deltaJ calculated from tableau since pivot?
+         
+         while True:
+            keyRow = (
+               MemmapTableau.keyRow(
+                  simplexProblem, path, shape, column, b, basis, initialBasis
+               )
+               if (keyColumn != None) else None
+            )
+            
+            if (keyRow == None):
+               if (refreshed == False):
+                  # deltaJ updated with key rows accumulates roundoff,
+                  # which mustn't decide optimality or unboundedness.
+                  deltaJ = MemmapTableau.reducedCosts(
+                     simplexProblem, path, shape, Cj, basis
+                  )
+                  keyColumn = MemmapTableau.keyColumn(simplexProblem, deltaJ)
+                  column = MemmapTableau.readColumn(
+                     simplexProblem, path, shape, keyColumn
+                  )
+                  refreshed = True
+                  continue
+               
+               simplexProblem.terminationReason = (
+                  SimplexProblem.Terminate.REACHED_OPTIMAL
+                  if (keyColumn == None)
+                  else SimplexProblem.Terminate.UNBOUNDED_SOLUTION
+               )
+               break
+            
+            refreshed = False
+            
+            PivotRules.recordPivot(simplexProblem, keyRow)
+            
+            keyElement = column[keyRow.i]
+            block = MemmapTableau.mapBlock(
+               path, shape, keyRow.i, (keyRow.i + 1), 'r'
+            )
+            pivotRow = np.array(block[0]) / keyElement
+            del block
+            pivotRow[keyColumn] = float(1)
+            keyB = b[keyRow.i] / keyElement
+            
+            b -= column * keyB
+            b[keyRow.i] = keyB
+            deltaJ -= deltaJ[keyColumn] * pivotRow
+            deltaJ[keyColumn] = float(0)
+            basis[keyRow.i] = keyColumn
+            
+            nextKeyColumn = MemmapTableau.keyColumn(simplexProblem, deltaJ)
+            nextColumn = np.empty(shape[0])
+            
+            for start in range(0, shape[0], blockSize):
+               stop = min(shape[0], (start + blockSize))
+               block = MemmapTableau.mapBlock(path, shape, start, stop, 'r+')
+               block -= np.outer(column[start:stop], pivotRow)
+               block[:, keyColumn] = float(0)
+               
+               if ((start <= keyRow.i) and (keyRow.i < stop)):
+                  block[keyRow.i - start] = pivotRow
+               
+               if (nextKeyColumn != None):
+                  nextColumn[start:stop] = block[:, nextKeyColumn]
+               
+               del block
+            
+            keyColumn = nextKeyColumn
+            column = nextColumn
+      finally:
+         if (simplexProblem.tableauPath == None):
+            os.remove(path)
+      
+      simplexProblem.terminated = True
+      
+      if (
+            simplexProblem.terminationReason
+            != SimplexProblem.Terminate.REACHED_OPTIMAL
+         ):
+         return None
+      
+      optimalSolution = OptimalSolution()
+      optimalSolution.Xj = dict([
+         (symbolTable.name(int(aj)), float(bi),)
+         for aj, bi in zip(basis, b)
+      ])
+      
+      optimalValue = sum([
+         (
+            term[0]
+            * optimalSolution.Xj.get(term[1], float(0))
+         )
+         for term in simplexProblem.auxillaryObjectiveFunction
+      ])
+      
+      optimalSolution.optimalValue = (
+         optimalValue
+         if (simplexProblem.problemType == 'max')
+         else
+         (float(0) - optimalValue)
+      )
+      
+      simplexProblem.optimalSolution = optimalSolution
+   
+   def internVariables (simplexProblem):
+      """Interns variables.
+      
+      Creates SymbolTable of objective function, auxillary constraints and
+      auxillary objective function variables, in same order as
+      SimplexAlgorithm.frameInitialSimplexTable.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem with framed auxillary components.
+      
+      Returns
+      -------
+      SymbolTable
+         Created symbol table, also set as simplexProblem's symbolTable.
+      
+      """
+      
+      symbolTable = SymbolTable()
+      
+      for term in simplexProblem.objectiveFunction:
+         symbolTable.intern(str(term[1]))
+      
+      for constraint in simplexProblem.auxillaryConstraints:
+         for term in constraint.lhs:
+            symbolTable.intern(str(term[1]))
+      
+      for term in simplexProblem.auxillaryObjectiveFunction:
+         symbolTable.intern(str(term[1]))
+      
+      simplexProblem.symbolTable = symbolTable
+      simplexProblem.netVariables = tuple(symbolTable.names)
+      
+      return symbolTable
+   
+   def mapBlock (path, shape, start, stop, mode):
+      """Maps block of rows.
+      
+      Parameters
+      ----------
+      path: str
+         File backing tableau.
+      shape: tuple
+         Shape (rows, columns) of tableau.
+      start: int
+         First row of block.
+      stop: int
+         Row after last row of block.
+      mode: str
+         numpy.memmap mode.
+      
+      Returns
+      -------
+      numpy.memmap
+         Rows start to stop of tableau, unmapped once deleted.
+      
+      """
+      
+      return np.memmap(
+         path, dtype=np.float64, mode=mode,
+         offset=(start * shape[1] * 8), shape=((stop - start), shape[1]),
+      )
+   
+   def writeInitialTable (simplexProblem, path, shape, Cj, basis):
+      """Writes initial tableau.
+      
+      Creates tableau file and writes auxillary constraints block by
+      block, accumulating zj = CB . aj of each block.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem with framed auxillary components and symbolTable.
+      path: str
+         File backing tableau.
+      shape: tuple
+         Shape (rows, columns) of tableau.
+      Cj: numpy.ndarray
+         cj of each aj column.
+      basis: numpy.ndarray
+         Basic aj column of each row.
+      
+      Returns
+      -------
+      numpy.ndarray
+         zj of each aj column.
+      
+      """
+      
+      columns = simplexProblem.symbolTable.columns
+      blockSize = max(1, int(simplexProblem.blockSize))
+      zj = np.zeros(shape[1])
+      
+      with open(path, 'wb') as file:
+         file.truncate(shape[0] * shape[1] * 8)
+      
+      for start in range(0, shape[0], blockSize):
+         stop = min(shape[0], (start + blockSize))
+         block = MemmapTableau.mapBlock(path, shape, start, stop, 'r+')
+         
+         for i in range(start, stop):
+            for coefficient, variable in (
+                  simplexProblem.auxillaryConstraints[i].lhs
+               ):
+               block[(i - start), columns[str(variable)]] = coefficient
+         
+         zj += Cj[basis[start:stop]] @ block
+         del block
+      
+      return zj
+   
+   def readColumn (simplexProblem, path, shape, keyColumn):
+      """Reads key column.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem being calculated.
+      path: str
+         File backing tableau.
+      shape: tuple
+         Shape (rows, columns) of tableau.
+      keyColumn: int, None
+         aj column selected as key column.
+      
+      Returns
+      -------
+      numpy.ndarray
+         aik of key column for each row, read block by block (left
+         uninitialized if keyColumn is None).
+      
+      """
+      
+      blockSize = max(1, int(simplexProblem.blockSize))
+      column = np.empty(shape[0])
+      
+      if (keyColumn != None):
+         for start in range(0, shape[0], blockSize):
+            stop = min(shape[0], (start + blockSize))
+            block = MemmapTableau.mapBlock(path, shape, start, stop, 'r')
+            column[start:stop] = block[:, keyColumn]
+            del block
+      
+      return column
+   
+   def reducedCosts (simplexProblem, path, shape, Cj, basis):
+      """Calculates deltaJ.
+      
+      Calculates deltaJ = CB . aj - cj from current tableau block by
+      block, discarding roundoff accumulated by updating deltaJ with key
+      rows.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem being calculated.
+      path: str
+         File backing tableau.
+      shape: tuple
+         Shape (rows, columns) of tableau.
+      Cj: numpy.ndarray
+         cj of each aj column.
+      basis: numpy.ndarray
+         Basic aj column of each row.
+      
+      Returns
+      -------
+      numpy.ndarray
+         deltaJ of each aj column (zero for basic aj).
+      
+      """
+      
+      blockSize = max(1, int(simplexProblem.blockSize))
+      zj = np.zeros(shape[1])
+      
+      for start in range(0, shape[0], blockSize):
+         stop = min(shape[0], (start + blockSize))
+         block = MemmapTableau.mapBlock(path, shape, start, stop, 'r')
+         zj += Cj[basis[start:stop]] @ block
+         del block
+      
+      deltaJ = zj - Cj
+      deltaJ[basis] = float(0)
+      
+      return deltaJ
+   
+   def keyColumn (simplexProblem, deltaJ):
+      """Selects key column.
+      
+      Selects aj with most negative deltaJ, or first aj with negative
+      deltaJ if Bland's rule is active, as PivotRules.keyColumn.
+      deltaJ within pivotTolerance of zero is taken as zero, since
+      incrementally updated deltaJ carries roundoff.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem being calculated.
+      deltaJ: numpy.ndarray
+         deltaJ of each aj column.
+      
+      Returns
+      -------
+      NoneType
+         If no deltaJ is below -pivotTolerance, i.e., solution is optimal.
+      int
+         aj column selected as key column.
+      
+      """
+      
+      tolerance = simplexProblem.pivotTolerance
+      
+      if (simplexProblem.blandRule == True):
+         negative = np.flatnonzero(deltaJ < (0 - tolerance))
+         
+         return int(negative[0]) if (len(negative) > 0) else None
+      
+      keyColumn = int(np.argmin(deltaJ))
+      
+      return keyColumn if (deltaJ[keyColumn] < (0 - tolerance)) else None
+   
+   def keyRow (simplexProblem, path, shape, column, b, basis, initialBasis):
+      """Selects key row.
+      
+      Calculates minimum ratios b / aik and selects key row among
+      candidate rows as PivotRules.keyRow, reading tied rows from tableau
+      for LEXICOGRAPHIC ratio test.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem being calculated.
+      path: str
+         File backing tableau.
+      shape: tuple
+         Shape (rows, columns) of tableau.
+      column: numpy.ndarray
+         aik of key column for each row.
+      b: numpy.ndarray
+         b of each row.
+      basis: numpy.ndarray
+         Basic aj column of each row.
+      initialBasis: numpy.ndarray
+         Basic aj column of each row of initial tableau.
+      
+      Returns
+      -------
+      NoneType
+         If no row qualifies, i.e., solution is unbounded.
+      Row
+         Row with i and minRatio of selected key row.
+      
+      """
+      
+      tolerance = simplexProblem.pivotTolerance
+      harris = (
+         (simplexProblem.blandRule == False)
+         and (simplexProblem.ratioTest == SimplexProblem.RatioTest.HARRIS)
+      )
+      bTolerance = (
+         (simplexProblem.feasibilityTolerance + tolerance)
+         if (harris)
+         else tolerance
+      )
+      
+      with np.errstate(divide='ignore', invalid='ignore'):
+         ratios = np.where((column != 0), (b / column), np.inf)
+      
+      candidates = np.flatnonzero(
+         np.isfinite(ratios)
+         & (column > tolerance)
+         & (b >= (0 - bTolerance))
+      )
+      
+      if (len(candidates) < 1):
+         return None
+      
+      if (harris):
+         clamped = np.maximum(ratios[candidates], 0)
+         relaxedRatio = np.min(
+            clamped
+            + (simplexProblem.feasibilityTolerance
+               / np.abs(column[candidates])
+            )
+         )
+         eligible = candidates[clamped <= relaxedRatio]
+         i = eligible[np.argmax(np.abs(column[eligible]))]
+      elif (
+            (simplexProblem.blandRule == False)
+            and (simplexProblem.ratioTest == SimplexProblem.RatioTest.STANDARD)
+         ):
+         i = candidates[np.argmin(ratios[candidates])]
+      else:
+         ties = candidates[
+            ratios[candidates] <= (np.min(ratios[candidates]) + tolerance)
+         ]
+         
+         if (simplexProblem.blandRule == True):
+            i = ties[np.argmin(basis[ties])]
+         else:
+            i = min(ties, key=lambda tie: tuple((
+               MemmapTableau.mapBlock(path, shape, tie, (tie + 1), 'r')[0][
+                  initialBasis
+               ]
+               / column[tie]
+            ).tolist()))
+      
+      keyRow = Row()
+      keyRow.i = int(i)
+      keyRow.b = float(b[i])
+      keyRow.minRatio = float(ratios[i])
+      
+      return keyRow
@@ -0,0 +1,726 @@
+from array import array
+
+import numpy as np
+
+from .dataStructures import SimplexProblem
+from .preprocessor import PreProcessor
+from .algorithm import SimplexAlgorithm
+
+NUMBER = (int, float, np.integer, np.floating,)
+
+class Var:
+   """Var data structure.
+   
+   Decision variable of a Model, usable in arithmetic with numbers, Var
+   and LinExpr to build LinExpr, and in comparisons to build
+   LinConstraint.
+   
+   Attributes
+   ----------
+   model: Model
+      Model the variable belongs to.
+   index: int
+      Column of variable in model.
+   name: str
+      Name of variable.
+   
+   Methods
+   -------
+   __init__ (model, index, name)
+      Initializes the data structure.
+   toExpression ()
+      Returns variable as LinExpr.
+   """
+   
+   __array_ufunc__ = None # numpy defers to reflected operators.
+   
+   def __init__ (self, model, index, name):
+      """Initializes the data structure.
+      """
+      
+      self.model = model # Model.
+      self.index = index # int - column.
+      self.name = name # str.
+   
+   def toExpression (self):
+      return LinExpr({self.index: float(1)})
+   
+   def __hash__ (self):
+      return id(self)
+   
+   def __repr__ (self):
+      return self.name
+   
+   def __add__ (self, other):
+      return self.toExpression() + other
+   
+   def __radd__ (self, other):
+      return self.toExpression() + other
+   
+   def __sub__ (self, other):
+      return self.toExpression() - other
+   
+   def __rsub__ (self, other):
+      return other - self.toExpression()
+   
+   def __mul__ (self, other):
+      if (not isinstance(other, NUMBER)):
+         return NotImplemented
+      
+      return LinExpr({self.index: float(other)})
+   
+   def __rmul__ (self, other):
+      return self.__mul__(other)
+   
+   def __truediv__ (self, other):
+      return self.toExpression() / other
+   
+   def __neg__ (self):
+      return self.toExpression() * float(-1)
+   
+   def __le__ (self, other):
+      return self.toExpression() <= other
+   
+   def __ge__ (self, other):
+      return self.toExpression() >= other
+   
+   def __eq__ (self, other):
+      return self.toExpression() == other
+
+class VarArray:
+   """VarArray data structure.
+   
+   Contiguous block of variables of a Model, supporting vectorized
+   c @ x (LinExpr), A @ x (MatrixExpr) and sum().
+   A @ x works for numpy arrays only, as scipy sparse matrices don't
+   defer to __rmatmul__; use x.dot(A) or Model.addRows for them.
+   
+   Attributes
+   ----------
+   model: Model
+      Model the variables belong to.
+   start: int
+      Column of first variable.
+   size: int
+      Number of variables.
+   
+   Methods
+   -------
+   __init__ (model, start, size)
+      Initializes the data structure.
+   sum ()
+      Returns sum of all variables as LinExpr.
+   dot (coefficients)
+      Returns coefficients @ variables as LinExpr (1-D) or MatrixExpr
+      (2-D or sparse matrix).
+   """
+   
+   __array_ufunc__ = None # numpy defers to reflected operators.
+   
+   def __init__ (self, model, start, size):
+      """Initializes the data structure.
+      """
+      
+      self.model = model # Model.
+      self.start = start # int - first column.
+      self.size = size # int.
+   
+   def __len__ (self):
+      return self.size
+   
+   def __iter__ (self):
+      return iter(self.model.vars[self.start:(self.start + self.size)])
+   
+   def __getitem__ (self, key):
+      if (type(key).__name__ == 'slice'):
+         start, stop, step = key.indices(self.size)
+         
+         if (step == 1):
+            return VarArray(
+               self.model, (self.start + start), max(0, (stop - start))
+            )
+         
+         return [self[i] for i in range(start, stop, step)]
+      
+      if ((key < (0 - self.size)) or (key >= self.size)):
+         raise IndexError('VarArray index out of range')
+      
+      return self.model.vars[self.start + (key % self.size)]
+   
+   def sum (self):
+      return LinExpr(dict.fromkeys(
+         range(self.start, (self.start + self.size)), float(1)
+      ))
+   
+   def dot (self, coefficients):
+      if (hasattr(coefficients, 'tocsr') or (np.ndim(coefficients) == 2)):
+         return MatrixExpr(coefficients, self)
+      
+      coefficients = np.asarray(coefficients, dtype=float).reshape(-1)
+      
+      if (len(coefficients) != self.size):
+         raise ValueError(
+            'Shape mismatch: {0} coefficients for {1} variables'.format(
+               len(coefficients), self.size
+            )
+         )
+      
+      columns = np.flatnonzero(coefficients)
+      
+      return LinExpr(dict(zip(
+         (columns + self.start).tolist(),
+         coefficients[columns].tolist(),
+      )))
+   
+   def __rmatmul__ (self, coefficients):
+      return self.dot(coefficients)
+
+class LinExpr:
+   """LinExpr data structure.
+   
+   Linear expression, with coefficients accumulated sparsely (keyed to
+   variable columns) and a constant.
+   
+   Attributes
+   ----------
+   terms: dict
+      Dict with variable column as key and coefficient as value.
+   constant: float
+      Constant of expression.
+   
+   Methods
+   -------
+   __init__ (terms=None, constant=0)
+      Initializes the data structure.
+   sum (items)
+      Sums numbers, Var and LinExpr in a single accumulating pass, called
+      on class (builtin sum copies partial sums).
+   add (other, multiplier=1)
+      Adds multiplier * other to expression, in place.
+   copy ()
+      Returns copy of expression.
+   """
+   
+   __array_ufunc__ = None # numpy defers to reflected operators.
+   
+   def __init__ (self, terms=None, constant=0):
+      """Initializes the data structure.
+      """
+      
+      self.terms = terms if (terms != None) else {} # {column: coefficient,}
+      self.constant = float(constant) # float.
+   
+   def sum (items):
+      expression = LinExpr()
+      
+      for item in items:
+         expression.add(item)
+      
+      return expression
+   
+   def add (self, other, multiplier=float(1)):
+      if (isinstance(other, NUMBER)):
+         self.constant += multiplier * other
+      elif (isinstance(other, Var)):
+         self.terms[other.index] = (
+            self.terms.get(other.index, float(0)) + multiplier
+         )
+      elif (isinstance(other, LinExpr)):
+         for column, coefficient in other.terms.items():
+            self.terms[column] = (
+               self.terms.get(column, float(0)) + (multiplier * coefficient)
+            )
+         
+         self.constant += multiplier * other.constant
+      elif (isinstance(other, VarArray)):
+         self.add(other.sum(), multiplier)
+      else:
+         raise TypeError(
+            'Unsupported operand for LinExpr: {0}'.format(type(other))
+         )
+      
+      return self
+   
+   def copy (self):
+      return LinExpr(self.terms.copy(), self.constant)
+   
+   def __repr__ (self):
+      return 'LinExpr({0}, {1})'.format(self.terms, self.constant)
+   
+   def __add__ (self, other):
+      return self.copy().add(other)
+   
+   def __radd__ (self, other):
+      return self.copy().add(other)
+   
+   def __iadd__ (self, other):
+      return self.add(other)
+   
+   def __sub__ (self, other):
+      return self.copy().add(other, float(-1))
+   
+   def __rsub__ (self, other):
+      return (self * float(-1)).add(other)
+   
+   def __isub__ (self, other):
+      return self.add(other, float(-1))
+   
+   def __mul__ (self, other):
+      if (not isinstance(other, NUMBER)):
+         return NotImplemented
+      
+      return LinExpr(
+         dict([
+            (column, (coefficient * other))
+            for column, coefficient in self.terms.items()
+         ]),
+         (self.constant * other),
+      )
+   
+   def __rmul__ (self, other):
+      return self.__mul__(other)
+   
+   def __truediv__ (self, other):
+      return self.__mul__(float(1) / other)
+   
+   def __neg__ (self):
+      return self * float(-1)
+   
+   def __le__ (self, other):
+      return LinConstraint(self - other, '<=')
+   
+   def __ge__ (self, other):
+      return LinConstraint(self - other, '>=')
+   
+   def __eq__ (self, other):
+      return LinConstraint(self - other, '=')
+   
+   __hash__ = None
+
+class MatrixExpr:
+   """MatrixExpr data structure.
+   
+   Vectorized expression A @ x (or x.dot(A) for scipy sparse matrices),
+   over a VarArray x, comparable with a vector (or number) to build a
+   LinConstraint for all rows at once.
+   
+   Attributes
+   ----------
+   A: numpy.ndarray, sparse matrix
+      2-D coefficient matrix.
+   variables: VarArray
+      Variables multiplied by A.
+   
+   Methods
+   -------
+   __init__ (A, variables)
+      Initializes the data structure.
+   """
+   
+   __array_ufunc__ = None # numpy defers to reflected operators.
+   
+   def __init__ (self, A, variables):
+      """Initializes the data structure.
+      """
+      
+      if (not hasattr(A, 'tocsr')):
+         A = np.asarray(A, dtype=float)
+      
+      if (A.shape[1] != len(variables)):
+         raise ValueError(
+            'Shape mismatch: {0} columns for {1} variables'.format(
+               A.shape[1], len(variables)
+            )
+         )
+      
+      self.A = A # 2-D matrix.
+      self.variables = variables # VarArray.
+   
+   def __le__ (self, other):
+      return LinConstraint(self, '<=', other)
+   
+   def __ge__ (self, other):
+      return LinConstraint(self, '>=', other)
+   
+   def __eq__ (self, other):
+      return LinConstraint(self, '=', other)
+   
+   __hash__ = None
+
+class LinConstraint:
+   """LinConstraint data structure.
+   
+   Constraint built by comparing LinExpr (expression (equalityType) 0)
+   or MatrixExpr (A @ x (equalityType) rhs, one row per row of A).
+   
+   Attributes
+   ----------
+   expression: LinExpr, MatrixExpr
+      Left hand side.
+   equalityType: str
+      String containing equality type like '<=', '>=', '='.
+   rhs: float, numpy.ndarray
+      Right hand side, 0 for LinExpr (constant is held by expression).
+   
+   Methods
+   -------
+   __init__ (expression, equalityType, rhs=0)
+      Initializes the data structure.
+   """
+   
+   def __init__ (self, expression, equalityType, rhs=0):
+      """Initializes the data structure.
+      """
+      
+      self.expression = expression # LinExpr|MatrixExpr.
+      self.equalityType = equalityType # str - <=/>=/=.
+      self.rhs = rhs # float|[float,].
+
+class Model:
+   """Modeling layer building SimplexProblem.
+   
+   Builds linear program with Var, VarArray and LinExpr arithmetic,
+   keeping constraints in sparse row buffers (data, indices, indptr as in
+   CSR format) instead of strings, and frames them as SimplexProblem.
+   
+   Attributes
+   ----------
+   vars: list
+      List of all Var, indexed by column.
+   names: dict
+      Dict with name as key and Var as value.
+   problemType: str
+      Type of problem - minimization ('min') or maximization ('max').
+   objective: LinExpr
+      Objective function.
+   data: array
+      Coefficients of all constraint rows.
+   indices: array
+      Variable columns of data.
+   indptr: array
+      Start of each row in data/indices, followed by len(data).
+   equalityTypes: list
+      Equality type of each row.
+   rhs: array
+      Right hand side of each row.
+   simplexProblem: SimplexProblem
+      Last solved SimplexProblem, None if not solved.
+   
+   Methods
+   -------
+   __init__ ()
+      Initializes the model.
+   addVar (name=None)
+      Adds single variable.
+   addVars (count, prefix='x')
+      Adds VarArray of count variables.
+   add (constraint)
+      Adds LinConstraint rows to sparse buffers.
+   addRows (A, variables, equalityType, rhs)
+      Adds rows A @ variables (equalityType) rhs to sparse buffers.
+   maximize (expression), minimize (expression)
+      Sets objective function.
+   matrix ()
+      Returns constraint matrix in CSR format.
+   toSimplexProblem ()
+      Frames SimplexProblem.
+   solve ()
+      Frames and solves SimplexProblem.
+   value (item)
+      Returns value of Var, VarArray or LinExpr in last solution.
+   
+   """
+   
+   def __init__ (self):
+      """Initializes the model.
+      """
+      
+      self.vars = [] # [Var,] - indexed by column.
+      self.names = {} # {'name': Var,}
+      self.problemType = 'min' # min / max
+      self.objective = LinExpr() # LinExpr.
+      self.data = array('d') # [aij,]
+      self.indices = array('q') # [j,]
+      self.indptr = array('q', [0]) # [row start,] + [len(data)]
+      self.equalityTypes = [] # ['<=',]
+      self.rhs = array('d') # [bi,]
+      self.simplexProblem = None # SimplexProblem.
+   
+   def addVar (self, name=None):
+      """Adds single variable.
+      
+      Parameters
+      ----------
+      name: str, default=None
+         Unique name, defaults to 'x' followed by column + 1.
+      
+      Raises
+      ------
+      ValueError
+         If name is already used.
+      
+      Returns
+      -------
+      Var
+         Added variable.
+      
+      """
+      
+      if (name == None):
+         name = 'x' + str(len(self.vars) + 1)
+      
+      if (name in self.names):
+         raise ValueError('Variable {0} already exists'.format(name))
+      
+      var = Var(self, len(self.vars), str(name))
+      self.vars.append(var)
+      self.names[var.name] = var
+      
+      return var
+   
+   def addVars (self, count, prefix='x'):
+      """Adds VarArray of count variables.
+      
+      Parameters
+      ----------
+      count: int
+         Number of variables.
+      prefix: str, default='x'
+         Variables are named prefix followed by column + 1.
+      
+      Returns
+      -------
+      VarArray
+         Added variables.
+      
+      """
+      
+      start = len(self.vars)
+      
+      for i in range(start, (start + count)):
+         self.addVar(prefix + str(i + 1))
+      
+      return VarArray(self, start, count)
+   
+   def add (self, constraint):
+      """Adds LinConstraint rows to sparse buffers.
+      
+      Parameters
+      ----------
+      constraint: LinConstraint
+         Constraint, single row for LinExpr, one row per row of A for
+         MatrixExpr.
+      
+      Raises
+      ------
+      TypeError
+         If constraint is not LinConstraint (like a plain bool).
+      
+      Returns
+      -------
+      int
+         Number of rows added.
+      
+      """
+      
+      if (not isinstance(constraint, LinConstraint)):
+         raise TypeError(
+            'Required LinConstraint, supplied {0}'.format(type(constraint))
+         )
+      
+      expression = constraint.expression
+      
+      if (isinstance(expression, LinExpr)):
+         self.indices.extend(expression.terms.keys())
+         self.data.extend(expression.terms.values())
+         self.indptr.append(len(self.data))
+         self.equalityTypes.append(constraint.equalityType)
+         self.rhs.append(float(constraint.rhs) - expression.constant)
+         
+         return 1
+      
+      A = expression.A
+      rows = A.shape[0]
+      
+      if (hasattr(A, 'tocsr')):
+         A = A.tocsr()
+         A.sum_duplicates() # repeated (i, j) entries add up, as in scipy.
+         indices, data, indptr = A.indices, A.data, A.indptr
+      else:
+         nonZeroRows, indices = np.nonzero(A)
+         data = A[nonZeroRows, indices]
+         indptr = np.concatenate(([0], np.cumsum(
+            np.bincount(nonZeroRows, minlength=rows)
+         )))
+      
+      self.indices.frombytes(np.asarray(
+         (indices + expression.variables.start), dtype='q'
+      ).tobytes())
+      self.data.frombytes(np.asarray(data, dtype='d').tobytes())
+      self.indptr.frombytes(np.asarray(
+         (indptr[1:] + self.indptr[-1]), dtype='q'
+      ).tobytes())
+      self.equalityTypes.extend([constraint.equalityType] * rows)
+      self.rhs.frombytes(np.asarray(
+         np.broadcast_to(np.asarray(constraint.rhs, dtype='d'), (rows,)),
+         dtype='d',
+      ).tobytes())
+      
+      return rows
+   
+   def addRows (self, A, variables, equalityType, rhs):
+      """Adds rows A @ variables (equalityType) rhs to sparse buffers.
+      
+      Explicit form of add(A @ variables <= rhs), which also takes scipy
+      sparse matrices (copied from their CSR data, indices and indptr).
+      
+      Parameters
+      ----------
+      A: array_like, sparse matrix
+         2-D coefficient matrix.
+      variables: VarArray
+         Variables multiplied by A.
+      equalityType: str
+         String containing equality type like '<=', '>=', '='.
+      rhs: float, array_like
+         Right hand side, of each row or of all rows.
+      
+      Raises
+      ------
+      ValueError
+         If A's columns don't match variables.
+      
+      Returns
+      -------
+      int
+         Number of rows added.
+      
+      """
+      
+      return self.add(LinConstraint(
+         MatrixExpr(A, variables), equalityType, rhs
+      ))
+   
+   def maximize (self, expression):
+      self.problemType = 'max'
+      self.objective = LinExpr().add(expression)
+   
+   def minimize (self, expression):
+      self.problemType = 'min'
+      self.objective = LinExpr().add(expression)
+   
+   def matrix (self):
+      """Returns constraint matrix in CSR format.
+      
+      Returns
+      -------
+      tuple
+         ((data, indices, indptr), shape) as numpy arrays, as accepted by
+         scipy.sparse.csr_matrix.
+      
+      """
+      
+      return (
+         (
+            np.frombuffer(self.data, dtype='d'),
+            np.frombuffer(self.indices, dtype='q'),
+            np.frombuffer(self.indptr, dtype='q'),
+         ),
+         ((len(self.indptr) - 1), len(self.vars)),
+      )
+   
+   def toSimplexProblem (self):
+      """Frames SimplexProblem.
+      
+      Frames objective function (without its constant) and each buffered
+      row as Constraint, through PreProcessor.attachConstraint.
+      
+      Returns
+      -------
+      SimplexProblem
+         Framed simplex problem.
+      
+      """
+      
+      simplexProblem = SimplexProblem()
+      simplexProblem.problemType = self.problemType
+      simplexProblem.objectiveFunction = [
+         (float(coefficient), self.vars[column].name,)
+         for column, coefficient in self.objective.terms.items()
+         if (coefficient != 0)
+      ]
+      simplexProblem.constraints = []
+      
+      names = [var.name for var in self.vars]
+      terms = list(zip(self.data.tolist(), [
+         names[column] for column in self.indices.tolist()
+      ]))
+      indptr = self.indptr.tolist()
+      
+      for row in range(0, (len(indptr) - 1)):
+         PreProcessor.attachConstraint(
+            simplexProblem,
+            terms[indptr[row]:indptr[row + 1]],
+            self.equalityTypes[row],
+            self.rhs[row],
+         )
+      
+      return simplexProblem
+   
+   def solve (self):
+      """Frames and solves SimplexProblem.
+      
+      Raises
+      ------
+      FrameError
+         Raises when there is an error in framing process.
+      CalculationError
+         Raises when there is an error in calculation process.
+      
+      Returns
+      -------
+      SimplexProblem
+         Calculated simplex problem, also kept as simplexProblem.
+      
+      """
+      
+      self.simplexProblem = self.toSimplexProblem()
+      SimplexAlgorithm.calculateOptimalSolution(self.simplexProblem)
+      
+      return self.simplexProblem
+   
+   def value (self, item):
+      """Returns value of Var, VarArray or LinExpr in last solution.
+      
+      Parameters
+      ----------
+      item: Var, VarArray, LinExpr
+         Item to evaluate.
+      
+      Returns
+      -------
+      NoneType
+         If model has no optimal solution.
+      float, numpy.ndarray
+         Value of item (array for VarArray).
+      
+      """
+      
+      if (
+            (self.simplexProblem == None)
+            or (self.simplexProblem.optimalSolution == None)
+         ):
+         return None
+      
+      Xj = self.simplexProblem.optimalSolution.Xj
+      
+      if (isinstance(item, VarArray)):
+         return np.array([Xj.get(var.name, float(0)) for var in item])
+      
+      if (isinstance(item, Var)):
+         return float(Xj.get(item.name, float(0)))
+      
+      return item.constant + sum([
+         coefficient * Xj.get(self.vars[column].name, float(0))
+         for column, coefficient in item.terms.items()
+      ])
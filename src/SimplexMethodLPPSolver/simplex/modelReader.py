@@ -0,0 +1,612 @@
+import re
+
+from .customExceptions import CustomExceptions
+from .dataStructures import SimplexProblem
+from .preprocessor import PreProcessor
+
+class ModelReader:
+   """Reads simplex LPP problem from MPS / CPLEX-LP files.
+   
+   Contains readers which stream MPS and CPLEX-LP files line by line and
+   frame them as SimplexProblem straight into constraints and coordinates
+   (bypassing PreProcessor.processExpression), so that file text is never
+   held in memory as a whole.
+   Memory is not bounded by the reader, though: rows are collected in
+   dicts until the file is read (bounds may split variables of rows read
+   earlier), then copied into Constraint lhs lists and coordinates, which
+   SimplexAlgorithm needs both of, so peak memory is up to about three
+   copies of the model's non-zeros.
+   Bounds are framed as additional constraints, since SimplexAlgorithm
+   treats all variables as non-negative, and variables which may be
+   negative are split as (variable - variable_neg).
+   Integrality (MARKER, General, Binary) is ignored, binaries are bounded
+   by 1.
+   
+   Attributes
+   ----------
+   LP_TOKEN: re.Pattern
+      Precompiled pattern matching single token of a CPLEX-LP file.
+   LP_NUMBER: re.Pattern
+      Precompiled pattern matching numeric CPLEX-LP token.
+   LP_SECTIONS: dict
+      Maps lower case CPLEX-LP section keywords to section names.
+   NEGATIVE_SUFFIX: str
+      Suffix of variable holding negative part of a split variable.
+   
+   Methods
+   -------
+   readLines (source, comment)
+      Streams lines of a file.
+      Yields lines of source one at a time, without comments.
+   readMPS (source)
+      Reads MPS file.
+      Streams fixed or free MPS file into SimplexProblem.
+   readLP (source)
+      Reads CPLEX-LP file.
+      Streams CPLEX-LP file into SimplexProblem.
+   lpStatements (source)
+      Streams statements of CPLEX-LP file.
+      Yields section and tokens of each statement, one at a time.
+   parseLPExpression (tokens)
+      Parses tokens of CPLEX-LP expression.
+      Converts tokens into dict with coefficients keyed to variables.
+   parseLPBound (tokens, bounds)
+      Parses tokens of CPLEX-LP bound.
+      Updates lower/upper bound of variable in bounds.
+   frameProblem (problemType, objective, rows, bounds)
+      Frames SimplexProblem from read model.
+      Applies ranges and bounds and attaches rows as constraints.
+   
+   """
+   
+   LP_TOKEN = re.compile(
+      r'(<=|>=|=<|=>|<|>|=|[+\-:]'
+      r'|(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?'
+      r'|[^\s<>=+\-:]+)'
+   )
+   LP_NUMBER = re.compile(
+      r'(?:(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?|inf|infinity)$',
+      re.IGNORECASE,
+   )
+   LP_SECTIONS = {
+      'maximize': 'max', 'maximise': 'max', 'maximum': 'max', 'max': 'max',
+      'minimize': 'min', 'minimise': 'min', 'minimum': 'min', 'min': 'min',
+      'subject to': 'rows', 'such that': 'rows', 'st': 'rows',
+      's.t.': 'rows', 'st.': 'rows',
+      'bounds': 'bounds', 'bound': 'bounds',
+      'general': 'integers', 'generals': 'integers', 'gen': 'integers',
+      'integer': 'integers', 'integers': 'integers',
+      'binary': 'binaries', 'binaries': 'binaries', 'bin': 'binaries',
+      'end': 'end',
+   }
+   NEGATIVE_SUFFIX = '_neg'
+   
+   def readLines (source, comment):
+      """Streams lines of a file.
+      
+      Yields lines of source one at a time, without line endings and
+      anything following comment character.
+      
+      Parameters
+      ----------
+      source: str, iterable
+         Path of file, or iterable of lines (like an open file).
+      comment: str
+         Character starting a comment.
+      
+      Yields
+      ------
+      str
+         Line, stripped of comment and trailing whitespace.
+      
+      """
+      
+      if (type(source).__name__ == 'str'):
+         with open(source, 'r') as lines:
+            yield from ModelReader.readLines(lines, comment)
+         
+         return None
+      
+      for line in source:
+         yield line.split(comment, 1)[0].rstrip()
+   
+   def readMPS (source):
+      """Reads MPS file.
+      
+      Streams fixed or free MPS file into SimplexProblem, handling NAME,
+      OBJSENSE, ROWS, COLUMNS, RHS, RANGES and BOUNDS sections.
+      First N row is the objective function, other N rows are ignored.
+      Names must not contain whitespace.
+      
+      Parameters
+      ----------
+      source: str, iterable
+         Path of MPS file, or iterable of its lines.
+      
+      Raises
+      ------
+      PreProcessError
+         If source is not a valid MPS file.
+      
+      Returns
+      -------
+      SimplexProblem
+         Framed simplex problem.
+      
+      """
+      
+      problemType = 'min'
+      objectiveRow = None
+      objective = {} # {'variable': coefficient,}
+      rows = [] # [['equalityType', {'variable': coefficient,}, rhs, range],]
+      rowIndices = {} # {'rowName': index in rows,}
+      bounds = {} # {'variable': [lower, upper],}
+      section = None
+      
+      for line in ModelReader.readLines(source, '*'):
+         if (line == ''):
+            continue
+         
+         fields = line.split()
+         
+         if (not line[0].isspace()):
+            section = fields[0].upper()
+            
+            if ((section == 'OBJSENSE') and (len(fields) > 1)):
+               problemType = fields[1].lower()[:3]
+            elif (section == 'ENDATA'):
+               break
+            
+            continue
+         
+         if (section == 'OBJSENSE'):
+            problemType = fields[0].lower()[:3]
+         elif (section == 'ROWS'):
+            if (fields[0].upper() == 'N'):
+               if (objectiveRow == None):
+                  objectiveRow = fields[1]
+               
+               continue
+            
+            rowIndices[fields[1]] = len(rows)
+            rows.append([
+               {'L': '<=', 'G': '>=', 'E': '='}.get(fields[0].upper()),
+               {}, float(0), None,
+            ])
+         elif (section == 'COLUMNS'):
+            if ("'MARKER'" in fields):
+               continue
+            
+            for rowName, value in zip(fields[1::2], fields[2::2]):
+               if (rowName == objectiveRow):
+                  objective[fields[0]] = float(value)
+               elif (rowName in rowIndices):
+                  rows[rowIndices[rowName]][1][fields[0]] = float(value)
+         elif (section in ('RHS', 'RANGES',)):
+            fields = fields[(len(fields) % 2):]
+            
+            for rowName, value in zip(fields[0::2], fields[1::2]):
+               if (rowName in rowIndices):
+                  rows[rowIndices[rowName]][
+                     2 if (section == 'RHS') else 3
+                  ] = float(value)
+         elif (section == 'BOUNDS'):
+            boundType = fields[0].upper()
+            
+            if (boundType in ('FR', 'MI', 'PL', 'BV',)):
+               variable = fields[2] if (len(fields) > 3) else fields[-1]
+               value = float(1)
+            else:
+               variable, value = fields[-2], float(fields[-1])
+            
+            bound = bounds.setdefault(variable, [float(0), float('inf')])
+            
+            if (boundType in ('UP', 'UI',)):
+               if ((value < 0) and (bound[0] == 0)):
+                  bound[0] = float('-inf')
+               
+               bound[1] = value
+            elif (boundType in ('LO', 'LI',)):
+               bound[0] = value
+            elif (boundType == 'FX'):
+               bound[0], bound[1] = value, value
+            elif (boundType == 'FR'):
+               bound[0], bound[1] = float('-inf'), float('inf')
+            elif (boundType == 'MI'):
+               bound[0] = float('-inf')
+            elif (boundType == 'BV'):
+               bound[0], bound[1] = float(0), float(1)
+      
+      if (
+            (objectiveRow == None)
+            or (len(rows) < 1)
+            or (None in [row[0] for row in rows])
+            or (problemType not in ('min', 'max',))
+         ):
+         raise CustomExceptions.PreProcessError(
+            objectiveRow, list(rowIndices.keys()), problemType
+         )
+      
+      return ModelReader.frameProblem(problemType, objective, rows, bounds)
+   
+   def readLP (source):
+      """Reads CPLEX-LP file.
+      
+      Streams CPLEX-LP file into SimplexProblem, handling objective,
+      Subject To, Bounds, General and Binary sections.
+      Constraints need a constant right hand side, ranged constraints are
+      not supported.
+      
+      Parameters
+      ----------
+      source: str, iterable
+         Path of CPLEX-LP file, or iterable of its lines.
+      
+      Raises
+      ------
+      PreProcessError
+         If source is not a valid CPLEX-LP file.
+      
+      Returns
+      -------
+      SimplexProblem
+         Framed simplex problem.
+      
+      """
+      
+      problemType = None
+      objective = None
+      rows = [] # [['equalityType', {'variable': coefficient,}, rhs, None],]
+      bounds = {} # {'variable': [lower, upper],}
+      
+      for section, tokens in ModelReader.lpStatements(source):
+         if (section in ('min', 'max',)):
+            problemType = section
+            objective = ModelReader.parseLPExpression(tokens)
+            
+            if (objective == None):
+               raise CustomExceptions.PreProcessError(
+                  tokens, rows, problemType
+               )
+            
+            objective.pop('', None)
+         elif (section == 'rows'):
+            equality = [
+               i
+               for i, token in enumerate(tokens)
+               if (token in ('<=', '>=', '=<', '=>', '<', '>', '=',))
+            ]
+            if (len(equality) != 1):
+               raise CustomExceptions.PreProcessError(
+                  objective, tokens, problemType
+               )
+            
+            lhs = ModelReader.parseLPExpression(tokens[:equality[0]])
+            rhs = ModelReader.parseLPExpression(tokens[(equality[0] + 1):])
+            
+            if (
+                  (lhs == None)
+                  or (rhs == None)
+                  or (len(rhs) != 1)
+                  or ('' not in rhs)
+               ):
+               raise CustomExceptions.PreProcessError(
+                  objective, tokens, problemType
+               )
+            
+            rows.append([
+               {'=<': '<=', '<': '<=', '=>': '>=', '>': '>='}.get(
+                  tokens[equality[0]], tokens[equality[0]]
+               ),
+               lhs, rhs[''] - lhs.pop('', float(0)), None,
+            ])
+         elif (section == 'bounds'):
+            if (ModelReader.parseLPBound(tokens, bounds) == None):
+               raise CustomExceptions.PreProcessError(
+                  objective, tokens, problemType
+               )
+         elif (section == 'binaries'):
+            for variable in tokens:
+               bounds[variable] = [float(0), float(1)]
+      
+      if (
+            (objective == None)
+            or (len(rows) < 1)
+         ):
+         raise CustomExceptions.PreProcessError(objective, rows, problemType)
+      
+      return ModelReader.frameProblem(problemType, objective, rows, bounds)
+   
+   def lpStatements (source):
+      """Streams statements of CPLEX-LP file.
+      
+      Tokenizes source line by line and yields section and tokens of each
+      statement as soon as it is complete, without statement's name.
+      Objective spans until next section, constraint ends with constant
+      following its equality sign, bounds and General/Binary lists end with
+      their line.
+      
+      Parameters
+      ----------
+      source: str, iterable
+         Path of CPLEX-LP file, or iterable of its lines.
+      
+      Yields
+      ------
+      tuple
+         (section, tokens) with section from LP_SECTIONS values.
+      
+      """
+      
+      section = None
+      tokens = []
+      
+      for line in ModelReader.readLines(source, '\\'):
+         keyword = ' '.join(line.lower().split())
+         
+         for sectionKeyword, rest in (
+               (keyword, ''),
+               (keyword.split(' ')[0], ' '.join(line.split()[1:])),
+            ):
+            if (sectionKeyword in ModelReader.LP_SECTIONS):
+               if (len(tokens) > 0):
+                  yield (section, tokens[(2 if (':' in tokens[1:2]) else 0):])
+               
+               tokens = []
+               section = ModelReader.LP_SECTIONS[sectionKeyword]
+               line = rest
+               break
+         
+         if (section == 'end'):
+            return None
+         
+         for token in ModelReader.LP_TOKEN.findall(line):
+            if (
+                  (section == 'rows')
+                  and (len(tokens) > 1)
+                  and (ModelReader.LP_NUMBER.match(tokens[-1]) != None)
+                  and (
+                     (tokens[-2] in ('<=', '>=', '=<', '=>', '<', '>', '=',))
+                     or (
+                        (tokens[-2] in ('+', '-',))
+                        and (len(tokens) > 2)
+                        and (tokens[-3] in (
+                           '<=', '>=', '=<', '=>', '<', '>', '=',
+                        ))
+                     )
+                  )
+               ):
+               yield (section, tokens[(2 if (':' in tokens[1:2]) else 0):])
+               tokens = []
+            
+            tokens.append(token)
+         
+         if (
+               (section in ('bounds', 'integers', 'binaries',))
+               and (len(tokens) > 0)
+            ):
+            yield (section, tokens)
+            tokens = []
+      
+      if (len(tokens) > 0):
+         yield (section, tokens[(2 if (':' in tokens[1:2]) else 0):])
+   
+   def parseLPExpression (tokens):
+      """Parses tokens of CPLEX-LP expression.
+      
+      Converts tokens of linear expression like ['3', 'x', '-', 'y', '+',
+      '2'] into dict with coefficients keyed to variables, with constant
+      keyed to ''.
+      
+      Parameters
+      ----------
+      tokens: list
+         Tokens of expression, as matched by LP_TOKEN.
+      
+      Returns
+      -------
+      NoneType
+         If expression is invalid.
+      dict
+         Dict with variable as key and coefficient as value.
+      
+      """
+      
+      expression = {}
+      sign = float(1)
+      number = None
+      
+      for token in tokens:
+         if (token in ('+', '-',)):
+            if (number != None):
+               expression[''] = expression.get('', float(0)) + (sign * number)
+               sign = float(1)
+               number = None
+            
+            if (token == '-'):
+               sign = 0 - sign
+         elif (ModelReader.LP_NUMBER.match(token) != None):
+            if (number != None):
+               return None
+            
+            number = float(token)
+         elif (token in ('<=', '>=', '=<', '=>', '<', '>', '=', ':',)):
+            return None
+         else:
+            expression[token] = expression.get(token, float(0)) + (
+               sign * (float(1) if (number == None) else number)
+            )
+            sign = float(1)
+            number = None
+      
+      if (number != None):
+         expression[''] = expression.get('', float(0)) + (sign * number)
+      
+      return expression
+   
+   def parseLPBound (tokens, bounds):
+      """Parses tokens of CPLEX-LP bound.
+      
+      Updates bounds with bound like 'x free', 'x <= 4', '-2 <= x',
+      '-inf <= x <= 4' or 'x = 1'.
+      
+      Parameters
+      ----------
+      tokens: list
+         Tokens of bound, as matched by LP_TOKEN.
+      bounds: dict
+         Dict with [lower, upper] keyed to variables, updated in place.
+      
+      Returns
+      -------
+      NoneType
+         If bound is invalid.
+      str
+         Variable whose bound has been updated.
+      
+      """
+      
+      items = [] # tokens with signs merged into following numbers.
+      sign = float(1)
+      
+      for token in tokens:
+         if (token in ('+', '-',)):
+            sign = (0 - sign) if (token == '-') else sign
+         elif (ModelReader.LP_NUMBER.match(token) != None):
+            items.append(sign * float(token))
+            sign = float(1)
+         else:
+            items.append(
+               {'=<': '<=', '<': '<=', '=>': '>=', '>': '>='}.get(
+                  token, token
+               )
+            )
+      
+      if ((len(items) == 2) and (str(items[1]).lower() == 'free')):
+         bounds[items[0]] = [float('-inf'), float('inf')]
+         
+         return items[0]
+      
+      if (len(items) == 3):
+         if (type(items[0]).__name__ == 'float'):
+            items = [
+               items[2],
+               {'<=': '>=', '>=': '<=', '=': '='}.get(items[1]),
+               items[0],
+            ]
+      elif ((len(items) == 5) and (items[1] == items[3] == '<=')):
+         bounds[items[2]] = [items[0], items[4]]
+         
+         return items[2]
+      else:
+         return None
+      
+      if (
+            (type(items[0]).__name__ != 'str')
+            or (type(items[2]).__name__ != 'float')
+            or (items[1] not in ('<=', '>=', '=',))
+         ):
+         return None
+      
+      bound = bounds.setdefault(items[0], [float(0), float('inf')])
+      
+      if (items[1] == '<='):
+         bound[1] = items[2]
+      elif (items[1] == '>='):
+         bound[0] = items[2]
+      else:
+         bound[0], bound[1] = items[2], items[2]
+      
+      return items[0]
+   
+   def frameProblem (problemType, objective, rows, bounds):
+      """Frames SimplexProblem from read model.
+      
+      Splits variables with negative lower bound as (variable -
+      variable_neg), frames each range as additional constraint following
+      its row, frames non-trivial bounds as constraints following all rows
+      and attaches everything in a new SimplexProblem.
+      
+      Parameters
+      ----------
+      problemType: str
+         Type of problem - minimization ('min') or maximization ('max').
+      objective: dict
+         Dict with coefficients keyed to variables.
+      rows: list
+         List of ['equalityType', {'variable': coefficient,}, rhs, range],
+         each released (set to None) as soon as it is attached, which
+         only lowers peak memory while framing, not below one copy of
+         the rows next to constraints and coordinates.
+      bounds: dict
+         Dict with [lower, upper] keyed to variables.
+      
+      Returns
+      -------
+      SimplexProblem
+         Framed simplex problem.
+      
+      """
+      
+      split = set([
+         variable
+         for variable, bound in bounds.items()
+         if (bound[0] < 0)
+      ])
+      
+      for expression in [objective,] + [row[1] for row in rows]:
+         for variable in split.intersection(expression.keys()):
+            expression[variable + ModelReader.NEGATIVE_SUFFIX] = (
+               0 - expression[variable]
+            )
+      
+      simplexProblem = SimplexProblem()
+      simplexProblem.problemType = problemType
+      simplexProblem.objectiveFunction = [
+         (float(coefficient), str(variable),)
+         for variable, coefficient in objective.items()
+         if (coefficient != 0)
+      ]
+      
+      for i in range(0, len(rows)):
+         equalityType, lhs, rhs, rowRange = rows[i]
+         rows[i] = None # release row as soon as it is attached.
+         lhs = [
+            (coefficient, variable,)
+            for variable, coefficient in lhs.items()
+         ]
+         
+         if (rowRange == None):
+            PreProcessor.attachConstraint(
+               simplexProblem, lhs, equalityType, rhs
+            )
+            continue
+         
+         if (
+               (equalityType == '<=')
+               or ((equalityType == '=') and (rowRange < 0))
+            ):
+            lower, upper = (rhs - abs(rowRange)), rhs
+         else:
+            lower, upper = rhs, (rhs + abs(rowRange))
+         
+         PreProcessor.attachConstraint(simplexProblem, lhs, '<=', upper)
+         PreProcessor.attachConstraint(simplexProblem, lhs, '>=', lower)
+      
+      for variable, (lower, upper) in bounds.items():
+         lhs = [(float(1), variable,)]
+         
+         if (variable in split):
+            lhs.append((float(-1), variable + ModelReader.NEGATIVE_SUFFIX,))
+         
+         if (lower == upper):
+            PreProcessor.attachConstraint(simplexProblem, lhs, '=', lower)
+            continue
+         
+         if ((lower > 0) or ((lower < 0) and (lower != float('-inf')))):
+            PreProcessor.attachConstraint(simplexProblem, lhs, '>=', lower)
+         
+         if (upper != float('inf')):
+            PreProcessor.attachConstraint(simplexProblem, lhs, '<=', upper)
+      
+      return simplexProblem
\ No newline at end of file
@@ -0,0 +1,350 @@
+import numpy as np
+
+from .customExceptions import CustomExceptions
+from .dataStructures import SimplexProblem
+
+class PivotRules:
+   """Pivot selection and degeneracy handling for SimplexAlgorithm.
+   
+   Contains rules to select key column and key row of an IterationTable,
+   bookkeeping of degenerate pivots with Bland's rule fallback, and
+   bounded random perturbation of rhs with its removal.
+   
+   Methods
+   -------
+   keyColumn (simplexProblem, iterationTable)
+      Selects key column.
+      Selects most negative deltaJ, or first negative deltaJ if Bland's
+      rule is active.
+   keyRow (simplexProblem, iterationTable, keyColumn)
+      Selects key row.
+      Calculates minimum ratio for each Row and selects key row as per
+      SimplexProblem's ratioTest, or Bland's rule if active.
+   harrisKeyRow (simplexProblem, candidates, keyColumn)
+      Selects key row by Harris two-pass ratio test.
+      Selects row with largest key column element among rows whose ratio
+      is within relaxed minimum ratio.
+   recordPivot (simplexProblem, keyRow)
+      Records pivot.
+      Counts degenerate pivots and switches Bland's rule on or off.
+   perturb (simplexProblem)
+      Perturbs rhs.
+      Adds bounded random perturbation to b of initial IterationTable.
+   removePerturbation (simplexProblem)
+      Removes rhs perturbation.
+      Restores initial b and recalculates b of last IterationTable.
+   
+   """
+   
+   def keyColumn (simplexProblem, iterationTable):
+      """Selects key column.
+      
+      Selects aj with most negative deltaJ, or first aj (in order of
+      IterationTable's aj) with negative deltaJ if Bland's rule is active.
+      deltaJ within pivotTolerance of zero is taken as zero, so that
+      roundoff doesn't select a key column.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem to which iterationTable belongs.
+      iterationTable: IterationTable
+         IterationTable with calculated deltaJ.
+      
+      Returns
+      -------
+      NoneType
+         If no deltaJ is below -pivotTolerance, i.e., solution is optimal.
+      int
+         aj column selected as key column.
+      
+      """
+      
+      tolerance = simplexProblem.pivotTolerance
+      
+      if (simplexProblem.blandRule == True):
+         for aj in iterationTable.aj:
+            if (iterationTable.deltaJ.get(aj, float(0)) < (0-tolerance)):
+               return aj
+         
+         return None
+      
+      keyColumn = None
+      mostNegativeDeltaJ = float(0-tolerance)
+      for aj, deltaj in iterationTable.deltaJ.items():
+         if (deltaj < mostNegativeDeltaJ):
+            keyColumn = aj
+            mostNegativeDeltaJ = deltaj
+      
+      return keyColumn
+   
+   def keyRow (simplexProblem, iterationTable, keyColumn):
+      """Selects key row.
+      
+      Calculates minimum ratio for each Row and selects key row among
+      rows whose key column element exceeds pivotTolerance (so that
+      roundoff sized elements are never pivots), with non-negative b (b
+      within pivotTolerance of zero, or within feasibilityTolerance, plus
+      pivotTolerance for rounding, for HARRIS).
+      Ties of minimum ratio are broken by first row (STANDARD), by
+      lexicographic order (LEXICOGRAPHIC) or by smallest basic aj
+      (Bland's rule, when active), while HARRIS delegates to harrisKeyRow.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem to which iterationTable belongs.
+      iterationTable: IterationTable
+         IterationTable whose key row has to be selected.
+      keyColumn: int
+         aj column selected as key column.
+      
+      Returns
+      -------
+      NoneType
+         If no row qualifies, i.e., solution is unbounded.
+      Row
+         Row selected as key row.
+      
+      """
+      
+      tolerance = simplexProblem.pivotTolerance
+      bTolerance = (
+         (simplexProblem.feasibilityTolerance + tolerance)
+         if (
+            (simplexProblem.blandRule == False)
+            and (simplexProblem.ratioTest == SimplexProblem.RatioTest.HARRIS)
+         )
+         else tolerance
+      )
+      candidates = []
+      
+      for row in iterationTable.rowi:
+         aik = row.aj.get(keyColumn, float(0))
+         row.minRatio = float(CustomExceptions.safe_execute(
+            float('inf'), lambda: (row.b / aik),
+         ))
+         
+         row.isKeyRow = False
+         
+         if (
+               (row.minRatio != float('inf'))
+               and (aik > tolerance)
+               and (row.b >= (0-bTolerance))
+            ):
+            candidates.append(row)
+      
+      if (len(candidates) < 1):
+         return None
+      
+      if (
+            (simplexProblem.blandRule == False)
+            and (simplexProblem.ratioTest == SimplexProblem.RatioTest.STANDARD)
+         ):
+         keyRow = candidates[0]
+         for row in candidates[1:]:
+            if (row.minRatio < keyRow.minRatio):
+               keyRow = row
+         
+         return keyRow
+      
+      if (
+            (simplexProblem.blandRule == False)
+            and (simplexProblem.ratioTest == SimplexProblem.RatioTest.HARRIS)
+         ):
+         return PivotRules.harrisKeyRow(simplexProblem, candidates, keyColumn)
+      
+      leastRatio = min([row.minRatio for row in candidates])
+      ties = [
+         row
+         for row in candidates
+         if (row.minRatio <= (leastRatio + tolerance))
+      ]
+      
+      if (simplexProblem.blandRule == True):
+         return min(ties, key=lambda row: iterationTable.aj.index(row.B))
+      
+      basisColumns = [
+         row.B
+         for row in simplexProblem.iterationTables[0].rowi
+      ]
+      
+      return min(ties, key=lambda row: tuple([
+         (row.aj.get(aj, float(0)) / row.aj[keyColumn])
+         for aj in basisColumns
+      ]))
+   
+   def harrisKeyRow (simplexProblem, candidates, keyColumn):
+      """Selects key row by Harris two-pass ratio test.
+      
+      First pass calculates relaxed minimum ratio, i.e., minimum of
+      (b + feasibilityTolerance) / aij over candidate rows, where ratios
+      of slightly infeasible rows (negative b) count as zero.
+      Second pass selects, among rows whose minRatio doesn't exceed relaxed
+      minimum ratio, row with largest aij for key column, so that tiny
+      key elements are avoided when a near-minimal ratio offers a larger
+      one. Rows whose aij doesn't exceed pivotTolerance are never
+      considered.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem to which candidates belong.
+      candidates: list
+         Rows eligible as key row, with calculated minRatio, only those
+         whose key column element exceeds pivotTolerance are considered.
+      keyColumn: int
+         aj column selected as key column.
+      
+      Returns
+      -------
+      NoneType
+         If no candidate has a large enough key column element.
+      Row
+         Row selected as key row.
+      
+      """
+      
+      candidates = [
+         row
+         for row in candidates
+         if (row.aj.get(keyColumn, float(0)) > simplexProblem.pivotTolerance)
+      ]
+      
+      if (len(candidates) < 1):
+         return None
+      
+      relaxedRatio = min([
+         (
+            max(row.minRatio, float(0))
+            + (
+               simplexProblem.feasibilityTolerance
+               / row.aj.get(keyColumn, float(0))
+            )
+         )
+         for row in candidates
+      ])
+      
+      keyRow = None
+      largestElement = float(0)
+      
+      for row in candidates:
+         if (max(row.minRatio, float(0)) > relaxedRatio):
+            continue
+         
+         if (row.aj.get(keyColumn, float(0)) > largestElement):
+            keyRow = row
+            largestElement = row.aj.get(keyColumn, float(0))
+      
+      return keyRow
+   
+   def recordPivot (simplexProblem, keyRow):
+      """Records pivot.
+      
+      Counts degenerate pivots (zero minimum ratio) and activates Bland's
+      rule after blandThreshold consecutive degenerate pivots, deactivating
+      it again on the first non-degenerate pivot.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem being calculated.
+      keyRow: Row
+         Row selected as key row.
+      
+      """
+      
+      if (simplexProblem.blandRule == True):
+         simplexProblem.blandPivots += 1
+      
+      if (abs(keyRow.minRatio) <= simplexProblem.pivotTolerance):
+         simplexProblem.degeneratePivots += 1
+         simplexProblem.consecutiveDegeneratePivots += 1
+      else:
+         simplexProblem.consecutiveDegeneratePivots = 0
+      
+      simplexProblem.blandRule = (
+         (simplexProblem.blandThreshold != None)
+         and (
+            simplexProblem.consecutiveDegeneratePivots
+            >= simplexProblem.blandThreshold
+         )
+      )
+   
+   def perturb (simplexProblem):
+      """Perturbs rhs.
+      
+      Adds random perturbation, bounded by perturbation * (1 + |b|), to
+      each b of initial IterationTable and stores original b values in
+      unperturbedRhs.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem with framed initial IterationTable.
+      
+      """
+      
+      if (
+            (simplexProblem.perturbation == None)
+            or (simplexProblem.iterationTables == None)
+         ):
+         return None
+      
+      generator = np.random.default_rng(simplexProblem.perturbationSeed)
+      simplexProblem.unperturbedRhs = []
+      
+      for row in simplexProblem.iterationTables[0].rowi:
+         simplexProblem.unperturbedRhs.append(row.b)
+         row.b = float(
+            row.b
+            + (
+               simplexProblem.perturbation
+               * (1 + abs(row.b))
+               * generator.random()
+            )
+         )
+   
+   def removePerturbation (simplexProblem):
+      """Removes rhs perturbation.
+      
+      Restores b of initial IterationTable and recalculates b of last
+      IterationTable from its basis, i.e., solves B.b = unperturbedRhs
+      over columns of initial IterationTable.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         SimplexProblem which has been perturbed.
+      
+      """
+      
+      if (simplexProblem.unperturbedRhs == None):
+         return None
+      
+      initialTable = simplexProblem.iterationTables[0]
+      lastTable = simplexProblem.iterationTables[-1]
+      
+      for row, b in zip(initialTable.rowi, simplexProblem.unperturbedRhs):
+         row.b = b
+      
+      if (lastTable is initialTable):
+         return None
+      
+      basis = np.array([
+         [
+            initialRow.aj.get(row.B, float(0))
+            for row in lastTable.rowi
+         ]
+         for initialRow in initialTable.rowi
+      ])
+      b = CustomExceptions.safe_execute(
+         None,
+         lambda: np.linalg.solve(
+            basis, np.array(simplexProblem.unperturbedRhs)
+         ),
+      )
+      
+      if (b is not None):
+         for row, bi in zip(lastTable.rowi, b):
+            row.b = float(bi)
@@ -3,6 +3,7 @@ import numpy as np
 
 from .dataStructures import (SimplexProblem, Constraint,)
 from .customExceptions import CustomExceptions
+from .lruCache import LRUCache
 
 class PreProcessor:
    """Pre-processes simplex LPP problem and frames as SimplexProblem.
@@ -12,30 +13,69 @@ class PreProcessor:
    Each step can be invoked manually by calling separate functions or
    invoke multiple steps from just one function, automatically (almost).
    
+   Attributes
+   ----------
+   TERM: re.Pattern
+      Precompiled pattern matching single term of an expression, i.e.,
+      optional coefficient (or lone sign) followed by optional variable.
+   EQUALITY: re.Pattern
+      Precompiled pattern splitting constraint at its equality sign.
+   EXPRESSION_CACHE: LRUCache
+      Cache of processExpression results keyed by expression.
+   CONSTRAINT_CACHE: LRUCache
+      Cache of parseConstraint results keyed by constraint without spaces.
+   
    Methods
    -------
    processExpression (expression)
       Processes single expression.
       Converts expression string into list of tuples containing
       variables and coefficients in format (coefficient, 'variable').
+   tokenizeExpression (expression)
+      Tokenizes single expression.
+      Uncached part of processExpression.
    objectiveFunction (objFunc, simplexProblem=None, problemType='min')
       Processes objective function of a simplex problem.
       Processes objective function and generates a SimplexProblem
       if not provided.
    processConstraints (simplexProblem, constraints)
       Processes set of constraints for SimplexProblem.
+   parseConstraint (constraint)
+      Parses single constraint.
+      Uncached part of processConstraints.
    preProcess (objectiveFunction, constraints, problemType=None)
       Runs pre-processor's all steps, automatically (almost).
       Pre-processes simplex problem and generates a SimplexProblem.
+   attachConstraint (simplexProblem, lhs, equalityType, rhs)
+      Attaches single constraint to SimplexProblem.
+      Frames Constraint from processed terms and records its coordinates.
+   processMatrix (simplexProblem, A, b, equalityType)
+      Processes constraint matrix for SimplexProblem.
+      Attaches rows of A.x (equalityType) b as new constraints, without
+      any str processing.
+   fromArrays (c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
+         sense='min')
+      Frames SimplexProblem from arrays.
+      Frames simplex problem given in matrix form, with variables named
+      x1, x2, ... after columns.
    
    """
    
+   TERM = re.compile(
+      r'(?:([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)|([+-]))?(\w*)'
+   )
+   EQUALITY = re.compile('(<=|>=|<|>|=)')
+   EXPRESSION_CACHE = LRUCache(4096)
+   CONSTRAINT_CACHE = LRUCache(16384)
+   
    def processExpression (expression):
       """Processes single expression.
       
       Converts expression string into list of tuples containing
       variables and coefficients in format (coefficient, 'variable').
       For constants, tuple will take the form (coefficient, '').
+      Expression is tokenized by tokenizeExpression, unless its result is
+      found in EXPRESSION_CACHE.
       
       Parameters
       ----------
@@ -49,7 +89,8 @@ class PreProcessor:
       Returns
       -------
       NoneType
-         If expression is invalid.
+         If expression is invalid, i.e., it is empty or a term is followed
+         by anything other than (+|-).
       list
          List of tuples of term in format (coefficient, 'variable').
          Coefficient is of type float, while variable is of type str.
@@ -58,46 +99,59 @@ class PreProcessor:
       if ((type(expression).__name__ != 'str') or (len(expression) < 1)):
          return None
       
-      terms = []
+      terms = PreProcessor.EXPRESSION_CACHE.get(expression)
       
-      while expression != '':
-         coefficient = re.findall(
-            '^([+-]?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)[a-zA-Z]*',
-            expression,
+      if (terms is PreProcessor.EXPRESSION_CACHE.MISSING):
+         terms = PreProcessor.tokenizeExpression(expression)
+         PreProcessor.EXPRESSION_CACHE.put(
+            expression, (None if (terms == None) else tuple(terms))
          )
+      
+      return None if (terms == None) else list(terms)
+   
+   def tokenizeExpression (expression):
+      """Tokenizes single expression.
+      
+      Uncached part of processExpression, tokenizing expression in a
+      single left to right pass with TERM.
+      
+      Parameters
+      ----------
+      expression: str
+         Single non-empty expression string.
+      
+      Returns
+      -------
+      NoneType
+         If expression is invalid.
+      list
+         List of tuples of term in format (coefficient, 'variable').
+      
+      """
+      
+      terms = []
+      position = 0
+      
+      while position < len(expression):
+         term = PreProcessor.TERM.match(expression, position)
+         number, sign, variable = term.groups()
+         position = term.end()
          
-         if (len(coefficient) < 1):
-            if (expression[0] in ('-', '+',)):
-               coefficient = expression[0] + '1'
-               expression = expression[1:]
-            else:
-               coefficient = '1'
+         if (number != None):
+            coefficient = number
+         elif (sign != None):
+            coefficient = sign + '1'
          else:
-            coefficient = coefficient[0]
-            expression = expression[(
-               expression.index(coefficient) + len(coefficient)
-            ):]
-         
-         if (len(expression) < 1):
-            terms.append((float(coefficient), '',))
-            break
-         
-         variable = re.findall(
-            '^(\w+)[+-]?',
-            expression,
-         )
-         
-         if (len(variable) < 1):
-            terms.append((float(coefficient), '',))
-            continue
-         
-         variable = variable[0]
-         
-         expression = expression[(
-            expression.index(variable) + len(variable)
-         ):]
+            coefficient = '1'
          
          terms.append((float(coefficient), str(variable),))
+         
+         if (
+               (variable == '')
+               and (position < len(expression))
+               and (expression[position] not in ('-', '+',))
+            ):
+            return None
       
       return terms
    
@@ -139,7 +193,7 @@ class PreProcessor:
       
       simplexProblem.problemType = problemType.lower()
       
-      objFunc.replace(' ', '')
+      objFunc = objFunc.replace(' ', '')
       objFunc = PreProcessor.processExpression(objFunc)
       if (objFunc in (None, '', [],)):
          return None
@@ -153,6 +207,9 @@ class PreProcessor:
       
       Processes all constraints provided and attaches them in
       simplexProblem as new constraints.
+      Each constraint is parsed by parseConstraint, unless its result is
+      found in CONSTRAINT_CACHE (keyed by constraint without spaces), and
+      attached by attachConstraint.
       
       Parameters
       ----------
@@ -181,85 +238,92 @@ class PreProcessor:
       if (type(constraints).__name__ not in ('list', 'tuple',)):
          return None
       
-      if (simplexProblem.constraints == None):
-         simplexProblem.constraints = []
-      
       for constraint in constraints:
-         constraintSet = Constraint()
-         
-         constraint = re.split(
-            '(<=|>=|<|>|=)',
-            constraint,
-            1,
-         )
-         
-         if (len(constraint) != 3):
-            return None
-         
-         if (
-               (len(re.findall('^(>|<|=)', constraint[0])) > 0)
-               or (len(re.findall('^(>|<|=)', constraint[2])) > 0)
-            ):
-            return None
+         constraint = constraint.replace(' ', '')
+         constraintSet = PreProcessor.CONSTRAINT_CACHE.get(constraint)
          
-         lhs = PreProcessor.processExpression(
-            constraint[0].replace(' ', '')
-         )
+         if (constraintSet is PreProcessor.CONSTRAINT_CACHE.MISSING):
+            constraintSet = PreProcessor.parseConstraint(constraint)
+            PreProcessor.CONSTRAINT_CACHE.put(constraint, constraintSet)
          
-         if (lhs in (None, [],)):
+         if (constraintSet == None):
             return None
          
-         lhsConstraints = [term
-            for term in lhs
-            if (term[1] != '')
-         ]
-         
-         lhsConstant = sum([term[0]
-            for term in lhs
-            if (term[1] == '')
-         ])
-         constraintSet.equalityType = constraint[1]
-         
-         rhs = PreProcessor.processExpression(
-            constraint[2].replace(' ', '')
-         )
-         
-         if (rhs in (None, [],)):
-            return None
-         
-         rhsConstraints = [
-            ((0-float(term[0])), str(term[1]),)
-            for term in rhs
-            if (term[1] != '')
-         ]
-         
-         rhsConstant = sum([term[0]
-            for term in rhs
-            if (term[1] == '')
-         ])
-         
-         constraintSet.rhs = rhsConstant - lhsConstant
-         
-         lhsConstraints.extend(rhsConstraints)
-         
-         cVars = np.array([lhsConstraints[0],])
-         
-         for lhsConstraint in lhsConstraints[1:]:
-            if (lhsConstraint[1] in cVars[:, 1]):
-               cVIndex = np.where(cVars[:, 1] == lhsConstraint[1])[0][0]
-               cVars[cVIndex][0] = float(cVars[cVIndex][0]) + lhsConstraint[0]
-            else:
-               cVars = list(cVars)
-               cVars.append(lhsConstraint)
-               cVars = np.array(cVars)
-         
-         constraintSet.lhs = [
-            (float(list(term)[0]), str(list(term)[1]),)
-            for term in list(cVars)
-            if (float(list(term)[0]) != 0)
-         ]
-         
-         simplexProblem.constraints.append(constraintSet)
+         PreProcessor.attachConstraint(simplexProblem, *constraintSet)
+   
+   def parseConstraint (constraint):
+      """Parses single constraint.
+      
+      Uncached part of processConstraints, parsing constraint with
+      repeated variables merged in a single pass.
+      
+      Parameters
+      ----------
+      constraint: str
+         Single constraint, without spaces.
+      
+      Returns
+      -------
+      NoneType
+         If constraint is invalid.
+      tuple
+         (lhs, equalityType, rhs) with lhs as tuple of terms in format
+         (coefficient, 'variable',), as expected by attachConstraint.
+      
+      """
+      
+      constraint = PreProcessor.EQUALITY.split(constraint, 1)
+      
+      if (len(constraint) != 3):
+         return None
+      
+      if (
+            constraint[0].startswith(('>', '<', '=',))
+            or constraint[2].startswith(('>', '<', '=',))
+         ):
+         return None
+      
+      lhs = (
+         PreProcessor.tokenizeExpression(constraint[0])
+         if (len(constraint[0]) > 0)
+         else None
+      )
+      
+      if (lhs in (None, [],)):
+         return None
+      
+      rhs = (
+         PreProcessor.tokenizeExpression(constraint[2])
+         if (len(constraint[2]) > 0)
+         else None
+      )
+      
+      if (rhs in (None, [],)):
+         return None
+      
+      cVars = {} # {'variable': coefficient,} - in order of appearance.
+      constant = float(0) # rhs constant - lhs constant.
+      
+      for term in lhs:
+         if (term[1] == ''):
+            constant -= term[0]
+         else:
+            cVars[term[1]] = cVars.get(term[1], float(0)) + term[0]
+      
+      for term in rhs:
+         if (term[1] == ''):
+            constant += term[0]
+         else:
+            cVars[term[1]] = cVars.get(term[1], float(0)) - term[0]
+      
+      return (
+         tuple([
+            (coefficient, variable,)
+            for variable, coefficient in cVars.items()
+         ]),
+         constraint[1],
+         constant,
+      )
    
    def preProcess (objectiveFunction, constraints, problemType=None):
       """Runs pre-processor's all steps, automatically (almost).
@@ -321,3 +385,201 @@ class PreProcessor:
          )
       
       return simplexProblem
+   
+   def attachConstraint (simplexProblem, lhs, equalityType, rhs):
+      """Attaches single constraint to SimplexProblem.
+      
+      Frames Constraint from already processed terms, dropping zero
+      coefficients, attaches it in simplexProblem as new constraint and
+      appends its coefficients to coordinates as (row, column, value).
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         Framed simplex problem.
+      lhs: list
+         List of tuple terms in format (coefficient, 'variable',), with
+         unique variables.
+      equalityType: str
+         Equality type like '<', '<=', '>', '>=', '='.
+      rhs: float
+         Constant value indicating RHS of equation.
+      
+      """
+      
+      if (simplexProblem.constraints == None):
+         simplexProblem.constraints = []
+      
+      if (simplexProblem.columns == None):
+         simplexProblem.columns = {}
+      
+      if (simplexProblem.coordinates == None):
+         simplexProblem.coordinates = []
+      
+      constraintSet = Constraint()
+      constraintSet.equalityType = equalityType
+      constraintSet.rhs = float(rhs)
+      constraintSet.lhs = [
+         (float(coefficient), str(variable),)
+         for coefficient, variable in lhs
+         if (coefficient != 0)
+      ]
+      
+      row = len(simplexProblem.constraints)
+      
+      for coefficient, variable in constraintSet.lhs:
+         column = simplexProblem.columns.setdefault(
+            variable, len(simplexProblem.columns)
+         )
+         simplexProblem.coordinates.append((row, column, coefficient,))
+      
+      simplexProblem.constraints.append(constraintSet)
+   
+   def processMatrix (simplexProblem, A, b, equalityType):
+      """Processes constraint matrix for SimplexProblem.
+      
+      Attaches each row i of A.x (equalityType) b as new constraint in
+      simplexProblem, with lhs holding non-zero A[i] entries against
+      variables x1, x2, ... and coordinates extended accordingly.
+      Sparse matrices (providing tocsr) are read without densifying, with
+      duplicate entries summed.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         Framed simplex problem.
+      A: array_like, sparse matrix
+         2-D constraint matrix, columns ordered as x1, x2, ...
+      b: array_like
+         1-D rhs, one value per row of A.
+      equalityType: str
+         Equality type of all rows, like '<=', '>=', '='.
+      
+      Returns
+      -------
+      NoneType
+         If A and b don't agree in shape.
+      int
+         Number of constraints attached.
+      
+      """
+      
+      b = np.asarray(b, dtype=float).reshape(-1)
+      
+      if (hasattr(A, 'tocsr')):
+         A = A.tocsr()
+         A.sum_duplicates() # repeated (i, j) entries add up, as in scipy.
+         rows = [
+            (
+               A.indices[A.indptr[i]:A.indptr[i + 1]],
+               A.data[A.indptr[i]:A.indptr[i + 1]],
+            )
+            for i in range(0, A.shape[0])
+         ]
+      else:
+         A = np.asarray(A, dtype=float)
+         
+         if (A.ndim != 2):
+            return None
+         
+         rows = [
+            (np.flatnonzero(Ai), Ai[np.flatnonzero(Ai)],)
+            for Ai in A
+         ]
+      
+      if (len(rows) != len(b)):
+         return None
+      
+      for (columns, values), bi in zip(rows, b):
+         PreProcessor.attachConstraint(
+            simplexProblem,
+            [
+               (value, 'x' + str(int(j) + 1),)
+               for j, value in zip(columns, values)
+            ],
+            equalityType,
+            bi,
+         )
+      
+      return len(rows)
+   
+   def fromArrays (c, A_ub=None, b_ub=None, A_eq=None, b_eq=None,
+         sense='min'
+      ):
+      """Frames SimplexProblem from arrays.
+      
+      Frames simplex problem given in matrix form, i.e.,
+      (sense) c.x subject to A_ub.x <= b_ub, A_eq.x = b_eq, with variables
+      named x1, x2, ... after columns, bypassing processExpression.
+      
+      Parameters
+      ----------
+      c: array_like
+         1-D objective function coefficients.
+      A_ub: array_like, sparse matrix, default=None
+         2-D matrix of '<=' constraints.
+      b_ub: array_like, default=None
+         1-D rhs of '<=' constraints.
+      A_eq: array_like, sparse matrix, default=None
+         2-D matrix of '=' constraints.
+      b_eq: array_like, default=None
+         1-D rhs of '=' constraints.
+      sense: str, default='min'
+         Type of problem - minimization ('min') or maximization ('max').
+      
+      Raises
+      ------
+      PreProcessError
+         If sense is invalid, arrays don't agree in shape or there are no
+         constraints.
+      
+      Returns
+      -------
+      SimplexProblem
+         Framed simplex problem.
+      
+      """
+      
+      if (
+            (type(sense).__name__ != 'str')
+            or (sense.lower() not in ('min', 'max',))
+         ):
+         raise CustomExceptions.PreProcessError(c, (A_ub, A_eq,), sense)
+      
+      c = np.asarray(c, dtype=float).reshape(-1)
+      
+      simplexProblem = SimplexProblem()
+      simplexProblem.problemType = sense.lower()
+      simplexProblem.objectiveFunction = [
+         (float(cj), 'x' + str(j + 1),)
+         for j, cj in enumerate(c)
+      ]
+      
+      for A, b, equalityType in (
+            (A_ub, b_ub, '<=',),
+            (A_eq, b_eq, '=',),
+         ):
+         if ((A is None) and (b is None)):
+            continue
+         
+         if ((A is not None) and (not hasattr(A, 'tocsr'))):
+            A = np.atleast_2d(np.asarray(A, dtype=float))
+         
+         if (
+               (A is None)
+               or (b is None)
+               or (A.shape[-1] != len(c))
+               or (PreProcessor.processMatrix(
+                  simplexProblem, A, b, equalityType
+               ) == None)
+            ):
+            raise CustomExceptions.PreProcessError(c, (A_ub, A_eq,), sense)
+      
+      if (
+            (len(c) < 1)
+            or (simplexProblem.constraints == None)
+            or (len(simplexProblem.constraints) < 1)
+         ):
+         raise CustomExceptions.PreProcessError(c, (A_ub, A_eq,), sense)
+      
+      return simplexProblem
@@ -0,0 +1,467 @@
+import json
+import struct
+import zipfile
+
+import numpy as np
+
+from .dataStructures import SimplexProblem, OptimalSolution
+from .preprocessor import PreProcessor
+
+class ProblemArchive:
+   """Compact binary (.npz) archive of SimplexProblem.
+   
+   Stores SimplexProblem and its OptimalSolution as numpy arrays instead of
+   pickled Constraint / IterationTable / Row objects: constraint matrix in
+   CSR format (data, indices, indptr), rhs, equality types, variable names,
+   objective function, final basis with its b values and scalar settings
+   as json. Iteration tables are not stored, re-calculate problem to get
+   them.
+   Arrays are loaded lazily on first access, and when archive is saved
+   uncompressed they can be memory mapped instead of read.
+   Opened archive holds its file until closed, use it as context manager
+   (with ProblemArchive(path) as archive: ...) or call close.
+   
+   Attributes
+   ----------
+   VERSION: int
+      Version of archive format.
+   SETTINGS: tuple
+      SimplexProblem attributes stored as json.
+   path: str
+      Path of archive, with .npz appended if missing.
+   mmapMode: str, None
+      numpy.memmap mode ('r', 'r+', 'c') used for arrays, None to read
+      them into memory.
+   arrays: dict
+      Dict with name as key and already accessed array as value.
+   npzFile: numpy.lib.npyio.NpzFile, None
+      Lazily opened archive, None until an array is read.
+   
+   Methods
+   -------
+   scalar (value)
+      Converts numpy scalar.
+      Returns numpy scalar as python scalar, other values unchanged,
+      called on class.
+   archivePath (path)
+      Normalises path of archive.
+      Appends .npz to path missing it, like numpy.savez, called on class.
+   save (simplexProblem, path, compressed=False)
+      Saves SimplexProblem.
+      Saves SimplexProblem and its OptimalSolution as .npz archive, called
+      on class.
+   __init__ (path, mmapMode=None)
+      Opens archive.
+      Opens archive without reading any array.
+   array (name)
+      Gets archived array.
+      Returns array, loading or memory mapping it on first access.
+   memoryMap (name)
+      Memory maps archived array.
+      Maps raw data of uncompressed archive member.
+   metadata ()
+      Gets scalar settings.
+      Returns dict of archived scalar settings and solution values.
+   matrix ()
+      Gets constraint matrix.
+      Returns constraint matrix in CSR format.
+   toSimplexProblem ()
+      Loads SimplexProblem.
+      Frames archived SimplexProblem and its OptimalSolution.
+   close ()
+      Closes archive.
+      Closes lazily opened archive and drops accessed arrays.
+   __enter__ ()
+      Enters context.
+      Returns archive itself.
+   __exit__ (excType, excValue, traceback)
+      Exits context.
+      Closes archive.
+   load (path, mmapMode=None)
+      Loads SimplexProblem.
+      Opens archive, frames SimplexProblem and closes archive, called on
+      class.
+   
+   """
+   
+   VERSION = 2
+   
+   SETTINGS = (
+      'problemType', 'slackLetter', 'slacks', 'terminated',
+      'terminationReason', 'ratioTest', 'pivotTolerance',
+      'feasibilityTolerance', 'blandThreshold', 'perturbation',
+      'perturbationSeed', 'degeneratePivots', 'blandPivots', 'engine',
+      'blockSize',
+   )
+   
+   def scalar (value):
+      """Converts numpy scalar.
+      
+      Settings are often given as numpy scalars (e.g. perturbationSeed
+      of numpy.int64), which json can't serialize.
+      
+      Parameters
+      ----------
+      value
+         Setting or solution value.
+      
+      Returns
+      -------
+      int, float, bool, str, NoneType
+         value as python scalar, if it is a numpy scalar.
+      
+      """
+      
+      return value.item() if (isinstance(value, np.generic)) else value
+   
+   def archivePath (path):
+      """Normalises path of archive.
+      
+      numpy.savez appends .npz to path missing it, so path given to save
+      has to be normalised the same way to open saved archive.
+      
+      Parameters
+      ----------
+      path: str, file
+         Path or binary file of archive.
+      
+      Returns
+      -------
+      str, file
+         path with .npz appended if missing, file unchanged.
+      
+      """
+      
+      if (
+            (type(path).__name__ == 'str')
+            and (not path.endswith('.npz'))
+         ):
+         return path + '.npz'
+      
+      return path
+   
+   def save (simplexProblem, path, compressed=False):
+      """Saves SimplexProblem.
+      
+      Saves SimplexProblem and its OptimalSolution as .npz archive.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         Framed (and possibly calculated) simplex problem.
+      path: str, file
+         Path (.npz is appended if missing) or binary file to save to.
+      compressed: bool, default=False
+         Whether to compress arrays, compressed arrays can't be memory
+         mapped.
+      
+      Raises
+      ------
+      TypeError
+         If simplexProblem is not a framed SimplexProblem.
+      
+      """
+      
+      if (
+            (type(simplexProblem) != SimplexProblem)
+            or (simplexProblem.objectiveFunction == None)
+         ):
+         raise TypeError('Required framed SimplexProblem')
+      
+      constraints = simplexProblem.constraints or []
+      columns = {}
+      
+      for coefficient, variable in simplexProblem.objectiveFunction:
+         columns.setdefault(variable, len(columns))
+      
+      data, indices, indptr = [], [], [0]
+      
+      for constraint in constraints:
+         for coefficient, variable in constraint.lhs:
+            data.append(coefficient)
+            indices.append(columns.setdefault(variable, len(columns)))
+         
+         indptr.append(len(data))
+      
+      metadata = dict([
+         (setting, ProblemArchive.scalar(getattr(simplexProblem, setting)),)
+         for setting in ProblemArchive.SETTINGS
+      ])
+      metadata['version'] = ProblemArchive.VERSION
+      metadata['optimalValue'] = None
+      arrays = {
+         'names': np.array(list(columns.keys()), dtype=str),
+         'objectiveColumns': np.array([
+            columns[variable]
+            for coefficient, variable in simplexProblem.objectiveFunction
+         ], dtype=np.int64),
+         'objectiveValues': np.array([
+            coefficient
+            for coefficient, variable in simplexProblem.objectiveFunction
+         ], dtype=np.float64),
+         'data': np.array(data, dtype=np.float64),
+         'indices': np.array(indices, dtype=np.int64),
+         'indptr': np.array(indptr, dtype=np.int64),
+         'rhs': np.array([
+            constraint.rhs for constraint in constraints
+         ], dtype=np.float64),
+         'equalityTypes': np.array([
+            constraint.equalityType for constraint in constraints
+         ], dtype='<U2'),
+      }
+      
+      optimalSolution = simplexProblem.optimalSolution
+      
+      if (optimalSolution != None):
+         metadata['optimalValue'] = ProblemArchive.scalar(
+            optimalSolution.optimalValue
+         )
+         arrays['basis'] = np.array(
+            list(optimalSolution.Xj.keys()), dtype=str
+         )
+         arrays['basisValues'] = np.array(
+            list(optimalSolution.Xj.values()), dtype=np.float64
+         )
+      
+      arrays['metadata'] = np.array(json.dumps(metadata))
+      
+      path = ProblemArchive.archivePath(path)
+      
+      if (compressed == True):
+         np.savez_compressed(path, **arrays)
+      else:
+         np.savez(path, **arrays)
+   
+   def __init__ (self, path, mmapMode=None):
+      """Opens archive.
+      
+      Opens archive without reading any array.
+      
+      Parameters
+      ----------
+      path: str
+         Path of archive (.npz is appended if missing).
+      mmapMode: str, default=None
+         numpy.memmap mode ('r', 'r+', 'c') used for arrays, None to read
+         them into memory.
+      
+      """
+      
+      self.path = ProblemArchive.archivePath(path) # str.
+      self.mmapMode = mmapMode # str|None - numpy.memmap mode.
+      self.arrays = {} # {'name': numpy.ndarray,} - accessed arrays.
+      self.npzFile = None # numpy.lib.npyio.NpzFile - opened on demand.
+   
+   def array (self, name):
+      """Gets archived array.
+      
+      Returns array, memory mapping it (if mmapMode is set and array is
+      stored uncompressed) or reading it on first access.
+      
+      Parameters
+      ----------
+      name: str
+         Name of array.
+      
+      Raises
+      ------
+      KeyError
+         If archive has no such array.
+      
+      Returns
+      -------
+      numpy.ndarray, numpy.memmap
+         Archived array.
+      
+      """
+      
+      if (name in self.arrays):
+         return self.arrays[name]
+      
+      array = None
+      
+      if (self.mmapMode != None):
+         array = self.memoryMap(name)
+      
+      if (array is None):
+         if (self.npzFile == None):
+            self.npzFile = np.load(self.path, allow_pickle=False)
+         
+         array = self.npzFile[name]
+      
+      self.arrays[name] = array
+      
+      return array
+   
+   def memoryMap (self, name):
+      """Memory maps archived array.
+      
+      Locates raw .npy data of an uncompressed archive member and maps it.
+      
+      Parameters
+      ----------
+      name: str
+         Name of array.
+      
+      Raises
+      ------
+      KeyError
+         If archive has no such array.
+      
+      Returns
+      -------
+      NoneType
+         If array is compressed or empty.
+      numpy.memmap
+         Memory mapped array.
+      
+      """
+      
+      with zipfile.ZipFile(self.path) as archive:
+         info = archive.getinfo(name + '.npy')
+      
+      if (info.compress_type != zipfile.ZIP_STORED):
+         return None
+      
+      with open(self.path, 'rb') as file:
+         file.seek(info.header_offset)
+         nameLength, extraLength = struct.unpack('<HH', file.read(30)[26:])
+         file.seek(info.header_offset + 30 + nameLength + extraLength)
+         version = np.lib.format.read_magic(file)
+         
+         if (version == (1, 0)):
+            header = np.lib.format.read_array_header_1_0(file)
+         else:
+            header = np.lib.format.read_array_header_2_0(file)
+         
+         shape, fortranOrder, dtype = header
+         offset = file.tell()
+      
+      if ((dtype.hasobject) or (0 in shape) or (len(shape) == 0)):
+         return None
+      
+      return np.memmap(
+         self.path, dtype=dtype, mode=self.mmapMode, offset=offset,
+         shape=shape, order=('F' if (fortranOrder) else 'C'),
+      )
+   
+   def metadata (self):
+      return json.loads(str(self.array('metadata')))
+   
+   def matrix (self):
+      """Gets constraint matrix.
+      
+      Returns
+      -------
+      tuple
+         ((data, indices, indptr), shape) as accepted by
+         scipy.sparse.csr_matrix.
+      
+      """
+      
+      return (
+         (self.array('data'), self.array('indices'), self.array('indptr'),),
+         ((len(self.array('indptr')) - 1), len(self.array('names'))),
+      )
+   
+   def toSimplexProblem (self):
+      """Loads SimplexProblem.
+      
+      Frames archived SimplexProblem (constraints attached through
+      PreProcessor.attachConstraint) and its OptimalSolution, without
+      iteration tables.
+      
+      Returns
+      -------
+      SimplexProblem
+         Loaded simplex problem.
+      
+      """
+      
+      metadata = self.metadata()
+      names = self.array('names').tolist()
+      data = self.array('data').tolist()
+      indices = self.array('indices').tolist()
+      indptr = self.array('indptr').tolist()
+      rhs = self.array('rhs').tolist()
+      equalityTypes = self.array('equalityTypes').tolist()
+      
+      simplexProblem = SimplexProblem()
+      
+      for setting in ProblemArchive.SETTINGS:
+         if (setting in metadata): # archives of version 1 lack some.
+            setattr(simplexProblem, setting, metadata[setting])
+      
+      simplexProblem.objectiveFunction = [
+         (coefficient, names[column],)
+         for column, coefficient in zip(
+            self.array('objectiveColumns').tolist(),
+            self.array('objectiveValues').tolist(),
+         )
+      ]
+      simplexProblem.constraints = []
+      
+      for row in range(0, (len(indptr) - 1)):
+         PreProcessor.attachConstraint(
+            simplexProblem,
+            [
+               (data[k], names[indices[k]],)
+               for k in range(indptr[row], indptr[row + 1])
+            ],
+            equalityTypes[row],
+            rhs[row],
+         )
+      
+      if (metadata['optimalValue'] != None):
+         optimalSolution = OptimalSolution()
+         optimalSolution.Xj = dict(zip(
+            self.array('basis').tolist(),
+            self.array('basisValues').tolist(),
+         ))
+         optimalSolution.optimalValue = metadata['optimalValue']
+         simplexProblem.optimalSolution = optimalSolution
+      
+      return simplexProblem
+   
+   def close (self):
+      """Closes archive.
+      
+      Closes lazily opened archive and drops accessed arrays (and so
+      references to memory mapped ones), archive is reopened if an array
+      is accessed again.
+      
+      """
+      
+      if (self.npzFile != None):
+         self.npzFile.close()
+         self.npzFile = None
+      
+      self.arrays = {}
+   
+   def __enter__ (self):
+      return self
+   
+   def __exit__ (self, excType, excValue, traceback):
+      self.close()
+   
+   def load (path, mmapMode=None):
+      """Loads SimplexProblem.
+      
+      Opens archive, frames SimplexProblem and closes archive.
+      
+      Parameters
+      ----------
+      path: str
+         Path of archive (.npz is appended if missing).
+      mmapMode: str, default=None
+         numpy.memmap mode used for arrays, None to read them.
+      
+      Returns
+      -------
+      SimplexProblem
+         Loaded simplex problem.
+      
+      """
+      
+      with ProblemArchive(path, mmapMode) as archive:
+         return archive.toSimplexProblem()
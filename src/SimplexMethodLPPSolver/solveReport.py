@@ -0,0 +1,123 @@
+from .statusPrinter import StatusPrinter as sp
+from .simplex import LRUCache
+
+class SolveReport:
+   """Text report of a single solve.
+   
+   Owned by the solve whose SimplexProblem it refers to, and discarded
+   with it, instead of accumulating text of every solve in module
+   globals. Parts are formatted by StatusPrinter only when requested.
+   Formatted iteration tables are kept in an LRUCache of at most
+   maxIterations entries, so that a report retains a bounded amount of
+   text, however many iterations its problem took.
+   
+   Attributes
+   ----------
+   simplexProblem: SimplexProblem
+      Calculated simplex problem.
+   tables: LRUCache
+      Formatted iteration tables, keyed by index in iterationTables.
+   
+   Methods
+   -------
+   __init__ (simplexProblem, maxIterations=64)
+      Initializes the report.
+   problem ()
+      Formats problem with auxillary components.
+   status ()
+      Formats termination status.
+   iteration (index)
+      Formats IterationTable.
+      Returns formatted IterationTable at index of iterationTables.
+   iterations ()
+      Formats iteration tables.
+      Yields formatted iteration tables in order.
+   optimalSolution ()
+      Formats optimal solution.
+      Returns None if optimal solution hasn't been reached.
+   text ()
+      Formats whole report.
+   
+   """
+   
+   def __init__ (self, simplexProblem, maxIterations=64):
+      """Initializes the report.
+      
+      Parameters
+      ----------
+      simplexProblem: SimplexProblem
+         Calculated simplex problem.
+      maxIterations: int, default=64
+         Maximum number of formatted iteration tables kept, 0 to format
+         them on each request.
+      
+      """
+      
+      self.simplexProblem = simplexProblem # SimplexProblem.
+      self.tables = LRUCache(maxIterations) # {index: str,}
+   
+   def problem (self):
+      return sp.formatPreCalcProblem(self.simplexProblem)
+   
+   def status (self):
+      return sp.formatStatus(self.simplexProblem)
+   
+   def iteration (self, index):
+      """Formats IterationTable.
+      
+      Parameters
+      ----------
+      index: int
+         Index of IterationTable in iterationTables.
+      
+      Raises
+      ------
+      IndexError
+         If there is no IterationTable at index.
+      
+      Returns
+      -------
+      str
+         Formatted IterationTable.
+      
+      """
+      
+      text = self.tables.get(index)
+      
+      if (text is LRUCache.MISSING):
+         text = sp.formatIterationTable(
+            (self.simplexProblem.iterationTables or [])[index]
+         )
+         self.tables.put(index, text)
+      
+      return text
+   
+   def iterations (self):
+      for index in range(0, len(self.simplexProblem.iterationTables or [])):
+         yield self.iteration(index)
+   
+   def optimalSolution (self):
+      if (self.simplexProblem.optimalSolution == None):
+         return None
+      
+      return sp.formatOptimalSolution(self.simplexProblem)
+   
+   def text (self):
+      """Formats whole report.
+      
+      Returns
+      -------
+      str
+         Problem, status, iteration tables and optimal solution (if
+         reached), as printed by StatusPrinter.
+      
+      """
+      
+      return '\n'.join(
+         [self.problem(), self.status(),]
+         + list(self.iterations())
+         + [
+            text for text in (self.optimalSolution(),)
+            if (text != None)
+         ]
+      ) + '\n'
@@ -1,20 +1,26 @@
+from .simplex import SymbolTable
+
 
 class StatusPrinter:
-   global strIterations
-   strIterations = []
-   
    
-   def printRawInputs (objectiveFunction, constraints, problemType,
+   def formatRawInputs (objectiveFunction, constraints, problemType,
          error=None
       ):
-      print(
+      return (
          "Problem type: {0}".format(problemType)
          + "Objective function: {0};\n".format(objectiveFunction)
          + "Constraints: {0};\n".format(constraints)
+         + (('\n' + str(error)) if (error != None) else '')
       )
-      if (error != None): print(error)
    
-   def printPreFrameProblem (simplexProblem):
+   def printRawInputs (objectiveFunction, constraints, problemType,
+         error=None
+      ):
+      print(StatusPrinter.formatRawInputs(
+         objectiveFunction, constraints, problemType, error
+      ))
+   
+   def formatPreFrameProblem (simplexProblem):
       objectiveFunction = ' '.join([
          (
             ('+' if (term[0] >= float(0)) else '')
@@ -69,7 +75,7 @@ class StatusPrinter:
             
             constraints += '\n' + ' '*13 + constraint
       
-      print(
+      return (
          "Objective function: {0} Z = {1}\n".format(
             (
                'Minimize'
@@ -81,7 +87,10 @@ class StatusPrinter:
          + "Constraints: {0}\n".format(constraints)
       )
    
-   def printPreCalcProblem (simplexProblem):
+   def printPreFrameProblem (simplexProblem):
+      print(StatusPrinter.formatPreFrameProblem(simplexProblem))
+   
+   def formatPreCalcProblem (simplexProblem):
       objectiveFunction = ''.join([
          (
             ('+' if (term[0] >= float(0)) else '')
@@ -163,7 +172,7 @@ class StatusPrinter:
             
             constraints += '\n' + ' '*13 + constraint
       
-      print(
+      return (
          "Objective function: Maximize Z{0} = {1}\n".format(
             (
                "'"
@@ -175,7 +184,10 @@ class StatusPrinter:
          + "Constraints: {0}\n".format(constraints)
       )
    
-   def printStatus (simplexProblem):
+   def printPreCalcProblem (simplexProblem):
+      print(StatusPrinter.formatPreCalcProblem(simplexProblem))
+   
+   def formatStatus (simplexProblem):
       statusString = ''
       if (
             simplexProblem.terminationReason == (
@@ -194,10 +206,22 @@ class StatusPrinter:
             simplexProblem.terminationReason
          )
       
-      print("Status: {0}\n".format(statusString))
+      statusString = "Status: {0}\n".format(statusString)
+      
+      if (simplexProblem.degeneratePivots > 0):
+         statusString += (
+            "\nDegenerate pivots: {0}; Bland's rule pivots: {1}\n".format(
+               simplexProblem.degeneratePivots,
+               simplexProblem.blandPivots,
+            )
+         )
+      
+      return statusString
    
+   def printStatus (simplexProblem):
+      print(StatusPrinter.formatStatus(simplexProblem))
    
-   def printIterationTable (iterationTable):
+   def formatIterationTable (iterationTable):
       aj = iterationTable.aj.copy()
       
       Cj = '\t'.join([
@@ -208,11 +232,10 @@ class StatusPrinter:
          '{0:04}'.format(round(iterationTable.deltaJ.get(a_j, float(0)), 2))
          for a_j in aj
       ])
-      global rows
       rows = '\n'.join([
          (
             str('\t'.join([
-               '{0:04}'.format(round(row.CB, 2)), row.B,
+               '{0:04}'.format(round(row.CB, 2)), SymbolTable.label(row.B),
                row.XB, '{0:04}'.format(round(row.b), 2),
                '\t'.join([
                   '{0:04}'.format(round(row.aj.get(a_j, float(0)), 2))
@@ -233,31 +256,25 @@ class StatusPrinter:
          )
          for row in iterationTable.rowi
       ])
-      # TENHO QUE DESCOBRIR COMO DAR UM QUEBRA DE LINHA 
       
-   
-      strIterations.append(str('Iteration: {0}\n\n'.format(iterationTable.iteration) + '{0}{1}\t{2}\n'.format('\t'*3, 'Cj', Cj) + 'CB\tB\tXB\tb\t{0}\tMinRatio\n'.format('\t'.join(aj)) + '{0}\n'.format(rows) + '{0}{1}\t{2}\n'.format('\t'*3, 'deltaJ', deltaJ) + str(('Key column: {0}\n'.format(iterationTable.keyColumn)) if (iterationTable.keyColumn != None) else '') + '-'*70 + '\n'))
-   
-      print(
+      return (
          'Iteration: {0}\n\n'.format(iterationTable.iteration)
          + '{0}{1}\t{2}\n'.format('\t'*3, 'Cj', Cj)
-         + 'CB\tB\tXB\tb\t{0}\tMinRatio\n'.format('\t'.join(aj))
+         + 'CB\tB\tXB\tb\t{0}\tMinRatio\n'.format('\t'.join([SymbolTable.label(a_j) for a_j in aj]))
          + '{0}\n'.format(rows)
          + '{0}{1}\t{2}\n'.format('\t'*3, 'deltaJ', deltaJ)
          + str(
             (
-               'Key column: {0}\n'.format(iterationTable.keyColumn)
+               'Key column: {0}\n'.format(SymbolTable.label(iterationTable.keyColumn))
             ) if (iterationTable.keyColumn != None) else ''
          )
          + '-'*70 + '\n'
       )
-      
-   def getIterations():
-      return strIterations
-   def getRows():
-      return rows
    
-   def printOptimalSolution (simplexProblem):
+   def printIterationTable (iterationTable):
+      print(StatusPrinter.formatIterationTable(iterationTable))
+   
+   def formatOptimalSolution (simplexProblem):
       solutionString = '; '.join([
          (
             xj
@@ -265,14 +282,16 @@ class StatusPrinter:
             + str(round(value, 2))
          )
          for xj, value in simplexProblem.optimalSolution.Xj.items()
-         if (xj[0] != simplexProblem.slackLetter)
+         if (not xj.startswith(simplexProblem.slackLetter))
       ]) or "All variables attain '0' as their value."
       
-      print(
+      return (
          'Optimal solution: {0}\n'.format(solutionString)
          + 'Optimal value: Z {0} = {1}\n'.format(
             simplexProblem.problemType,
             round(simplexProblem.optimalSolution.optimalValue, 2),
          )
       )
-
+   
+   def printOptimalSolution (simplexProblem):
+      print(StatusPrinter.formatOptimalSolution(simplexProblem))
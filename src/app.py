@@ -1,13 +1,20 @@
-from flask import Flask, render_template, request, url_for
-from SimplexMethodLPPSolver.main import bp
+from flask import Flask, Response, render_template, request, url_for, abort
+from SimplexMethodLPPSolver.main import bp, store
+from SimplexMethodLPPSolver.api import api
 import json
 from SimplexMethodLPPSolver import simplex
+from SimplexMethodLPPSolver.simplex import LRUCache
 from simplexGraphic import plot_linear_programming_problem
 from simplexGraphicAlt import plot_linear_programming_problem_alt
 import re
+import hashlib
 
 app = Flask(__name__)
 app.register_blueprint(bp)
+app.register_blueprint(api)
+
+FORMATOS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+graficos = LRUCache(128) # imagens renderizadas por hash do problema e formato
 
 @app.route('/')
 def home():
@@ -15,8 +22,6 @@ def home():
 
 @app.route('/inicio', methods=['POST'])
 def inicio():
-    global const
-    global var
     const = int(request.form.get('const'))
     var = int(request.form.get('var'))
 
@@ -24,40 +29,67 @@ def inicio():
 
 @app.route('/calcular', methods=['POST'])
 def calcular():
-    global type
-    global objective_expression
-    global constraint_expressions
-    
     type = request.form.get('type')
     objective_expression = request.form.get('objective_expression')
     constraint_expressions = json.loads(request.form.get('constraint_expressions'))
     
 
-    simplex(type, objective_expression, constraint_expressions)
+    problemId = simplex(type, objective_expression, constraint_expressions)
     
-    return render_template('index.html', content2=render_template('inicioResultado.html', objective_expression=objective_expression, constraint_expressions=constraint_expressions, const = const, type=type))
+    return render_template('index.html', content2=render_template('inicioResultado.html', objective_expression=objective_expression, constraint_expressions=constraint_expressions, const = len(constraint_expressions), type=type, problemId=problemId))
+
+
+def possui_igualdade(expressoes):
+    padrao = r'^[^<>=]*='
+    for expressao in expressoes:
+        if re.match(padrao, expressao):
+            return True
+    return False
 
 
 @app.route('/grafico', methods=['POST'])
 def grafico():
-    
-    def possui_igualdade(expressoes):
-        padrao = r'^[^<>=]*='
-        for expressao in expressoes:
-            if re.match(padrao, expressao):
-                return True
-        return False
-
-
-    resultado = possui_igualdade(constraint_expressions)
-    if(resultado):
-        # Para restricoes que possuam =, alem >= ou <=
-        plot_linear_programming_problem(objective_expression, constraint_expressions, type)
-    else:
-        # Para restricoes que nao possuam =, apenas >= ou <=
-        plot_linear_programming_problem_alt(objective_expression, constraint_expressions, type)
+    problemId = request.form.get('problemId')
+    problema = store.load(problemId) # entradas do problema resolvido
+    if(problema is None):
+        abort(404)
+    type = problema['problemType']
+    objective_expression = problema['objectiveFunction']
+    constraint_expressions = problema['constraints']
+
+    # A imagem e renderizada pela rota /grafico/<problemId>.png, carregada pelo navegador
+    imagem = url_for('grafico_imagem', problemId=problemId, fmt='png')
         
-    return render_template('index.html', content2=render_template('inicioResultado.html', objective_expression=objective_expression, constraint_expressions=constraint_expressions, const = const, type=type))
+    return render_template('index.html', content2=render_template('inicioResultado.html', objective_expression=objective_expression, constraint_expressions=constraint_expressions, const = len(constraint_expressions), type=type, problemId=problemId, grafico=imagem))
+
+
+@app.route('/grafico/<problemId>.<fmt>')
+def grafico_imagem(problemId, fmt):
+    if(fmt not in FORMATOS):
+        abort(404)
+    problema = store.load(problemId)
+    if(problema is None):
+        abort(404)
+    type = problema['problemType']
+    objective_expression = problema['objectiveFunction']
+    constraint_expressions = problema['constraints']
+
+    # Mesmo problema (mesmo texto) reutiliza a imagem ja renderizada
+    chave = hashlib.blake2b(json.dumps([type, objective_expression, constraint_expressions, fmt]).encode('utf-8'), digest_size=16).hexdigest()
+    imagem = graficos.get(chave)
+    if(imagem is LRUCache.MISSING):
+        # Solucao otima ja calculada pelo simplex em /calcular, sem resolver novamente
+        Xj = problema.get('Xj')
+        valor_otimo = problema['optimalValue']
+        if(possui_igualdade(constraint_expressions)):
+            # Para restricoes que possuam =, alem >= ou <=
+            imagem = plot_linear_programming_problem(objective_expression, constraint_expressions, type, Xj, valor_otimo, fmt)
+        else:
+            # Para restricoes que nao possuam =, apenas >= ou <=
+            imagem = plot_linear_programming_problem_alt(objective_expression, constraint_expressions, type, Xj, valor_otimo, fmt)
+        graficos.put(chave, imagem)
+
+    return Response(imagem, mimetype=FORMATOS[fmt], headers={'Cache-Control': 'public, max-age=3600', 'ETag': chave})
 
 
 
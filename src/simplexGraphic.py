@@ -1,5 +1,6 @@
-import cvxpy as cp
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import io
 import numpy as np
 import re
 
@@ -31,7 +32,12 @@ def parse_objective(expression):
     return coefficients
 
 
-def plot_linear_programming_problem(objective, constraints, problem_type):
+def plot_linear_programming_problem(objective, constraints, problem_type, Xj=None, optimal_value=None, fmt='png'):
+    # Renderiza em uma Figure propria (Agg), sem estado global do pyplot
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+
     c = parse_objective(objective)
     A = []
     b = []
@@ -42,37 +48,10 @@ def plot_linear_programming_problem(objective, constraints, problem_type):
         b.append(rhs)
         operators.append(operator)
 
-    # Adjust the signs of the objective function coefficients based on the problem type
-    if problem_type == "max":
-        c = [-val for val in c]
-
-    # Define the decision variables
-    x = cp.Variable(len(c))
-
-    # Define the constraints
-    constraints = []
-    for i in range(len(A)):
-        coefficients = A[i]
-        rhs = b[i]
-        operator = operators[i]
-        if operator == '<=':
-            constraints.append(coefficients @ x <= rhs)
-        elif operator == '>=':
-            constraints.append(coefficients @ x >= rhs)
-        elif operator == '=':
-            constraints.append(coefficients @ x == rhs)
-
-    # Define the objective function
-    if problem_type == "min":
-        objective = cp.Minimize(c @ x)
-    else:
-        objective = cp.Maximize(c @ x)
-
-    # Define the problem
-    problem = cp.Problem(objective, constraints)
-
-    # Solve the problem
-    problem.solve()
+    # Solucao otima da resolucao pelo simplex (Xj da tabela final), sem resolver novamente
+    x_value = None
+    if Xj is not None:
+        x_value = [Xj.get(f'x{j+1}', 0.0) for j in range(len(c))]
 
     # Plot the constraints
     x_max = max([b_value / coefficient for coefficients, b_value, _ in zip(A, b, operators) for coefficient in coefficients if coefficient != 0])
@@ -89,26 +68,32 @@ def plot_linear_programming_problem(objective, constraints, problem_type):
                 constraint_label += f' - {abs(coefficients[j])}x{j+1}'
         constraint_label += f' {operator} {rhs}'
         if operator == '<=':
-            plt.plot(x_vals, (rhs - coefficients[0] * x_vals) / coefficients[1], label=constraint_label)
+            ax.plot(x_vals, (rhs - coefficients[0] * x_vals) / coefficients[1], label=constraint_label)
         elif operator == '>=':
-            plt.plot(x_vals, (rhs - coefficients[0] * x_vals) / coefficients[1], '--', label=constraint_label)
+            ax.plot(x_vals, (rhs - coefficients[0] * x_vals) / coefficients[1], '--', label=constraint_label)
         elif operator == '=':
-            plt.plot(x_vals, (rhs - coefficients[0] * x_vals) / coefficients[1], '-.', label=constraint_label)
+            ax.plot(x_vals, (rhs - coefficients[0] * x_vals) / coefficients[1], '-.', label=constraint_label)
             
-    # Ajustar o eixo y para se concentrar no ponto ótimo
-    plt.ylim(x.value[1] - 10, x.value[1] + 10)
+    if x_value is not None:
+        # Ajustar o eixo y para se concentrar no ponto ótimo
+        ax.set_ylim(x_value[1] - 10, x_value[1] + 10)
+
+        # Plot the optimal solution
+        label_text = ', '.join([f"{x_val:.2f}" for x_val in x_value])
+        ax.plot(x_value[0], x_value[1], 'ro', label=f'Solução ótima: ({label_text})')
+        ax.text(x_value[0], x_value[1], label_text, ha='right', va='bottom')
+
+        # Add optimal value below the table
+        ax.text(0.45, -0.1, f"Valor ótimo: {round(optimal_value, 2)}", fontsize=10, transform=ax.transAxes)
 
-    # Plot the optimal solution
-    label_text = ', '.join([f"{x_val:.2f}" for x_val in x.value])
-    plt.plot(x.value[0], x.value[1], 'ro', label=f'Solução ótima: ({label_text})')
-    plt.text(x.value[0], x.value[1], label_text, ha='right', va='bottom')
+    ax.set_xlabel("x1")
+    ax.set_ylabel("x2")
+    ax.set_title('Solução Gráfica')
+    ax.grid(True)
+    ax.legend()
 
-    # Add optimal value below the table
-    plt.text(0.45, -0.1, f"Valor ótimo: {round(problem.value, 2)}", fontsize=10, transform=plt.gca().transAxes)
+    # Retorna a imagem (png ou svg) em bytes
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt)
+    return buffer.getvalue()
 
-    plt.xlabel("x1")
-    plt.ylabel("x2")
-    plt.title('Solução Gráfica')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
@@ -1,5 +1,6 @@
-from scipy.optimize import linprog
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+import io
 import numpy as np
 import re
 
@@ -32,7 +33,12 @@ def parse_objective(expression):
     coefficients = parse_coefficients(expression)
     return coefficients
 
-def plot_linear_programming_problem_alt(objective, constraints, problem_type):
+def plot_linear_programming_problem_alt(objective, constraints, problem_type, Xj=None, optimal_value=None, fmt='png'):
+    # Renderiza em uma Figure propria (Agg), sem estado global do pyplot
+    figure = Figure()
+    FigureCanvasAgg(figure)
+    ax = figure.add_subplot()
+
     c = parse_objective(objective)
     A = []
     b = []
@@ -43,18 +49,10 @@ def plot_linear_programming_problem_alt(objective, constraints, problem_type):
         b.append(rhs)
         operators.append(operator)
 
-    # Adjust the signs of the objective function coefficients based on the problem type
-    if problem_type == "max":
-        c = [-val for val in c]
-
-    # Solve the linear programming problem
-    result = linprog(c, A_ub=A, b_ub=b)
-
-    # Adjust the sign of the optimal objective value based on the problem type
-    if problem_type == "min":
-        optimal_value = result.fun
-    else:
-        optimal_value = -result.fun
+    # Solucao otima da resolucao pelo simplex (Xj da tabela final), sem resolver novamente
+    x_value = None
+    if Xj is not None:
+        x_value = [Xj.get(f'x{j+1}', 0.0) for j in range(len(c))]
 
     # Plot the constraints
     x_max = max([b_value / coefficient for coefficients, b_value, _ in zip(A, b, operators) for coefficient in coefficients if coefficient != 0])
@@ -70,22 +68,27 @@ def plot_linear_programming_problem_alt(objective, constraints, problem_type):
             else:
                 constraint_label += f' - {abs(coefficients[j])}x{j+1}'
         constraint_label += f' {operator} {rhs}'
-        plt.plot(x, (rhs - coefficients[0] * x) / coefficients[1], label=constraint_label)
-
-    # Ajustar o eixo y para se concentrar no ponto ótimo
-    plt.ylim(result.x[1] - 10, result.x[1] + 10)
-
-    # Plot the optimal solution
-    label_text = f"({result.x[0]:.2f}, {result.x[1]:.2f})"
-    plt.plot(result.x[0], result.x[1], 'ro', label=f'Optimal Solution: {label_text}')
-    plt.text(result.x[0], result.x[1], label_text, ha='right', va='bottom')
-
-    # Add optimal value below the table
-    plt.text(0.45, -0.1, f"Optimal value: {round(optimal_value, 2)}", fontsize=10, transform=plt.gca().transAxes)
-
-    plt.xlabel("x1")
-    plt.ylabel("x2")
-    plt.title('LP: Graphical Solution')
-    plt.grid(True)
-    plt.legend()
-    plt.show()
\ No newline at end of file
+        ax.plot(x, (rhs - coefficients[0] * x) / coefficients[1], label=constraint_label)
+
+    if x_value is not None:
+        # Ajustar o eixo y para se concentrar no ponto ótimo
+        ax.set_ylim(x_value[1] - 10, x_value[1] + 10)
+
+        # Plot the optimal solution
+        label_text = f"({x_value[0]:.2f}, {x_value[1]:.2f})"
+        ax.plot(x_value[0], x_value[1], 'ro', label=f'Optimal Solution: {label_text}')
+        ax.text(x_value[0], x_value[1], label_text, ha='right', va='bottom')
+
+        # Add optimal value below the table
+        ax.text(0.45, -0.1, f"Optimal value: {round(optimal_value, 2)}", fontsize=10, transform=ax.transAxes)
+
+    ax.set_xlabel("x1")
+    ax.set_ylabel("x2")
+    ax.set_title('LP: Graphical Solution')
+    ax.grid(True)
+    ax.legend()
+
+    # Retorna a imagem (png ou svg) em bytes
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt)
+    return buffer.getvalue()